@@ -1,11 +1,15 @@
 # api/CLOUDS.py
 import os
+import sys
 import numpy as np
 import requests
-import geopandas as gpd
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from cloud_render import GRID_SHAPE, load_basemap, composite_frame, save_frame
+
+# 프로젝트 루트의 cloud_frames (축소본 이름 규칙을 앱과 공유)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cloud_frames import encode_frame_variants
 
 # 서비스 키 및 변수 설정
 service_key = "boxdzlyoTGWMXc5cqDxlQQ"
@@ -62,87 +66,94 @@ def check_response(response):
 # .shp 파일 경로 설정 
 shapefile_path = "map3.shp"  
 
-# .shp 파일을 geopandas로 읽어오기
-try:
-    gdf = gpd.read_file(shapefile_path)
-except Exception as e:
-    print(f"지도 파일을 읽을 수 없습니다: {e}")
-    exit()
-
-# 좌표 설정
-#x_min, x_max = gdf.total_bounds[0], gdf.total_bounds[2]
-#y_min, y_max = gdf.total_bounds[1], gdf.total_bounds[3]
-#extent = [x_min, x_max, y_min, y_max]
-extent = [123.3102, 132.7750, 31.6518, 43.3935]
-
-# 데이터 값과 인덱스 매핑
-value_to_index = {
-    -999.0: 0,
-    1.0: 1,
-    3.0: 2,
-    4.0: 3
-}
-
-# 색상 및 컬러맵 설정
-colors = ['darkgray', 'white', 'blue', 'darkblue']
-cmap = ListedColormap(colors)
+# 해안선 지도는 한 번만 그려 RGBA 로 캐시 (shapefile 이 바뀌면 다시 그림)
+basemap_cache_path = "map3_basemap.npz"
 
 # 이미지 저장 경로 설정 (api 폴더 기준, assets 폴더는 프로젝트 루트에 있음)
 image_dir = "../assets/cloud_images"
-if not os.path.exists(image_dir):
-    os.makedirs(image_dir)
-
-# tmef_list를 파일로 저장
-tmef_list_path = os.path.join(image_dir, 'tmef_list.txt')
-with open(tmef_list_path, 'w') as f:
-    for tmef in tmef_list:
-        f.write(f"{tmef}\n")
-
-# 각 tmef에 대해 데이터를 요청하고 이미지 저장
-for idx, tmef in enumerate(tmef_list):
-    # 초단기예보 시간대 
-    if 1 <= idx + 1 <= 5:
-        api_url = get_very_short_term_api_url(tmfc_very_short_term, tmef)
-    # 단기예보 시간대 
-    else:
-        api_url = get_short_term_api_url(tmfc_short_term, tmef)
-
-    response = call_api(api_url)
 
-    if response.status_code == 200:
-        data = response.text
-        data = data.replace("\n", "").split(",")
-        data = [float(val.strip()) for val in data if val.strip()]
-        
-        # 초단기예보 데이터에서 -99.00 값을 -999.00으로 통일
-        if 1 <= idx + 1 <= 6:
-            data = [-999.00 if val == -99.00 else val for val in data]
-
-        # 1차원 배열을 좌측 하단에서부터 우측 상단 순서로 채우기 위해 행을 뒤집는다
-        # 이때 먼저 253행, 149열 배열로 만든 후 행을 뒤집는다
-        grid_data = np.array(data).reshape(253, 149)[::-1, :]
-
-        # 인덱스 배열 생성
-        index_grid_data = np.full_like(grid_data, -1, dtype=int)
-        for val, idx_val in value_to_index.items():
-            index_grid_data[grid_data == val] = idx_val
-
-        # 그림 생성 및 저장, origin을 upper로 하여 왼쪽 위부터 배열(?)
-        fig, ax = plt.subplots(figsize=(10, 8))
-        gdf.plot(ax=ax, linewidth=0.5, edgecolor='black')
-        im = ax.imshow(index_grid_data, extent=extent, origin='upper', cmap=cmap, interpolation='none', alpha=0.6)
-        ax.set_title(f"Time: {tmef}")
-        ax.set_xlabel("Longitude")
-        ax.set_ylabel("Latitude")
-
-        # 이미지 파일명 설정 (tmef 시간을 파일명에 반영)
-        image_filename = f"cloud_image_{tmef}.png"
-        image_path = os.path.join(image_dir, image_filename)
-
-        # 이미지 저장
-        plt.savefig(image_path, bbox_inches='tight')
-        plt.close(fig)
-
-        print(f"Saved {image_filename}")
-    else:
-        print(f"{tmef}에 대한 데이터를 가져올 수 없습니다: {response.status_code}")
\ No newline at end of file
+# 렌더링 프로세스 수 (환경 변수 CLOUD_RENDER_WORKERS, 기본값은 CPU 코어 수). 1 이하면 메인 프로세스에서 차례로 그림
+render_workers = int(os.environ.get('CLOUD_RENDER_WORKERS', os.cpu_count() or 1))
+
+# 프로세스마다 한 번만 읽는 지도
+basemap = None
+
+# 렌더링 프로세스 초기화: 지도를 한 번만 읽어 둔다 (프레임마다 읽지 않음)
+def init_renderer(shapefile_path, basemap_cache_path):
+    global basemap
+    basemap = load_basemap(shapefile_path, basemap_cache_path)
+
+# 프레임 한 장 렌더링 (파일명은 tmef 로만 정해지므로 실행 순서와 관계없이 같음)
+def render_frame(tmef, grid_data):
+    image_filename = f"cloud_image_{tmef}.png"
+    image_path = os.path.join(image_dir, image_filename)
+
+    # 캐시된 지도 위에 색상 조회표로 칠한 격자를 합성해 저장
+    save_frame(basemap, composite_frame(basemap, grid_data), f"Time: {tmef}", image_path)
+
+    # 화면 크기별 WebP/PNG 축소본 (앱이 srcSet 으로 골라 씀)
+    encode_frame_variants(image_path)
+    return image_filename
+
+# API 응답을 격자 배열로 변환
+def parse_grid(text, very_short_term):
+    data = text.replace("\n", "").split(",")
+    data = np.array([val for val in data if val.strip()], dtype=float)
+
+    # 초단기예보 데이터에서 -99.00 값을 -999.00으로 통일
+    if very_short_term:
+        data[data == -99.00] = -999.00
+
+    # 1차원 배열을 좌측 하단에서부터 우측 상단 순서로 채우기 위해 행을 뒤집는다
+    # 이때 먼저 253행, 149열 배열로 만든 후 행을 뒤집는다 (위쪽이 북쪽)
+    return data.reshape(GRID_SHAPE)[::-1, :]
+
+# 각 tmef 데이터를 받아 격자 배열로 (받지 못한 시각은 건너뜀)
+def fetch_grids():
+    for idx, tmef in enumerate(tmef_list):
+        # 초단기예보 시간대 
+        if 1 <= idx + 1 <= 5:
+            api_url = get_very_short_term_api_url(tmfc_very_short_term, tmef)
+        # 단기예보 시간대 
+        else:
+            api_url = get_short_term_api_url(tmfc_short_term, tmef)
+
+        response = call_api(api_url)
+
+        if response.status_code == 200:
+            yield tmef, parse_grid(response.text, 1 <= idx + 1 <= 6)
+        else:
+            print(f"{tmef}에 대한 데이터를 가져올 수 없습니다: {response.status_code}")
+
+def main():
+    # 메인 프로세스에서 먼저 지도 캐시를 만들어 두면 작업 프로세스는 캐시 파일만 읽는다
+    try:
+        init_renderer(shapefile_path, basemap_cache_path)
+    except Exception as e:
+        print(f"지도 파일을 읽을 수 없습니다: {e}")
+        exit()
+
+    if not os.path.exists(image_dir):
+        os.makedirs(image_dir)
+
+    # tmef_list를 파일로 저장
+    tmef_list_path = os.path.join(image_dir, 'tmef_list.txt')
+    with open(tmef_list_path, 'w') as f:
+        for tmef in tmef_list:
+            f.write(f"{tmef}\n")
+
+    # 각 tmef에 대해 데이터를 요청하고 이미지 저장
+    if render_workers <= 1:
+        for tmef, grid_data in fetch_grids():
+            print(f"Saved {render_frame(tmef, grid_data)}")
+        return
+
+    # 받은 프레임부터 작업 프로세스에 넘겨 다음 요청과 렌더링을 겹친다
+    with ProcessPoolExecutor(max_workers=render_workers, initializer=init_renderer,
+                             initargs=(shapefile_path, basemap_cache_path)) as executor:
+        futures = [executor.submit(render_frame, tmef, grid_data) for tmef, grid_data in fetch_grids()]
+        for future in futures:
+            print(f"Saved {future.result()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# api/cloud_render.py
+"""
+구름(SKY) 격자 프레임 렌더러.
+
+해안선 지도(map3.shp)는 matplotlib 으로 한 번만 그려 RGBA 배열로 캐시하고(파일 캐시 포함),
+프레임마다 253×149 SKY 격자를 색상 조회표(LUT)로 RGBA 로 바꾼 뒤 지도의 축 영역에 NumPy 로 알파 합성합니다.
+프레임마다 gdf.plot / imshow / savefig 를 다시 하지 않으므로 24장 전체를 1초 안에 만들 수 있습니다.
+"""
+
+import functools
+import os
+import numpy as np
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+# 격자 크기 (행, 열)
+GRID_SHAPE = (253, 149)
+
+# 지도 범위 [경도 최소, 경도 최대, 위도 최소, 위도 최대]
+EXTENT = [123.3102, 132.7750, 31.6518, 43.3935]
+
+# SKY 값 -> 색상 (RGB 0~255). 목록에 없는 값은 칠하지 않음
+SKY_VALUES = np.array([-999.0, 1.0, 3.0, 4.0])
+SKY_COLORS = np.array([
+    [169, 169, 169],  # darkgray: 자료 없음
+    [255, 255, 255],  # white: 맑음
+    [0, 0, 255],      # blue: 구름 많음
+    [0, 0, 139],      # darkblue: 흐림
+], dtype=np.uint8)
+OVERLAY_ALPHA = 0.6
+
+# 지도 그림 크기와 해상도 (원래 plt.subplots(figsize=(10, 8)) 와 같음)
+FIGSIZE = (10, 8)
+DPI = 100
+
+
+class Basemap:
+    """
+    캐시된 지도 그림.
+    rgba: (높이, 너비, 4) uint8 배열
+    box: 지도 범위(EXTENT)가 그려진 축 영역의 픽셀 (위, 아래, 왼쪽, 오른쪽), 아래·오른쪽은 포함하지 않음
+    title_xy: 제목을 쓸 위치 (가운데 x, 아래 y)
+    """
+
+    def __init__(self, rgba, box, title_xy):
+        self.rgba = rgba
+        self.box = tuple(int(v) for v in box)
+        self.title_xy = tuple(float(v) for v in title_xy)
+        top, bottom, left, right = self.box
+        # 축 영역 픽셀마다 대응하는 격자 행·열 (최근접, imshow(interpolation='none') 과 같음)
+        self.grid_rows = (np.arange(bottom - top) * GRID_SHAPE[0]) // (bottom - top)
+        self.grid_cols = (np.arange(right - left) * GRID_SHAPE[1]) // (right - left)
+
+
+def render_basemap(gdf, extent=EXTENT, figsize=FIGSIZE, dpi=DPI):
+    """gdf 의 해안선을 그린 지도(축·라벨 포함, 제목 없음)를 Basemap 으로 만듭니다."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
+    gdf.plot(ax=ax, linewidth=0.5, edgecolor='black')
+    ax.set_xlim(extent[0], extent[1])
+    ax.set_ylim(extent[2], extent[3])
+    ax.set_aspect('equal')  # imshow 의 기본 종횡비
+    ax.set_title("Time: 0000000000")  # 제목 자리만 잡아 둠
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    fig.canvas.draw()
+
+    height = fig.canvas.get_width_height()[1]
+    axes_box = ax.get_window_extent()
+    title_box = ax.title.get_window_extent()
+    box = (round(height - axes_box.y1), round(height - axes_box.y0), round(axes_box.x0), round(axes_box.x1))
+    title_xy = ((title_box.x0 + title_box.x1) / 2, height - title_box.y0)
+    ax.set_title("")
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return Basemap(rgba, box, title_xy)
+
+
+def load_basemap(shapefile_path, cache_path, extent=EXTENT, figsize=FIGSIZE, dpi=DPI):
+    """
+    캐시 파일(.npz)에서 지도를 읽습니다. 없거나 shapefile·범위·크기가 바뀌었으면 다시 그려 저장합니다.
+    """
+    key = np.array([os.stat(shapefile_path).st_mtime_ns, *extent, *figsize, dpi], dtype=float)
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            if np.array_equal(cached['key'], key):
+                return Basemap(cached['rgba'], cached['box'], cached['title_xy'])
+
+    import geopandas as gpd
+    basemap = render_basemap(gpd.read_file(shapefile_path), extent, figsize, dpi)
+    np.savez(cache_path, key=key, rgba=basemap.rgba, box=basemap.box, title_xy=basemap.title_xy)
+    return basemap
+
+
+def sky_grid_to_codes(grid):
+    """SKY 값 격자를 SKY_VALUES 의 인덱스로 바꿉니다 (목록에 없는 값은 -1)."""
+    position = np.clip(np.searchsorted(SKY_VALUES, grid), 0, SKY_VALUES.size - 1)
+    return np.where(SKY_VALUES[position] == grid, position, -1)
+
+
+@functools.lru_cache(maxsize=4)
+def _blend_table(alpha):
+    """
+    (채널, 지도 픽셀 값 0~255, 코드 + 1) -> 합성 결과 uint8 표.
+    코드 -1 (칠하지 않음) 은 지도 값을 그대로 둡니다.
+    """
+    base = np.arange(256, dtype=np.float64)[np.newaxis, :, np.newaxis]
+    color = SKY_COLORS.T.astype(np.float64)[:, np.newaxis, :]
+    blended = np.round(base * (1 - alpha) + color * alpha).astype(np.uint8)
+    unpainted = np.broadcast_to(np.arange(256, dtype=np.uint8)[np.newaxis, :, np.newaxis], (3, 256, 1))
+    return np.concatenate([unpainted, blended], axis=2)
+
+
+def composite_frame(basemap, grid, alpha=OVERLAY_ALPHA):
+    """지도 위에 SKY 격자(위쪽이 북쪽인 GRID_SHAPE 배열)를 알파 합성한 RGBA uint8 배열."""
+    # 축 영역 픽셀별 코드 + 1 (0 은 칠하지 않음)
+    codes = (sky_grid_to_codes(grid) + 1)[np.ix_(basemap.grid_rows, basemap.grid_cols)]
+    table = _blend_table(float(alpha))
+    top, bottom, left, right = basemap.box
+    image = basemap.rgba.copy()
+    region = image[top:bottom, left:right]
+    for channel in range(3):
+        region[..., channel] = table[channel][region[..., channel], codes]
+    return image
+
+
+def _title_font(size=16):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def save_frame(basemap, image, title, path):
+    """RGBA 배열에 제목을 쓰고 PNG 로 저장합니다."""
+    if Image is None:
+        raise RuntimeError("프레임을 저장하려면 Pillow 가 필요합니다.")
+    picture = Image.fromarray(image, 'RGBA')
+    draw = ImageDraw.Draw(picture)
+    x, y = basemap.title_xy
+    draw.text((x, y), title, fill=(0, 0, 0, 255), font=_title_font(), anchor='mb')
+    picture.save(path, 'PNG', compress_level=6)
@@ -4,19 +4,23 @@ import csv
 import os
 from astronomy.sun import calculate_sun_position
 from astronomy.moon import calculate_moon_position_and_phase
+from astronomy.ephemeris import get_ephemeris_context
+from astronomy.grid import load_grid_points, calculate_illuminance_cube
 from datetime import datetime, timedelta
 
-def calculate_illuminance_for_point_at_time(latitude, longitude, time_utc):
+def calculate_illuminance_for_point_at_time(latitude, longitude, time_utc, context=None):
     """주어진 위도, 경도, 시간에 대해 E_surface 값을 계산."""
+    if context is None:
+        context = get_ephemeris_context(time_utc)
     sun_data = calculate_sun_position(
         time_utc.year, time_utc.month, time_utc.day,
         time_utc.hour, time_utc.minute, time_utc.second,
-        latitude, longitude
+        latitude, longitude, context=context
     )
     moon_data = calculate_moon_position_and_phase(
         time_utc.year, time_utc.month, time_utc.day,
         time_utc.hour, time_utc.minute, time_utc.second,
-        latitude, longitude
+        latitude, longitude, context=context
     )
 
     R_Twilight_sun = sun_data['R_Twilight_sun']
@@ -37,34 +41,31 @@ def process_csv(input_csv, year, month, day):
     if not os.path.exists(assets_dir):
         os.makedirs(assets_dir)
 
+    # 시각 축과 격자점 축
+    times_utc = []
     current_time = start_time_utc
-
     while current_time <= end_time_utc:
+        times_utc.append(current_time)
+        current_time += delta
+    longitudes, latitudes = load_grid_points(input_csv)
+
+    # 시각별 천체 항은 한 번만 계산하고 모든 격자점으로 브로드캐스트 (N_times × N_points)
+    E_surface_cube = calculate_illuminance_cube(times_utc, latitudes, longitudes)
+
+    for current_time, E_surface_row in zip(times_utc, E_surface_cube):
         # 각 시간별로 파일을 assets 폴더에 저장
         output_csv = f'{assets_dir}/E_surface_{current_time.strftime("%Y%m%d%H%M")}.csv'
-        
-        with open(input_csv, mode='r') as infile, open(output_csv, mode='w', newline='') as outfile:
-            reader = csv.reader(infile)
+
+        with open(output_csv, mode='w', newline='') as outfile:
             writer = csv.writer(outfile)
 
             # CSV 헤더 작성
             writer.writerow(['longitude', 'latitude', 'E_surface'])
-
-            for row in reader:
-                longitude = float(row[0])  # 1번째 열에 경도
-                latitude = float(row[1])  # 2번째 열에 위도
-
-                # 각 시간에 대해 E_surface 계산
-                E_surface = calculate_illuminance_for_point_at_time(latitude, longitude, current_time)
-                
-                # CSV 파일에 기록
-                writer.writerow([longitude, latitude, E_surface])
+            writer.writerows(zip(longitudes.tolist(), latitudes.tolist(), E_surface_row.tolist()))
 
         # 파일 저장 완료 메시지 출력
         print(f'{output_csv} 파일이 저장되었습니다.')
 
-        current_time += delta
-
 def main():
     """메인 함수."""
     input_csv = './grid_info.csv'  # 입력 CSV 파일 경로 (B.py와 동일한 경로)
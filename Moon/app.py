@@ -4,14 +4,38 @@ import dash
 from dash import dcc, html, Output, Input, State, dash_table
 import dash_bootstrap_components as dbc
 import pandas as pd
-from astronomy.output import calculate_and_collect_data
-from datetime import datetime, timedelta
+from astronomy.output import format_records, to_frame, iter_collected_data, iter_collected_columns, COLUMNS, TIME_COLUMN
+from astronomy.result_cache import open_result_cache, MemoryResultCache
+from cloud_frames import CloudFrameIndex
+from datetime import datetime, timedelta, timezone
 from dash.exceptions import PreventUpdate
 import urllib.parse
 import os
+import threading
+import functools
+import math
+import numpy as np
+import json
+import warnings
+from flask import Response, request, jsonify, stream_with_context
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 
 # 상수 정의
 TIMEZONE_OFFSET = 9  # KST는 UTC+9
+COORDINATE_PRECISION = 0.01  # 결과 캐시 키와 계산에 쓰는 위도·경도 간격 (도)
+MEMORY_CACHE_ENTRIES = 128  # 프로세스 안 결과 캐시 항목 수
+WARMUP_DAYS = int(os.environ.get('MOON_WARMUP_DAYS', 3))  # 서버 시작 시 미리 계산할 오늘 ± 일 수 (0 이면 안 함)
+RANGE_PAGE_SIZE = 120  # 기간 타임테이블의 페이지당 행 수
+MAX_RANGE_DAYS = 31  # 기간 타임테이블의 최대 일 수
+DEFAULT_STEP_MINUTES = 10
+MAX_BULK_LOCATIONS = 10000  # 대량 조회 API 의 최대 위치 수
+MAX_BULK_VALUES = 50_000_000  # 대량 조회 API 의 최대 (위치 수 × 시각 수)
+MAX_BULK_STEP_MINUTES = 366 * 24 * 60  # 대량 조회 API 의 최대 간격 (분)
+BULK_CHUNK_VALUES = 200_000  # 대량 조회 API 가 한 번에 계산하는 (위치 수 × 시각 수)
 
 # 도시별 위도, 경도 정보
 city_coordinates = {
@@ -23,14 +47,36 @@ city_coordinates = {
 }
 
 # Dash 애플리케이션 초기화
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 오래 걸리는 콜백(기간 그래프)을 요청 워커 밖에서 실행하는 관리자 (diskcache 가 없으면 동기 콜백으로 실행)
+if diskcache is not None:
+    background_callback_manager = dash.DiskcacheManager(diskcache.Cache(os.path.join(BASE_DIR, 'cache', 'callbacks')))
+else:
+    background_callback_manager = None
+    warnings.warn("diskcache 가 설치되어 있지 않아 기간 그래프를 동기 콜백으로 계산합니다.", RuntimeWarning)
+
 app = dash.Dash(
     __name__,
     suppress_callback_exceptions=True,
     external_stylesheets=[dbc.themes.BOOTSTRAP],
-    title='달빛천사 0.3'
+    title='달빛천사 0.3',
+    background_callback_manager=background_callback_manager
 )
 server = app.server
 
+# 워커 프로세스들이 함께 쓰는 계산 결과 캐시 (MOON_RESULT_CACHE 로 경로 지정, 'off' 이면 사용 안 함)
+result_cache = open_result_cache(os.path.join(BASE_DIR, 'cache', 'results.sqlite3'))
+if result_cache is not None:
+    result_cache.quantize_degrees = COORDINATE_PRECISION
+
+# 그래프·타임테이블 콜백이 함께 쓰는 프로세스 안 LRU 캐시 (영구 캐시가 있으면 그 앞에 둠)
+memory_cache = MemoryResultCache(
+    compute=result_cache.get_or_compute if result_cache is not None else None,
+    max_entries=MEMORY_CACHE_ENTRIES,
+    quantize_degrees=COORDINATE_PRECISION
+)
+
 # 공통 스타일 정의
 input_style = {'width': '150px'}
 common_button_style = {'margin-top': '25px'}
@@ -52,18 +98,80 @@ def parse_inputs(selected_date, latitude, longitude):
         return None, None, None
 
 def get_calculated_data(selected_date, latitude, longitude, timezone_offset=TIMEZONE_OFFSET):
+    # 숫자 열(DataFrame)로 받고, 문자열 포맷은 타임테이블을 그릴 때만 함
     date_obj, latitude, longitude = parse_inputs(selected_date, latitude, longitude)
     if date_obj is None:
         return None
-    data = calculate_and_collect_data(
-        year=date_obj.year,
-        month=date_obj.month,
-        day=date_obj.day,
-        timezone_offset=timezone_offset,
-        latitude=latitude,
-        longitude=longitude
+    table = memory_cache.get_or_compute(
+        date_obj.year, date_obj.month, date_obj.day, timezone_offset, latitude, longitude
     )
-    return data
+    return to_frame(table)
+
+def warm_up_presets(days=WARMUP_DAYS):
+    """city_coordinates 의 모든 도시에 대해 오늘 ± days 일의 결과를 미리 계산해 캐시에 채움 (오늘부터 가까운 날 순)."""
+    today = datetime.today()
+    for offset in sorted(range(-days, days + 1), key=abs):
+        selected_date = (today + timedelta(days=offset)).strftime('%Y-%m-%d')
+        for city, coords in city_coordinates.items():
+            try:
+                get_calculated_data(selected_date, coords['lat'], coords['lon'])
+            except Exception as e:
+                warnings.warn(f"{city} {selected_date} 미리 계산 실패: {e}", RuntimeWarning)
+
+def start_warm_up(days=WARMUP_DAYS):
+    """warm_up_presets 를 백그라운드 스레드에서 실행 (서버는 기다리지 않고 바로 요청을 받음)."""
+    if days <= 0:
+        return None
+    thread = threading.Thread(target=warm_up_presets, args=(days,), name='preset-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+warm_up_thread = None
+warm_up_lock = threading.Lock()
+
+@server.before_request
+def ensure_warm_up():
+    """요청을 받는 프로세스에서 첫 요청 때 한 번만 미리 계산 시작.
+
+    import 시점에 시작하면 디버그 리로더의 감시 프로세스에서도 돌기 때문에, 실제로 요청을 받는
+    워커(리로더의 자식 프로세스, gunicorn 워커)에서만 시작되도록 첫 요청에 맞춤.
+    """
+    global warm_up_thread
+    if warm_up_thread is not None:
+        return
+    with warm_up_lock:
+        if warm_up_thread is None:
+            warm_up_thread = start_warm_up() or False  # 미리 계산을 하지 않으면 False (다시 확인하지 않음)
+
+# 구름 이미지 목록 (슬라이더마다 디렉터리를 읽지 않도록 캐시)
+cloud_frame_index = CloudFrameIndex('assets/cloud_images')
+CLOUD_IMAGE_SIZES = '30vw'  # 구름 이미지 표시 너비 (srcSet 선택 기준)
+CLOUD_PRELOAD_FRAMES = 2  # 현재 프레임 앞뒤로 미리 받을 프레임 수
+
+# 타임테이블 공통 스타일
+timetable_style = dict(
+    style_table={
+        'height': '100%',
+        'overflowY': 'auto',
+        'width': '100%',
+        'minWidth': '100%',
+    },
+    style_cell={
+        'textAlign': 'center',
+        'minWidth': '100px',
+        'width': '100px',
+        'maxWidth': '100px',
+        'whiteSpace': 'normal',
+    },
+    style_header={
+        'backgroundColor': 'rgb(230, 230, 230)',
+        'fontWeight': 'bold',
+    },
+)
+
+# 기간 타임테이블의 숫자 열과 표시 소수 자릿수 ('contains' 필터에 사용)
+RANGE_NUMERIC_COLUMNS = [name for name, _, _, _ in COLUMNS]
+RANGE_DECIMALS = {name: int(fmt.strip('.f')) for name, _, _, fmt in COLUMNS}
 
 # 도시 옵션 동적 생성
 city_options = [{'label': city, 'value': city} for city in city_coordinates.keys()]
@@ -131,11 +239,39 @@ main_layout = dbc.Container([
                 id='timetable-link',
                 target='_blank'
             ),
+            # 타임테이블 기간(일)과 간격(분): 1일·10분이 아니면 서버 측 페이지 나눔 표로 열림
+            dbc.Input(
+                id='timetable-days-input',
+                type='number',
+                min=1,
+                max=MAX_RANGE_DAYS,
+                step=1,
+                value=1,
+                placeholder='Days',
+                style={'width': '90px'},
+                className='ml-2'
+            ),
+            dbc.Input(
+                id='timetable-step-input',
+                type='number',
+                min=1,
+                step=1,
+                value=DEFAULT_STEP_MINUTES,
+                placeholder='Step (min)',
+                style={'width': '90px'},
+                className='ml-2'
+            ),
             # 'clouds' 버튼 추가
             dbc.Button(
                 "clouds",
                 id='clouds-button',
                 className='btn btn-secondary ml-2'
+            ),
+            # Days·Step 기간의 조도 그래프 (백그라운드 계산)
+            dbc.Button(
+                "range",
+                id='range-graph-button',
+                className='btn btn-secondary ml-2'
             )
         ], width=12, className="mt-3 d-flex justify-content-start")
     ], className='mb-2'),
@@ -150,6 +286,13 @@ main_layout = dbc.Container([
                     dcc.Graph(id='moon-elevation-graph'),
                     html.Div(id='clouds-animation-container', style={'textAlign': 'center', 'marginTop': '20px'})
                 ]
+            ),
+            # 진행 막대는 스피너에 가려지지 않도록 로딩 영역 밖에 둠
+            dbc.Progress(id='range-progress', value=0, label='', striped=True, className='mt-2'),
+            dcc.Loading(
+                id='loading-range',
+                type='circle',
+                children=[dcc.Graph(id='range-graph')]
             )
         ], width=12)
     ], className='mt-4'),
@@ -192,7 +335,11 @@ clouds_layout = dbc.Container([
                 marks={i: f"{i+1}" for i in range(24)},
                 tooltip={"placement": "bottom", "always_visible": True}
             ),
-            html.Img(id='cloud-image', src='', style={'width': '30%', 'height': 'auto', 'marginTop': '20px'}),  # 이미지 크기 조정
+            # 이미지 크기 조정: 표시 너비(30vw)에 맞는 축소본을 브라우저가 srcSet 에서 고름
+            html.Img(id='cloud-image', src='', srcSet='', sizes=CLOUD_IMAGE_SIZES,
+                     style={'width': '30%', 'height': 'auto', 'marginTop': '20px'}),
+            # 슬라이더 앞뒤 프레임을 미리 받아 두는 숨은 이미지
+            html.Div(id='cloud-preload', style={'display': 'none'}),
             html.Div(id='image-caption', className='text-center mt-2')
         ], width=12)
     ], className='mt-4')
@@ -261,9 +408,11 @@ def update_date(prev_ts, next_ts, selected_date):
     Output('timetable-link', 'href'),
     [Input('date-picker', 'date'),
      Input('latitude-input', 'value'),
-     Input('longitude-input', 'value')]
+     Input('longitude-input', 'value'),
+     Input('timetable-days-input', 'value'),
+     Input('timetable-step-input', 'value')]
 )
-def update_timetable_link(selected_date, latitude, longitude):
+def update_timetable_link(selected_date, latitude, longitude, days=1, step_minutes=DEFAULT_STEP_MINUTES):
     if not selected_date:
         return "#"
 
@@ -278,6 +427,12 @@ def update_timetable_link(selected_date, latitude, longitude):
         'longitude': longitude,
         'timezone_offset': TIMEZONE_OFFSET
     }
+    days = int(days or 1)
+    step_minutes = int(step_minutes or DEFAULT_STEP_MINUTES)
+    if days > 1 or step_minutes != DEFAULT_STEP_MINUTES:
+        end_date = date_obj + timedelta(days=min(days, MAX_RANGE_DAYS) - 1)
+        query_params['end_date'] = end_date.strftime('%Y-%m-%d')
+        query_params['step_minutes'] = step_minutes
     query_string = urllib.parse.urlencode(query_params)
     return f"/timetable?{query_string}"
 
@@ -301,14 +456,18 @@ def update_timetable_table(search):
     except (KeyError, ValueError, IndexError):
         return "", dbc.Alert("잘못된 파라미터입니다.", color="danger")
 
+    # 기간 타임테이블: 페이지·정렬·필터를 서버에서 처리
+    if 'end_date' in params or 'step_minutes' in params:
+        return create_range_table(params, selected_date, latitude, longitude, timezone_offset)
+
     # 데이터 계산 및 수집
     data = get_calculated_data(selected_date, latitude, longitude, timezone_offset)
 
-    if not data:
+    if data is None or data.empty:
         return f"Selected Date: {selected_date}", dbc.Alert("데이터를 계산할 수 없습니다.", color="danger")
 
-    # DataFrame으로 변환
-    df = pd.DataFrame(data)
+    # 표시용 문자열로 포맷해 DataFrame으로 변환
+    df = pd.DataFrame(format_records(data))
 
     # 'Local Time' 포맷 수정
     if 'Local Time' in df.columns:
@@ -320,23 +479,7 @@ def update_timetable_table(search):
         data=df.to_dict('records'),
         fixed_rows={'headers': True},
         page_size=120,
-        style_table={
-            'height': '100%',
-            'overflowY': 'auto',
-            'width': '100%',
-            'minWidth': '100%',
-        },
-        style_cell={
-            'textAlign': 'center',
-            'minWidth': '100px',
-            'width': '100px',
-            'maxWidth': '100px',
-            'whiteSpace': 'normal',
-        },
-        style_header={
-            'backgroundColor': 'rgb(230, 230, 230)',
-            'fontWeight': 'bold',
-        },
+        **timetable_style
     )
 
     # 선택한 날짜 표시
@@ -344,6 +487,171 @@ def update_timetable_table(search):
 
     return formatted_date, table
 
+def parse_range_params(params, selected_date, timezone_offset):
+    """기간 타임테이블의 (시작 시각 UTC, 간격, 행 수). 잘못된 값이면 ValueError."""
+    start_date = datetime.strptime(selected_date, '%Y-%m-%d')
+    end_date = datetime.strptime(params.get('end_date', [selected_date])[0], '%Y-%m-%d')
+    step_minutes = int(params.get('step_minutes', [DEFAULT_STEP_MINUTES])[0])
+    days = (end_date - start_date).days + 1
+    if not 1 <= days <= MAX_RANGE_DAYS or step_minutes < 1:
+        raise ValueError(f"기간은 1~{MAX_RANGE_DAYS}일, 간격은 1분 이상이어야 합니다.")
+    # 시작 날짜 현지 자정부터 끝 날짜 다음 날 현지 자정 직전까지
+    start_utc = start_date - timedelta(hours=timezone_offset)
+    n_rows = days * 1440 // step_minutes
+    return start_utc, timedelta(minutes=step_minutes), n_rows
+
+def create_range_table(params, selected_date, latitude, longitude, timezone_offset):
+    """custom 페이지·정렬·필터를 쓰는 기간 타임테이블 (데이터는 update_range_table 이 페이지 단위로 채움)."""
+    try:
+        start_utc, step, n_rows = parse_range_params(params, selected_date, timezone_offset)
+    except (KeyError, ValueError, IndexError) as e:
+        return "", dbc.Alert(f"잘못된 파라미터입니다. {e}", color="danger")
+
+    end_date = params.get('end_date', [selected_date])[0]
+    step_minutes = int(step.total_seconds() // 60)
+    table = html.Div([
+        dcc.Store(id='range-params', data={
+            'start_utc': start_utc.isoformat(),
+            'step_minutes': step_minutes,
+            'n_rows': n_rows,
+            'latitude': latitude,
+            'longitude': longitude,
+            'timezone_offset': timezone_offset
+        }),
+        dash_table.DataTable(
+            id='range-table',
+            columns=[{"name": TIME_COLUMN, "id": TIME_COLUMN}] +
+                    [{"name": name, "id": name, "type": "numeric"} for name in RANGE_NUMERIC_COLUMNS],
+            page_current=0,
+            page_size=RANGE_PAGE_SIZE,
+            page_count=math.ceil(n_rows / RANGE_PAGE_SIZE),
+            page_action='custom',
+            sort_action='custom',
+            sort_mode='multi',
+            sort_by=[],
+            filter_action='custom',
+            filter_query='',
+            fixed_rows={'headers': True},
+            **timetable_style
+        )
+    ])
+    return f"Selected Dates: {selected_date} ~ {end_date} ({step_minutes} min)", table
+
+@functools.lru_cache(maxsize=4)
+def get_range_table(start_utc, step_minutes, n_rows, latitude, longitude, timezone_offset):
+    """정렬·필터용 기간 전체의 숫자 결과 (구조화 배열, 최근 몇 개 기간만 보관)."""
+    start = datetime.fromisoformat(start_utc)
+    step = timedelta(minutes=step_minutes)
+    return np.concatenate(list(iter_collected_data(
+        start, start + (n_rows - 1) * step, step, latitude, longitude, timezone_offset
+    )))
+
+FILTER_OPERATORS = [['ge ', '>='], ['le ', '<='], ['lt ', '<'], ['gt ', '>'], ['ne ', '!='], ['eq ', '='],
+                    ['contains '], ['datestartswith ']]
+
+def split_filter_part(filter_part):
+    """DataTable filter_query 의 한 조건을 (열 이름, 연산자, 값)으로 나눔. 알 수 없으면 (None, None, None)."""
+    # 열 이름에 'lt ', 'le ' 같은 글자가 들어 있으므로 {열 이름} 을 먼저 떼어 냄
+    filter_part = filter_part.strip()
+    if not filter_part.startswith('{') or '}' not in filter_part:
+        return None, None, None
+    name, rest = filter_part[1:].split('}', 1)
+    rest = rest.strip() + ' '
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if rest.startswith(operator):
+                value_part = rest[len(operator):].strip()
+                if value_part and value_part[0] == value_part[-1] and value_part[0] in ("'", '"', '`'):
+                    value = value_part[1:-1].replace('\\' + value_part[0], value_part[0])
+                else:
+                    value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+def local_time_strings(table):
+    """'Local Time' 열을 표에 보이는 'YYYY-MM-DD HH:MM' 문자열 배열로."""
+    return np.char.replace(np.datetime_as_string(table[TIME_COLUMN], unit='m'), 'T', ' ')
+
+def filter_mask(table, filter_query):
+    """filter_query 의 조건(&& 로 연결)을 모두 만족하는 행의 불리언 마스크."""
+    mask = np.ones(len(table), dtype=bool)
+    for filter_part in filter_query.split(' && '):
+        name, operator, value = split_filter_part(filter_part)
+        if name not in table.dtype.names:
+            continue
+        if name == TIME_COLUMN or operator in ('contains', 'datestartswith'):
+            column = local_time_strings(table) if name == TIME_COLUMN else \
+                np.array([f"{v:.{RANGE_DECIMALS[name]}f}" for v in table[name]])
+            if operator in ('contains', 'datestartswith'):
+                test = np.char.find(column, value) >= 0 if operator == 'contains' else np.char.startswith(column, value)
+                mask &= test
+                continue
+        else:
+            column = table[name]
+            try:
+                value = float(value)
+            except ValueError:
+                mask &= False
+                continue
+        mask &= {
+            'ge': column >= value, 'le': column <= value, 'lt': column < value,
+            'gt': column > value, 'ne': column != value, 'eq': column == value,
+        }[operator]
+    return mask
+
+@app.callback(
+    [Output('range-table', 'data'),
+     Output('range-table', 'page_count')],
+    [Input('range-table', 'page_current'),
+     Input('range-table', 'page_size'),
+     Input('range-table', 'sort_by'),
+     Input('range-table', 'filter_query')],
+    [State('range-params', 'data')]
+)
+def update_range_table(page_current, page_size, sort_by, filter_query, range_params):
+    if not range_params:
+        raise PreventUpdate
+
+    page_current = page_current or 0
+    first = page_current * page_size
+    start = datetime.fromisoformat(range_params['start_utc'])
+    step = timedelta(minutes=range_params['step_minutes'])
+    n_rows = range_params['n_rows']
+
+    if not sort_by and not filter_query:
+        # 정렬·필터가 없으면 보이는 페이지의 행만 계산
+        last = min(first + page_size, n_rows) - 1
+        if last < first:
+            return [], math.ceil(n_rows / page_size)
+        rows = next(iter_collected_data(
+            start + first * step, start + last * step, step,
+            range_params['latitude'], range_params['longitude'], range_params['timezone_offset'],
+            chunk_size=page_size
+        ))
+        page_count = math.ceil(n_rows / page_size)
+    else:
+        table = get_range_table(range_params['start_utc'], range_params['step_minutes'], n_rows,
+                                range_params['latitude'], range_params['longitude'],
+                                range_params['timezone_offset'])
+        if filter_query:
+            table = table[filter_mask(table, filter_query)]
+        if sort_by:
+            # np.lexsort 는 마지막 키가 우선이므로 역순으로 쌓음
+            keys = []
+            for sort in reversed(sort_by):
+                key = table[sort['column_id']]
+                if key.dtype.kind == 'M':
+                    key = key.astype(np.int64)
+                keys.append(-key if sort['direction'] == 'desc' else key)
+            table = table[np.lexsort(keys)]
+        rows = table[first:first + page_size]
+        page_count = max(math.ceil(len(table) / page_size), 1)
+
+    records = format_records(rows)
+    for record in records:
+        record[TIME_COLUMN] += ' KST'
+    return records, page_count
+
 # 메인 페이지에서 그래프를 업데이트하는 콜백
 @app.callback(
     [Output('esurface-graph', 'figure'),
@@ -356,17 +664,13 @@ def update_graphs(selected_date, latitude, longitude):
     if not selected_date or latitude is None or longitude is None:
         raise PreventUpdate
 
-    data = get_calculated_data(selected_date, latitude, longitude)
-    if not data:
+    df = get_calculated_data(selected_date, latitude, longitude)
+    if df is None or df.empty:
         return {'data': [], 'layout': {}}, {'data': [], 'layout': {}}
 
-    df = pd.DataFrame(data)
     if 'E_surface (millilux)' not in df.columns or 'Local Time' not in df.columns:
         return {'data': [], 'layout': {}}, {'data': [], 'layout': {}}
 
-    df['E_surface (millilux)'] = pd.to_numeric(df['E_surface (millilux)'], errors='coerce')
-    df['Local Time'] = pd.to_datetime(df['Local Time'], format='%Y-%m-%d %H:%M')
-
     # x축 범위를 설정하기 위해 시작 시간과 종료 시간을 지정
     start_time = df['Local Time'].iloc[0]
     end_time = df['Local Time'].iloc[-1]
@@ -415,8 +719,6 @@ def update_graphs(selected_date, latitude, longitude):
     if 'Moon Alt (°)' not in df.columns:
         return fig, {'data': [], 'layout': {}}
 
-    df['Moon Alt (°)'] = pd.to_numeric(df['Moon Alt (°)'], errors='coerce')
-
     moon_fig = {
         'data': [{
             'x': df['Local Time'],
@@ -448,50 +750,220 @@ def update_graphs(selected_date, latitude, longitude):
 
     return fig, moon_fig
 
+def parse_utc(body, name):
+    """body[name] 의 ISO 시각을 시간대 없는 UTC datetime 으로. 시간대가 없으면 UTC 로 봄."""
+    value = body[name]
+    if not isinstance(value, str):
+        raise ValueError(f"{name} 는 ISO 형식의 시각 문자열이어야 합니다.")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} 를 ISO 형식의 시각으로 읽을 수 없습니다: {value}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def parse_bulk_request(body):
+    """대량 조회 요청 본문을 (위도 배열, 경도 배열, id 목록, 시작 UTC, 끝 UTC, 간격, 열 목록)으로. 잘못되면 ValueError."""
+    if not isinstance(body, dict):
+        raise ValueError("JSON 객체가 필요합니다.")
+    locations = body.get('locations')
+    if not isinstance(locations, list) or not locations:
+        raise ValueError("locations 는 비어 있지 않은 목록이어야 합니다.")
+    if len(locations) > MAX_BULK_LOCATIONS:
+        raise ValueError(f"locations 는 최대 {MAX_BULK_LOCATIONS}개입니다.")
+    latitudes, longitudes, ids = [], [], []
+    for i, location in enumerate(locations):
+        try:
+            if isinstance(location, dict):
+                latitude, longitude = float(location['latitude']), float(location['longitude'])
+                location_id = location.get('id', i)
+            else:
+                latitude, longitude = location
+                latitude, longitude = float(latitude), float(longitude)
+                location_id = i
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"locations[{i}]: 위도·경도를 읽을 수 없습니다 ({e}).")
+        if not (math.isfinite(latitude) and abs(latitude) <= 90):
+            raise ValueError(f"locations[{i}]: 위도는 -90 ~ 90 사이여야 합니다.")
+        if not math.isfinite(longitude):
+            raise ValueError(f"locations[{i}]: 경도는 유한한 값이어야 합니다.")
+        latitudes.append(latitude)
+        longitudes.append(longitude)
+        ids.append(location_id)
+
+    step_minutes = body.get('step_minutes', DEFAULT_STEP_MINUTES)
+    if isinstance(step_minutes, bool) or not isinstance(step_minutes, (int, float)):
+        raise ValueError("step_minutes 는 숫자여야 합니다.")
+    if not 0 < step_minutes <= MAX_BULK_STEP_MINUTES:
+        raise ValueError(f"step_minutes 는 0 보다 크고 {MAX_BULK_STEP_MINUTES} 이하여야 합니다.")
+    step = timedelta(minutes=step_minutes)
+    if 'date' in body:
+        # 하루 단위 조회는 calculate_and_collect_data 와 같은 07:00~23:00 UTC 구간
+        date_obj = datetime.strptime(body['date'], '%Y-%m-%d')
+        start_utc, end_utc = date_obj + timedelta(hours=7), date_obj + timedelta(hours=23)
+    else:
+        start_utc = parse_utc(body, 'start')
+        end_utc = parse_utc(body, 'end')
+    if end_utc < start_utc:
+        raise ValueError("end 는 start 보다 늦어야 합니다.")
+    n_times = int((end_utc - start_utc) / step) + 1
+    if n_times * len(latitudes) > MAX_BULK_VALUES:
+        raise ValueError(f"위치 수 × 시각 수는 최대 {MAX_BULK_VALUES}입니다.")
+
+    columns = body.get('columns', ['E_surface (millilux)'])
+    if not isinstance(columns, list) or not columns or not all(isinstance(name, str) for name in columns):
+        raise ValueError("columns 는 열 이름(문자열)의 비어 있지 않은 목록이어야 합니다.")
+    unknown = set(columns) - set(RANGE_NUMERIC_COLUMNS)
+    if unknown:
+        raise ValueError(f"알 수 없는 열: {sorted(unknown)}")
+    return np.array(latitudes), np.array(longitudes), ids, start_utc, end_utc, step, columns
+
+def finite_or_none(rows):
+    """JSON 에 넣을 수 있도록 NaN·inf 를 None(null) 으로 바꾼 중첩 목록."""
+    return np.where(np.isfinite(rows), rows, None).tolist()
+
+@server.route('/api/illuminance', methods=['POST'])
+def bulk_illuminance():
+    """
+    여러 위치의 조도 계열을 NDJSON 으로 스트리밍하는 API.
+
+    요청 (JSON):
+        locations: [{"latitude": .., "longitude": .., "id": ..}, ...] 또는 [[위도, 경도], ...]
+        date: "YYYY-MM-DD" (07:00~23:00 UTC) 또는 start / end: ISO 시각 (시간대가 없으면 UTC, 있으면 UTC 로 변환)
+        step_minutes: 간격 (분, 기본 10)
+        columns: 돌려줄 열 이름 목록 (타임테이블 열 이름, 기본 ["E_surface (millilux)"])
+
+    응답 (application/x-ndjson): 첫 줄은 요청 요약, 이후 시각 덩어리마다 위치별로 한 줄
+        {"location": 순번, "id": .., "time_utc": [...], "<열 이름>": [...], ...}
+    """
+    try:
+        latitudes, longitudes, ids, start_utc, end_utc, step, columns = parse_bulk_request(
+            request.get_json(silent=True))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    chunk_size = max(1, BULK_CHUNK_VALUES // len(ids))
+
+    def generate():
+        yield json.dumps({
+            'locations': len(ids),
+            'start_utc': start_utc.isoformat(),
+            'end_utc': end_utc.isoformat(),
+            'step_minutes': step.total_seconds() / 60,
+            'columns': columns
+        }, allow_nan=False) + '\n'
+        for times, values in iter_collected_columns(start_utc, end_utc, step, latitudes, longitudes,
+                                                    chunk_size, columns):
+            time_utc = np.datetime_as_string(times, unit='s').tolist()
+            values = {name: finite_or_none(array.T) for name, array in values.items()}
+            for i, location_id in enumerate(ids):
+                line = {'location': i, 'id': location_id, 'time_utc': time_utc}
+                for name in columns:
+                    line[name] = values[name][i]
+                yield json.dumps(line, allow_nan=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 # 슬라이더를 사용하여 이미지 인덱스를 선택하고 이미지 표시 콜백
 @app.callback(
     [Output('cloud-image', 'src'),
-     Output('image-caption', 'children')],
+     Output('cloud-image', 'srcSet'),
+     Output('image-caption', 'children'),
+     Output('cloud-preload', 'children')],
     [Input('image-slider', 'value')]
 )
 def update_cloud_image(slider_value):
-    # 이미지 파일 리스트 가져오기
-    image_dir = 'assets/cloud_images'
-    
-    # 파일 이름에서 숫자 부분을 추출하여 정렬
-    image_files = sorted(
-        [f for f in os.listdir(image_dir) if f.startswith('cloud_') and f.endswith('.png')],
-        key=lambda x: int(x.split('_')[1].split('.')[0])
-    )
-
-    if not image_files:
-        return '', '이미지를 찾을 수 없습니다.'
-
-    if slider_value < 0 or slider_value >= len(image_files):
-        return '', '잘못된 이미지 인덱스입니다.'
-
-    image_filename = image_files[slider_value]
-    image_src = app.get_asset_url(f'cloud_images/{image_filename}')
-
-    # tmef_list 불러오기
-    tmef_list_path = os.path.join(image_dir, 'tmef_list.txt')
-    if not os.path.exists(tmef_list_path):
-        return image_src, 'tmef_list 파일이 존재하지 않습니다.'
-
-    with open(tmef_list_path, 'r') as f:
-        tmef_list = [line.strip() for line in f]
-
-    # tmef_list와 image_files의 길이가 일치하는지 확인
-    if len(tmef_list) != len(image_files):
-        return image_src, 'tmef_list와 이미지 파일 수가 일치하지 않습니다.'
-
-    if slider_value >= len(tmef_list):
-        caption = '시간 정보가 없습니다.'
-    else:
-        tmef = tmef_list[slider_value]
-        caption = f"Time: {tmef}"
+    # 캐시된 이미지 목록에서 찾기 (디렉터리가 바뀌었을 때만 다시 읽음)
+    frames = cloud_frame_index.get()
+    image_filename, caption = frames.lookup(slider_value)
+    if image_filename is None:
+        return '', '', caption, []
+
+    def asset_url(path):
+        return app.get_asset_url(f'cloud_images/{path}')
+
+    image_src = asset_url(frames.src(image_filename))
+
+    # 앞뒤 프레임을 같은 srcSet·sizes 로 미리 받아 두어 슬라이더를 움직일 때 네트워크를 기다리지 않게 함
+    preload = []
+    for offset in range(1, CLOUD_PRELOAD_FRAMES + 1):
+        for index in (slider_value + offset, slider_value - offset):
+            if 0 <= index < len(frames.files):
+                name = frames.files[index]
+                preload.append(html.Img(src=asset_url(frames.src(name)), srcSet=frames.srcset(name, asset_url),
+                                        sizes=CLOUD_IMAGE_SIZES))
+    return image_src, frames.srcset(image_filename, asset_url), caption, preload
+
+def compute_range_graph(set_progress, n_clicks, selected_date, latitude, longitude, days, step_minutes):
+    """Days·Step 기간의 E_surface 그래프. 하루씩 계산하며 set_progress((퍼센트, 라벨))로 진행 상황을 알림."""
+    date_obj, latitude, longitude = parse_inputs(selected_date, latitude, longitude)
+    if not n_clicks or date_obj is None:
+        raise PreventUpdate
+    days = min(int(days or 1), MAX_RANGE_DAYS)
+    step = timedelta(minutes=int(step_minutes or DEFAULT_STEP_MINUTES))
+
+    # 시작 날짜 현지 자정부터 끝 날짜 다음 날 현지 자정 직전까지, 하루 분량씩
+    start_utc = date_obj - timedelta(hours=TIMEZONE_OFFSET)
+    end_utc = start_utc + timedelta(days=days) - step
+    rows_per_day = max(1, int(timedelta(days=1) / step))
+    times, values = [], []
+    set_progress((0, f"0/{days} days"))
+    for i, (chunk_times, columns) in enumerate(iter_collected_columns(
+            start_utc, end_utc, step, latitude, longitude, rows_per_day, ['E_surface (millilux)'])):
+        times.append(chunk_times + np.timedelta64(TIMEZONE_OFFSET * 3600, 's'))
+        values.append(columns['E_surface (millilux)'])
+        done = min(i + 1, days)
+        set_progress((100 * done // days, f"{done}/{days} days"))
+
+    local_times = np.concatenate(times)
+    return {
+        'data': [{
+            'x': local_times,
+            'y': np.concatenate(values) + 0.5,
+            'type': 'line',
+            'name': 'E_surface (millilux)',
+            'marker': {'color': 'blue'}
+        }],
+        'layout': {
+            'title': f'Nighttime Illuminance {selected_date} + {days} days',
+            'xaxis': {'title': 'Time (KST)', 'range': [local_times[0], local_times[-1]]},
+            'yaxis': {
+                'title': 'Illuminance (millilux)',
+                'type': 'log',
+                'range': [-1, 3],
+                'tickvals': [0.1, 1, 10, 100, 1000],
+                'ticktext': ['0.1', '1', '10', '100', '1000'],
+                'autorange': False
+            },
+            'margin': {'l': 50, 'r': 20, 't': 50, 'b': 80},
+            'height': 400
+        }
+    }
 
-    return image_src, caption
+range_graph_outputs = dict(
+    output=Output('range-graph', 'figure'),
+    inputs=[Input('range-graph-button', 'n_clicks')],
+    state=[State('date-picker', 'date'),
+           State('latitude-input', 'value'),
+           State('longitude-input', 'value'),
+           State('timetable-days-input', 'value'),
+           State('timetable-step-input', 'value')],
+    prevent_initial_call=True
+)
+if background_callback_manager is not None:
+    # 날짜·좌표가 바뀌면 진행 중인 계산을 취소
+    app.callback(
+        **range_graph_outputs,
+        background=True,
+        progress=[Output('range-progress', 'value'), Output('range-progress', 'label')],
+        cancel=[Input('date-picker', 'date'), Input('latitude-input', 'value'), Input('longitude-input', 'value')],
+        running=[(Output('range-graph-button', 'disabled'), True, False)]
+    )(compute_range_graph)
+else:
+    @app.callback(**range_graph_outputs)
+    def update_range_graph(*args):
+        return compute_range_graph(lambda progress: None, *args)
 
 @app.callback(
     Output('url', 'pathname'),
@@ -0,0 +1,82 @@
+# astronomy/adaptive.py
+"""
+조도 곡선(E_surface)을 적응형 시간 간격으로 샘플링합니다.
+
+박명 구간처럼 E_surface 가 지수적으로 변하는 곳은 잘게, 깊은 밤처럼 평탄한 곳은 성기게 나눕니다.
+구간의 중간점에서 계산한 값이 양 끝의 (로그 스케일) 선형 보간과 tolerance 이상 다르거나,
+양 끝이 calculate_R_Twilight_sun 의 박명 구간에서 서로 다르면 구간을 둘로 나눕니다.
+공기 질량 식의 구간(m 제한, -1 라디안 이하)은 천체가 지평선 아래일 때만 해당되어
+E_surface 에 영향을 주지 않으므로 따로 보지 않습니다.
+"""
+
+import numpy as np
+from .vectorized import julian_day_array, jd_to_datetime64, calculate_sun_and_moon_terms
+
+# 로그 오차 계산 시 0 lux 를 피하기 위한 하한 (lux, 0.01 millilux)
+E_FLOOR = 1e-5
+
+
+def _evaluate(JD, latitude, longitude):
+    """JD 배열에서 열 배열 딕셔너리와 E_surface, 구간 번호를 계산합니다."""
+    sun_data, moon_data = calculate_sun_and_moon_terms(JD, latitude, longitude)
+    columns = {**sun_data, **moon_data}
+    columns['E_surface'] = sun_data['R_Twilight_sun'] + moon_data['R_light_moon']
+    # calculate_R_Twilight_sun 의 구간 (0: 낮, 1: 0 ~ -6°, 2: -6 ~ -12°, 3: 그 이하)
+    # 굴절 보정 후 고도 기준이라 지평선 근처에서 경계가 조금 어긋날 수 있지만 분할 판단에만 씁니다.
+    branch = np.digitize(-sun_data['altitude_sun'], [0.0, 6.0, 12.0], right=True)
+    return columns, branch
+
+
+def sample_illuminance_adaptive(start_utc, end_utc, latitude, longitude, tolerance=0.05,
+                                min_step_minutes=1.0, max_step_minutes=60.0):
+    """
+    start_utc ~ end_utc 구간의 조도 곡선을 적응형 간격으로 계산합니다.
+
+    Parameters:
+        start_utc, end_utc: UTC 시작·끝 시각 (datetime 또는 datetime64)
+        latitude, longitude: 관측 위치
+        tolerance: 구간 중간점에서의 허용 오차 (log10(E_surface) 단위, 0.05 ≈ 12%)
+        min_step_minutes: 가장 작은 샘플 간격 (분)
+        max_step_minutes: 가장 큰 샘플 간격 (분, 초기 격자)
+
+    Returns:
+        dict: 'time' (datetime64[ns]) 과 calculate_sun_position / calculate_moon_position_and_phase 의
+              모든 키, 'E_surface' (lux) 의 열 배열. 시간 순으로 정렬되어 있습니다.
+    """
+    jd_start = float(julian_day_array(start_utc))
+    jd_end = float(julian_day_array(end_utc))
+    min_step = min_step_minutes / 1440.0
+    n_initial = max(int(np.ceil((jd_end - jd_start) * 1440.0 / max_step_minutes)), 1)
+    JD = np.linspace(jd_start, jd_end, n_initial + 1)
+
+    columns, branch = _evaluate(JD, latitude, longitude)
+    samples = [(JD, columns)]
+    log_E = np.log10(columns['E_surface'] + E_FLOOR)
+
+    # 아직 확인하지 않은 구간 (왼쪽 끝, 오른쪽 끝의 JD·log E·구간 번호)
+    lo, hi = JD[:-1], JD[1:]
+    log_lo, log_hi = log_E[:-1], log_E[1:]
+    branch_lo, branch_hi = branch[:-1], branch[1:]
+
+    while lo.size:
+        mid = (lo + hi) / 2
+        mid_columns, branch_mid = _evaluate(mid, latitude, longitude)
+        samples.append((mid, mid_columns))
+        log_mid = np.log10(mid_columns['E_surface'] + E_FLOOR)
+
+        error = np.abs(log_mid - (log_lo + log_hi) / 2)
+        split = (error > tolerance) | (branch_lo != branch_hi) | (branch_mid != branch_lo)
+        split &= (hi - lo) / 2 > min_step
+
+        lo, hi = np.concatenate([lo[split], mid[split]]), np.concatenate([mid[split], hi[split]])
+        log_lo, log_hi = (np.concatenate([log_lo[split], log_mid[split]]),
+                          np.concatenate([log_mid[split], log_hi[split]]))
+        branch_lo, branch_hi = (np.concatenate([branch_lo[split], branch_mid[split]]),
+                                np.concatenate([branch_mid[split], branch_hi[split]]))
+
+    JD = np.concatenate([jd for jd, _ in samples])
+    order = np.argsort(JD, kind='stable')
+    result = {'time': jd_to_datetime64(JD[order])}
+    for key in samples[0][1]:
+        result[key] = np.concatenate([np.broadcast_to(c[key], jd.shape) for jd, c in samples])[order]
+    return result
@@ -0,0 +1,278 @@
+# astronomy/chebyshev.py
+"""
+2000-01-01 ~ 2100-12-31 구간의 태양·달 겉보기 위치를 체비쇼프 다항식으로 미리 적합해 둔 이진 파일.
+
+빌드:  python -m astronomy.chebyshev [출력 경로]
+실행:  eph = ChebyshevEphemeris(); eph.sun_time_terms(JD), eph.moon_time_terms(JD)
+
+적합 대상은 sun.py / moon.py 모델 그 자체이며(vectorized.sun_time_terms, moon_time_terms, 빌드 시점의 series 단계),
+빌드 시 각 구간의 중간 시각에서 원래 모델과 비교해 아래 MAX_FIT_ERROR 를 넘으면 실패합니다.
+파일 머리에 모델 소스 해시(series.model_source_hash)와 series 단계를 기록하며, 읽을 때 지금의 모델과 다르면
+사용하지 않습니다 (rebuild=True 이면 다시 만듭니다).
+각도는 [0, 360) 범위로 돌려줍니다.
+"""
+
+import os
+import struct
+import sys
+import numpy as np
+from . import lookup
+from .vectorized import (
+    get_julian_centuries,
+    greenwich_mean_sidereal_time,
+    apparent_sidereal_time,
+    calculate_extraterrestrial_solar_illuminance,
+    calculate_phase_angle_geo,
+    calculate_moon_illuminance,
+    sun_time_terms,
+    moon_time_terms
+)
+from .series import get_series_tier, model_source_hash
+
+# 적용 구간 (app.py 의 날짜 선택 범위 2000-01-01 ~ 2100-12-31 을 포함)
+JD_START = 2451544.5  # 2000-01-01T00:00Z
+JD_END = 2488434.5    # 2101-01-01T00:00Z
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'chebyshev_2000_2100.bin')
+
+FILE_MAGIC = b'MOONCHEB'
+FILE_VERSION = 2
+FILE_HEADER = struct.Struct('<8sII16s8sdd')  # magic, version, 천체 수, 모델 소스 해시, series 단계, JD 시작, JD 끝
+BODY_HEADER = struct.Struct('<8sIIId')     # 이름, 구간 수, 물리량 수, 계수 수, 구간 길이(일)
+
+# 천체별 적합 물리량, 구간 길이(일), 다항식 계수 수
+BODIES = {
+    'sun': {
+        'quantities': ('alpha_sun', 'delta_sun', 'r_sun_earth', 'lambda_sun'),
+        'angles': ('alpha_sun', 'lambda_sun'),
+        'segment_days': 32.0,
+        'n_coeffs': 10,
+    },
+    'moon': {
+        'quantities': ('alpha_moon', 'delta_moon', 'distance_moon', 'lambda_moon', 'beta_moon'),
+        'angles': ('alpha_moon', 'lambda_moon'),
+        'segment_days': 8.0,
+        'n_coeffs': 16,
+    },
+}
+
+# 원래 모델 대비 허용 최대 오차 (각도: 도, r_sun_earth: AU, distance_moon: km)
+MAX_FIT_ERROR = {
+    'alpha_sun': 1e-7, 'delta_sun': 1e-7, 'r_sun_earth': 1e-10, 'lambda_sun': 1e-7,
+    'alpha_moon': 1e-6, 'delta_moon': 1e-6, 'distance_moon': 1e-3, 'lambda_moon': 1e-6, 'beta_moon': 1e-6,
+}
+
+
+def _model_values(body, JD, tier=None):
+    """원래 모델(vectorized)로 body 의 적합 물리량을 계산해 (..., 물리량 수) 배열로 돌려줍니다."""
+    terms = sun_time_terms(JD) if body == 'sun' else moon_time_terms(JD, tier=tier)
+    return np.stack([terms[q] for q in BODIES[body]['quantities']], axis=-1)
+
+
+def _chebyshev_nodes(n_coeffs):
+    """[-1, 1] 구간의 체비쇼프 노드 (시간 오름차순)."""
+    return np.cos(np.pi * (np.arange(n_coeffs)[::-1] + 0.5) / n_coeffs)
+
+
+def _chebyshev_basis(x, n_coeffs):
+    """x (...) 에서의 T_0(x) ... T_{n-1}(x) 를 점화식으로 계산해 (n_coeffs, ...) 배열로 돌려줍니다."""
+    basis = np.empty((n_coeffs,) + x.shape)
+    basis[0] = 1.0
+    if n_coeffs > 1:
+        basis[1] = x
+    x2 = 2 * x
+    for j in range(2, n_coeffs):
+        np.multiply(x2, basis[j - 1], out=basis[j])
+        basis[j] -= basis[j - 2]
+    return basis
+
+
+def fit_body(body, jd_start=JD_START, jd_end=JD_END, tier=None):
+    """
+    body('sun' 또는 'moon')의 물리량을 고정 길이 구간마다 체비쇼프 다항식으로 적합합니다.
+    tier: series 정확도 단계 (None 이면 현재 기본 단계)
+    반환값: (구간 수, 물리량 수, 계수 수) 계수 배열
+    """
+    spec = BODIES[body]
+    segment_days, n_coeffs = spec['segment_days'], spec['n_coeffs']
+    n_segments = int(np.ceil((jd_end - jd_start) / segment_days))
+
+    nodes = _chebyshev_nodes(n_coeffs)
+    seg_start = jd_start + segment_days * np.arange(n_segments)
+    JD = seg_start[:, np.newaxis] + (nodes + 1) * (segment_days / 2)
+    values = _model_values(body, JD, tier)  # (구간, 노드, 물리량)
+
+    # 각도는 구간 안에서 연속이 되도록 펼친 뒤 적합
+    for i, q in enumerate(spec['quantities']):
+        if q in spec['angles']:
+            values[..., i] = np.unwrap(values[..., i], period=360.0, axis=1)
+
+    # 이산 체비쇼프 변환: c_j = (2/n) Σ f(x_k) T_j(x_k), c_0 은 절반
+    T_matrix = np.cos(np.outer(np.arccos(nodes), np.arange(n_coeffs)))
+    coeffs = np.einsum('snq,nj->sqj', values, T_matrix) * (2.0 / n_coeffs)
+    coeffs[..., 0] /= 2
+    return coeffs
+
+
+def build_ephemeris_file(path=DEFAULT_PATH, jd_start=JD_START, jd_end=JD_END, tier=None):
+    """
+    태양·달 체비쇼프 계수를 적합하고 원래 모델과의 오차를 검증한 뒤 이진 파일로 저장합니다.
+    tier: series 정확도 단계 (None 이면 현재 기본 단계). 모델 소스 해시와 함께 파일 머리에 기록합니다.
+    반환값: 물리량별 최대 오차 딕셔너리
+    """
+    tier = tier or get_series_tier()
+    fitted = {body: fit_body(body, jd_start, jd_end, tier) for body in BODIES}
+
+    max_errors = {}
+    for body, coeffs in fitted.items():
+        spec = BODIES[body]
+        segment_days = spec['segment_days']
+        # 노드 사이(각 구간의 여러 비노드 시각)에서 원래 모델과 비교
+        offsets = np.linspace(0.05, 0.95, 7) * segment_days
+        JD = (jd_start + segment_days * np.arange(coeffs.shape[0]))[:, np.newaxis] + offsets
+        JD = JD[JD < jd_end]
+        expected = _model_values(body, JD, tier)
+        actual = _evaluate(coeffs, jd_start, segment_days, JD)
+        for i, q in enumerate(spec['quantities']):
+            diff = actual[..., i] - expected[..., i]
+            if q in spec['angles']:
+                diff = (diff + 180.0) % 360.0 - 180.0
+            max_errors[q] = float(np.max(np.abs(diff)))
+            if max_errors[q] > MAX_FIT_ERROR[q]:
+                raise ValueError(f"{q} 적합 오차 {max_errors[q]:.3g} 가 허용치 {MAX_FIT_ERROR[q]:.3g} 를 넘습니다.")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, len(fitted), model_source_hash().encode('ascii'),
+                                 tier.encode('ascii'), jd_start, jd_end))
+        for body, coeffs in fitted.items():
+            n_segments, n_quantities, n_coeffs = coeffs.shape
+            f.write(BODY_HEADER.pack(body.encode('ascii'), n_segments, n_quantities, n_coeffs,
+                                     BODIES[body]['segment_days']))
+            f.write(np.ascontiguousarray(coeffs, dtype='<f8').tobytes())
+    os.replace(tmp_path, path)
+    return max_errors
+
+
+def _evaluate(coeffs, jd_start, segment_days, JD):
+    """계수 배열에서 JD 시각의 물리량을 (..., 물리량 수) 배열로 계산합니다."""
+    JD = np.asarray(JD, dtype=float)
+    segment = np.floor((JD - jd_start) / segment_days).astype(np.int64)
+    segment = np.clip(segment, 0, coeffs.shape[0] - 1)
+    x = 2 * (JD - jd_start - segment * segment_days) / segment_days - 1
+    basis = _chebyshev_basis(x, coeffs.shape[-1])
+    return np.einsum('j...,...qj->...q', basis, np.asarray(coeffs)[segment])
+
+
+def read_file_header(path):
+    """파일 머리의 (magic, version, 천체 수, 모델 소스 해시, series 단계, JD 시작, JD 끝). 길이가 모자라면 None."""
+    with open(path, 'rb') as f:
+        data = f.read(FILE_HEADER.size)
+    if len(data) < FILE_HEADER.size:
+        return None
+    magic, version, n_bodies, source_hash, tier, jd_start, jd_end = FILE_HEADER.unpack(data)
+    return (magic, version, n_bodies, source_hash.rstrip(b'\0').decode('ascii', 'replace'),
+            tier.rstrip(b'\0').decode('ascii', 'replace'), jd_start, jd_end)
+
+
+def _header_problem(header, tier):
+    """파일 머리가 지금의 모델·단계와 맞지 않는 이유. 맞으면 None."""
+    if header is None or header[0] != FILE_MAGIC or header[1] != FILE_VERSION:
+        return "지원하지 않는 체비쇼프 천체력 파일입니다"
+    if header[3] != model_source_hash():
+        return f"모델 소스 해시({header[3]})가 지금의 모델({model_source_hash()})과 다릅니다"
+    if header[4] != tier:
+        return f"series 단계({header[4]})가 요청한 단계({tier})와 다릅니다"
+    return None
+
+
+class ChebyshevEphemeris:
+    """
+    build_ephemeris_file 로 만든 이진 파일을 메모리 매핑으로 읽어 태양·달의 시각별 항을 계산합니다.
+    sun_time_terms / moon_time_terms 는 vectorized 의 같은 이름 함수와 같은 키를 돌려주므로
+    vectorized.sun_local_terms / moon_local_terms 와 grid.calculate_illuminance_cube 에 그대로 쓸 수 있습니다.
+
+    tier: 기대하는 series 단계 (None 이면 현재 기본 단계)
+    rebuild: True 이면 파일이 없거나 모델 소스 해시·단계가 맞지 않을 때 다시 만듭니다 (1초 안팎).
+        False 이면 FileNotFoundError / ValueError 를 냅니다.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, tier=None, rebuild=False):
+        self.tier = tier or get_series_tier()
+        if not os.path.exists(path):
+            if not rebuild:
+                raise FileNotFoundError(f"{path} 가 없습니다. 'python -m astronomy.chebyshev' 로 먼저 생성하세요.")
+            build_ephemeris_file(path, tier=self.tier)
+        problem = _header_problem(read_file_header(path), self.tier)
+        if problem is not None:
+            if not rebuild:
+                raise ValueError(f"{path}: {problem}. 'python -m astronomy.chebyshev' 로 다시 생성하세요.")
+            build_ephemeris_file(path, tier=self.tier)
+        _, _, n_bodies, self.source_hash, _, self.jd_start, self.jd_end = read_file_header(path)
+
+        self.bodies = {}
+        offset = FILE_HEADER.size
+        with open(path, 'rb') as f:
+            for _ in range(n_bodies):
+                f.seek(offset)
+                name, n_segments, n_quantities, n_coeffs, segment_days = BODY_HEADER.unpack(f.read(BODY_HEADER.size))
+                offset += BODY_HEADER.size
+                shape = (n_segments, n_quantities, n_coeffs)
+                coeffs = np.memmap(path, dtype='<f8', mode='r', offset=offset, shape=shape)
+                offset += coeffs.nbytes
+                self.bodies[name.rstrip(b'\0').decode('ascii')] = (coeffs, segment_days)
+
+    def evaluate(self, body, JD):
+        """body 의 적합 물리량을 딕셔너리로 돌려줍니다. 각도는 [0, 360) 범위입니다."""
+        JD = np.asarray(JD, dtype=float)
+        if np.any((JD < self.jd_start) | (JD > self.jd_end)):
+            raise ValueError("체비쇼프 천체력의 적용 구간(2000-01-01 ~ 2100-12-31)을 벗어난 시각입니다.")
+        coeffs, segment_days = self.bodies[body]
+        values = _evaluate(coeffs, self.jd_start, segment_days, JD)
+        spec = BODIES[body]
+        result = {}
+        for i, q in enumerate(spec['quantities']):
+            result[q] = values[..., i] % 360.0 if q in spec['angles'] else values[..., i]
+        return result
+
+    def sun_time_terms(self, JD):
+        """vectorized.sun_time_terms 와 같은 키의 태양 시각별 항."""
+        JD = np.asarray(JD, dtype=float)
+        T = get_julian_centuries(JD)
+        terms = self.evaluate('sun', JD)
+        terms.update({
+            'JD': JD,
+            'T': T,
+            'E_ST': calculate_extraterrestrial_solar_illuminance(JD, T),
+            'GAST': apparent_sidereal_time(greenwich_mean_sidereal_time(JD, T), T)
+        })
+        return terms
+
+    def moon_time_terms(self, JD, sun_terms=None, fast=False):
+        """vectorized.moon_time_terms 와 같은 키의 달 시각별 항 (fast: lookup 의 위상 법칙 표 사용)."""
+        if sun_terms is None:
+            sun_terms = self.sun_time_terms(JD)
+        JD, T = sun_terms['JD'], sun_terms['T']
+        terms = self.evaluate('moon', JD)
+        phase_angle_moon, illumination = calculate_phase_angle_geo(
+            sun_terms['lambda_sun'], terms['lambda_moon'], terms['beta_moon'], terms['distance_moon'], T,
+            sun_terms['r_sun_earth'])
+        terms.update({
+            'JD': JD,
+            'T': T,
+            'phase_angle_moon': phase_angle_moon,
+            'illumination': illumination,
+            'E_MT': (lookup.calculate_moon_illuminance if fast else calculate_moon_illuminance)(
+                phase_angle_moon, terms['distance_moon']),
+            'GAST': sun_terms['GAST']
+        })
+        return terms
+
+
+if __name__ == '__main__':
+    output_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    errors = build_ephemeris_file(output_path)
+    print(f"{output_path} 파일이 저장되었습니다. ({os.path.getsize(output_path) / 1e6:.1f} MB)")
+    for quantity, error in errors.items():
+        print(f"  {quantity}: 최대 오차 {error:.3g} (허용치 {MAX_FIT_ERROR[quantity]:.3g})")
@@ -0,0 +1,156 @@
+# astronomy/ephemeris.py
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from .helpers import julian_day, get_julian_centuries, greenwich_mean_sidereal_time, apparent_sidereal_time
+from .sun import solar_mean_anomaly, eccentricity_earth_orbit, sun_equation_of_center, calculate_lambda_sun, \
+    calculate_sun_earth_distance, sun_equatorial_coordinates, calculate_extraterrestrial_solar_illuminance
+from .moon import nutation, moon_time_terms, calculate_moon_illuminance
+from .series import get_series_tier
+
+# 시각별 항 캐시의 기본 메모리 상한 (바이트). 항목 하나는 약 0.7 KB 로, 약 11,000 개 시각을 보관합니다.
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024
+
+
+class EphemerisContext:
+    """
+    한 시각(UTC)에 대해 관측 위치와 무관한 태양·달의 값 묶음.
+    calculate_sun_position / calculate_moon_position_and_phase 에 context 로 넘기면
+    줄리안 날짜, 항성시, 세차·진동, 태양·달의 적경·적위, 거리, 위상각, 달빛 조도(E_MT) 등을 한 번만 계산합니다.
+    """
+
+    __slots__ = ('JD', 'T', 'GMST', 'GAST', 'delta_psi', 'delta_epsilon',
+                 'M_sun', 'e', 'C_sun', 'lambda_sun', 'r_sun_earth', 'alpha_sun', 'delta_sun', 'E_ST',
+                 'lambda_moon', 'beta_moon', 'alpha_moon', 'delta_moon', 'distance_moon',
+                 'phase_angle_moon', 'illumination', 'E_MT')
+
+    def __init__(self, year, month, day, hour, minute, second):
+        # 줄리안 날짜 및 세기
+        self.JD = julian_day(year, month, day, hour, minute, second)
+        self.T = get_julian_centuries(self.JD)
+
+        # 항성시
+        self.GMST = greenwich_mean_sidereal_time(self.JD, self.T)
+        self.GAST = apparent_sidereal_time(self.GMST, self.T)
+
+        # 세차(Δψ)와 진동(Δε)
+        self.delta_psi, self.delta_epsilon = nutation(self.T)
+
+        # 태양의 평균 근점, 이심률, 중심차, 진황경, 지구-태양 거리(AU), 적경·적위, 외계 조도
+        self.M_sun = solar_mean_anomaly(self.T)
+        self.e = eccentricity_earth_orbit(self.T)
+        self.C_sun = sun_equation_of_center(self.T, self.M_sun)
+        self.lambda_sun = calculate_lambda_sun(self.T)
+        self.r_sun_earth = calculate_sun_earth_distance((self.M_sun + self.C_sun) % 360.0, self.e)
+        self.alpha_sun, self.delta_sun = sun_equatorial_coordinates(self.T, self.lambda_sun)
+        self.E_ST = calculate_extraterrestrial_solar_illuminance(self.JD, self.T)
+
+        # 달의 황경·황위, 적경·적위, 거리, 위상각, 밝은 면 비율, 달빛 조도
+        (self.lambda_moon, self.beta_moon, self.alpha_moon, self.delta_moon,
+         self.distance_moon, self.phase_angle_moon, self.illumination) = moon_time_terms(
+            self.T, self.lambda_sun, self.r_sun_earth, self.delta_psi, self.delta_epsilon)
+        self.E_MT = calculate_moon_illuminance(self.phase_angle_moon, self.distance_moon)
+
+    @classmethod
+    def from_datetime(cls, time_utc):
+        """UTC datetime 으로부터 컨텍스트를 만듭니다."""
+        return cls(time_utc.year, time_utc.month, time_utc.day,
+                   time_utc.hour, time_utc.minute, time_utc.second)
+
+    def size_in_bytes(self):
+        """객체와 속성 값이 차지하는 메모리 (바이트, 추정치)."""
+        return sys.getsizeof(self) + sum(sys.getsizeof(getattr(self, name)) for name in self.__slots__)
+
+
+class TimeTermsCache:
+    """
+    줄리안 날짜(와 series 정확도 단계)를 키로 EphemerisContext 를 보관하는 프로세스 전역 LRU 캐시.
+    같은 날짜를 보는 여러 요청·여러 위치가 시각별 항을 다시 계산하지 않도록 합니다.
+
+    max_bytes: 보관할 항목의 메모리 상한 (바이트). 넘으면 가장 오래 쓰이지 않은 항목부터 버립니다.
+    ttl_seconds: 항목의 유효 시간 (초). None 이면 만료하지 않습니다.
+    여러 스레드(Dash 콜백)에서 함께 써도 안전합니다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, ttl_seconds=None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # 키 -> (context, 크기, 저장 시각)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, time_utc):
+        """time_utc 의 EphemerisContext. 캐시에 없거나 만료되었으면 계산해 저장합니다."""
+        JD = julian_day(time_utc.year, time_utc.month, time_utc.day,
+                        time_utc.hour, time_utc.minute, time_utc.second)
+        key = (JD, get_series_tier())
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl_seconds is None or now - entry[2] <= self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        context = EphemerisContext.from_datetime(time_utc)
+        size = context.size_in_bytes()
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (context, size, now)
+            self._bytes += size
+            self._evict()
+        return context
+
+    def _evict(self):
+        """메모리 상한을 넘지 않을 때까지 가장 오래 쓰이지 않은 항목을 버립니다 (잠금 안에서 호출)."""
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def configure(self, max_bytes=None, ttl_seconds=None):
+        """메모리 상한과 유효 시간을 바꿉니다 (None 인 인자는 그대로 둠)."""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            self._evict()
+
+    def clear(self):
+        """모든 항목과 통계를 지웁니다."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """적중·실패·제거 횟수, 적중률, 항목 수, 사용 중인 메모리(바이트)."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# 프로세스 전역 캐시
+TIME_TERMS_CACHE = TimeTermsCache()
+
+
+def get_ephemeris_context(time_utc, cache=None):
+    """time_utc 의 EphemerisContext 를 캐시(기본: TIME_TERMS_CACHE)에서 가져옵니다."""
+    return (TIME_TERMS_CACHE if cache is None else cache).get(time_utc)
@@ -0,0 +1,281 @@
+# astronomy/events.py
+"""
+일출·일몰, 박명 경계, 월출·월몰, 남중 시각을 구간 탐색(bracketing)과 근 찾기로 계산합니다.
+
+거친 간격(기본 1시간)으로 고도를 계산해 부호가 바뀌는 구간을 찾은 뒤,
+그 구간만 Illinois(개선된 regula falsi) 방법으로 초 단위까지 좁힙니다.
+시각에만 의존하는 항은 시각마다 한 번 계산해 모든 위치로 브로드캐스트하므로
+수천 개 지점을 한 번에 처리할 수 있습니다.
+
+find_dark_windows 는 같은 방법으로 한 해의 모든 밤에 대해 어두운 구간(천문 박명 이후이고 달이 진 시간,
+또는 E_surface 가 기준보다 낮은 시간)을 한 번에 계산합니다.
+
+고도는 굴절 보정 전(기하학적) 중심 고도이며, calculate_R_Twilight_sun 의 구간 판정과 같은 기준입니다.
+"""
+
+import numpy as np
+from .vectorized import (
+    julian_day_array,
+    jd_to_datetime64,
+    equatorial_to_horizontal,
+    sun_time_terms,
+    moon_time_terms,
+    calculate_sun_and_moon_terms
+)
+
+# 태양 이벤트 이름과 기준 고도 (도)
+SUN_EVENT_ALTITUDES = {
+    'sunset': ('setting', 0.0),
+    'sunrise': ('rising', 0.0),
+    'civil_dusk': ('setting', -6.0),
+    'civil_dawn': ('rising', -6.0),
+    'nautical_dusk': ('setting', -12.0),
+    'nautical_dawn': ('rising', -12.0),
+    'astronomical_dusk': ('setting', -18.0),
+    'astronomical_dawn': ('rising', -18.0),
+}
+
+# 달 이벤트 이름과 기준 고도 (도)
+MOON_EVENT_ALTITUDES = {
+    'moonrise': ('rising', 0.0),
+    'moonset': ('setting', 0.0),
+}
+
+SECONDS_PER_DAY = 86400.0
+
+
+def _time_terms(body, JD):
+    """body('sun' 또는 'moon')의 시각별 적경·적위·항성시."""
+    if body == 'sun':
+        terms = sun_time_terms(JD)
+        return terms['alpha_sun'], terms['delta_sun'], terms['GAST']
+    terms = moon_time_terms(JD)
+    return terms['alpha_moon'], terms['delta_moon'], terms['GAST']
+
+
+def _hour_angle(alpha, GAST, longitude):
+    """시간각 (-180 ~ +180 도)."""
+    return ((GAST + longitude) % 360.0 - alpha + 180) % 360 - 180
+
+
+def _altitude_and_hour_angle(body, JD, latitude, longitude):
+    """JD 와 위치가 브로드캐스트된 배열에서 기하학적 고도와 시간각을 계산합니다."""
+    alpha, delta, GAST = _time_terms(body, JD)
+    HA = _hour_angle(alpha, GAST, longitude)
+    altitude, _ = equatorial_to_horizontal(delta, HA, latitude)
+    return altitude, HA
+
+
+def _first_crossing(values, direction):
+    """
+    (샘플 수, 지점 수) 배열에서 지점마다 처음으로 0 을 지나는 구간의 시작 인덱스를 찾습니다.
+    direction: 'rising' (음 → 양) 또는 'setting' (양 → 음). 없으면 -1.
+    """
+    before, after = values[:-1], values[1:]
+    if direction == 'rising':
+        crossed = (before < 0) & (after >= 0)
+    else:
+        crossed = (before >= 0) & (after < 0)
+    index = np.argmax(crossed, axis=0)
+    return np.where(crossed.any(axis=0), index, -1)
+
+
+def refine_roots(function, jd_lo, jd_hi, f_lo, f_hi, tolerance_seconds, max_iterations=40):
+    """
+    f(jd_lo) 와 f(jd_hi) 의 부호가 다른 구간들을 Illinois 방법으로 동시에 좁힙니다.
+    function(JD) 는 구간과 같은 모양의 배열을 돌려줘야 합니다.
+    """
+    jd_lo, jd_hi = jd_lo.copy(), jd_hi.copy()
+    f_lo, f_hi = f_lo.copy(), f_hi.copy()
+    side = np.zeros(jd_lo.shape, dtype=np.int8)
+    tolerance = tolerance_seconds / SECONDS_PER_DAY
+    for _ in range(max_iterations):
+        if jd_lo.size == 0 or np.all(jd_hi - jd_lo <= tolerance):
+            break
+        jd_mid = (jd_lo * f_hi - jd_hi * f_lo) / (f_hi - f_lo)
+        jd_mid = np.where(np.isfinite(jd_mid), jd_mid, (jd_lo + jd_hi) / 2)
+        f_mid = function(jd_mid)
+
+        same_as_lo = np.sign(f_mid) == np.sign(f_lo)
+        # Illinois: 같은 쪽 끝점이 연속으로 남으면 반대쪽 함수값을 절반으로
+        f_hi = np.where(same_as_lo & (side == 1), f_hi / 2, f_hi)
+        f_lo = np.where(~same_as_lo & (side == -1), f_lo / 2, f_lo)
+        jd_lo = np.where(same_as_lo, jd_mid, jd_lo)
+        f_lo = np.where(same_as_lo, f_mid, f_lo)
+        jd_hi = np.where(same_as_lo, jd_hi, jd_mid)
+        f_hi = np.where(same_as_lo, f_hi, f_mid)
+        side = np.where(same_as_lo, 1, -1).astype(np.int8)
+    return (jd_lo * f_hi - jd_hi * f_lo) / (f_hi - f_lo)
+
+
+def _solve_crossings(body, jd_grid, values, latitude, longitude, function_of, direction, tolerance_seconds):
+    """거친 샘플 values 에서 찾은 구간을 근 찾기로 좁혀 지점별 이벤트 JD (없으면 NaN)를 돌려줍니다."""
+    index = _first_crossing(values, direction)
+    found = np.nonzero(index >= 0)[0]
+    result = np.full(latitude.shape, np.nan)
+    if found.size == 0:
+        return result
+
+    i = index[found]
+    lat, lon = latitude[found], longitude[found]
+    result[found] = refine_roots(
+        lambda JD: function_of(_altitude_and_hour_angle(body, JD, lat, lon)),
+        jd_grid[i], jd_grid[i + 1], values[i, found], values[i + 1, found], tolerance_seconds
+    )
+    return result
+
+
+def find_body_events(body, start_utc, latitudes, longitudes, events, duration_hours=24, step_minutes=60,
+                     tolerance_seconds=0.5, transit=True):
+    """
+    body 의 고도가 기준 고도를 지나는 시각과 남중 시각을 지점별로 계산합니다.
+
+    Parameters:
+        body: 'sun' 또는 'moon'
+        start_utc: 탐색 시작 시각 (UTC, datetime 또는 datetime64)
+        latitudes, longitudes: 지점별 위도·경도 배열
+        events: {이벤트 이름: ('rising' 또는 'setting', 기준 고도)} 딕셔너리
+        duration_hours: 탐색 구간 길이 (시간)
+        step_minutes: 구간 탐색용 샘플 간격 (분)
+        tolerance_seconds: 근 찾기 허용 오차 (초)
+        transit: True 이면 남중(시간각이 0 을 지나는) 시각도 'transit' 으로 계산
+
+    Returns:
+        dict: 이벤트 이름별 (지점 수,) datetime64[ns] 배열. 구간 안에 이벤트가 없으면 NaT
+    """
+    latitude = np.atleast_1d(np.asarray(latitudes, dtype=float))
+    longitude = np.atleast_1d(np.asarray(longitudes, dtype=float))
+    latitude, longitude = np.broadcast_arrays(latitude, longitude)
+
+    jd_start = julian_day_array(start_utc)
+    n_steps = int(np.ceil(duration_hours * 60 / step_minutes))
+    jd_grid = jd_start + np.arange(n_steps + 1) * (step_minutes / 1440.0)
+
+    # 거친 샘플: 시각별 항은 샘플마다 한 번만 계산하고 지점으로 브로드캐스트
+    altitude, HA = _altitude_and_hour_angle(body, jd_grid[:, np.newaxis], latitude, longitude)
+
+    result = {}
+    for name, (direction, threshold) in events.items():
+        result[name] = _solve_crossings(
+            body, jd_grid, altitude - threshold, latitude, longitude,
+            lambda alt_ha, threshold=threshold: alt_ha[0] - threshold, direction, tolerance_seconds
+        )
+    if transit:
+        # 남중: sin(시간각)이 음에서 양으로 바뀌는 순간 (하중은 양에서 음)
+        result['transit'] = _solve_crossings(
+            body, jd_grid, np.sin(np.radians(HA)), latitude, longitude,
+            lambda alt_ha: np.sin(np.radians(alt_ha[1])), 'rising', tolerance_seconds
+        )
+    return {name: jd_to_datetime64(JD) for name, JD in result.items()}
+
+
+def find_sun_events(start_utc, latitudes, longitudes, duration_hours=24, step_minutes=60, tolerance_seconds=0.5):
+    """
+    일몰·일출과 시민·항해·천문 박명(-6°, -12°, -18°)의 시작·끝, 남중 시각을 지점별로 계산합니다.
+    이벤트 이름은 SUN_EVENT_ALTITUDES 와 'transit' 입니다.
+    """
+    return find_body_events('sun', start_utc, latitudes, longitudes, SUN_EVENT_ALTITUDES,
+                            duration_hours, step_minutes, tolerance_seconds)
+
+
+def find_moon_events(start_utc, latitudes, longitudes, duration_hours=24, step_minutes=60, tolerance_seconds=0.5):
+    """
+    월출·월몰과 남중 시각을 지점별로 계산합니다.
+    이벤트 이름은 MOON_EVENT_ALTITUDES 와 'transit' 입니다.
+    """
+    return find_body_events('moon', start_utc, latitudes, longitudes, MOON_EVENT_ALTITUDES,
+                            duration_hours, step_minutes, tolerance_seconds)
+
+
+def _darkness_margin(JD, latitude, longitude, threshold_millilux, sun_altitude):
+    """
+    어두운 정도의 여유값 (0 이상이면 어두움).
+    threshold_millilux 가 None 이면 태양이 sun_altitude 아래, 달이 지평선 아래인지 (도 단위 여유),
+    아니면 E_surface 가 기준보다 낮은지 (lux 단위 여유)를 봅니다.
+    """
+    if threshold_millilux is None:
+        sun_altitude_deg, _ = _altitude_and_hour_angle('sun', JD, latitude, longitude)
+        moon_altitude_deg, _ = _altitude_and_hour_angle('moon', JD, latitude, longitude)
+        return np.minimum(sun_altitude - sun_altitude_deg, -moon_altitude_deg)
+    sun_data, moon_data = calculate_sun_and_moon_terms(JD, latitude, longitude)
+    return threshold_millilux / 1000.0 - (sun_data['R_Twilight_sun'] + moon_data['R_light_moon'])
+
+
+def find_dark_windows(year, latitude, longitude, threshold_millilux=None, sun_altitude=-18.0, step_minutes=10,
+                      tolerance_seconds=1.0):
+    """
+    한 지점에서 한 해의 모든 밤에 대해 어두운 구간을 한 번에 계산합니다.
+
+    밤 d 는 지방 평균 태양시로 d 일 정오부터 다음 날 정오까지이며, 모든 밤을 (샘플 수, 밤 수) 배열 하나로 계산한 뒤
+    어두움이 바뀌는 구간만 근 찾기로 좁힙니다. 한 밤에 어두운 구간이 여러 개이면(예: 밤중에 달이 뜨는 경우)
+    가장 긴 구간을 돌려주고, 모든 구간의 합은 'total_minutes' 로 따로 돌려줍니다.
+
+    Parameters:
+        year: 연도
+        latitude, longitude: 지점의 위도·경도
+        threshold_millilux: None 이면 '태양이 sun_altitude 아래이고 달이 지평선 아래' 를 어두움으로 보고,
+            값을 주면 'E_surface 가 이 값(millilux)보다 낮음' 을 어두움으로 봅니다.
+        sun_altitude: 태양 고도 기준 (도, 기본 -18: 천문 박명), threshold_millilux 가 None 일 때만 사용
+        step_minutes: 구간 탐색용 샘플 간격 (분)
+        tolerance_seconds: 근 찾기 허용 오차 (초)
+
+    Returns:
+        dict: 밤마다 하나씩인 배열
+            'date': 밤이 시작하는 날짜 (datetime64[D])
+            'start', 'end': 가장 긴 어두운 구간의 시작·끝 (UTC, datetime64[ns], 없으면 NaT)
+            'duration_minutes': 그 구간의 길이 (분, 없으면 0)
+            'total_minutes': 그 밤의 어두운 시간 합계 (분)
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    dates = np.arange(np.datetime64(f'{year}-01-01'), np.datetime64(f'{year + 1}-01-01'), dtype='datetime64[D]')
+    n_nights = dates.size
+
+    n_steps = int(np.ceil(1440 / step_minutes))
+    jd_noon = julian_day_array(dates) + 0.5 - longitude / 360.0
+    jd_grid = jd_noon + np.arange(n_steps + 1)[:, np.newaxis] * (step_minutes / 1440.0)
+
+    margin = _darkness_margin(jd_grid, latitude, longitude, threshold_millilux, sun_altitude)
+
+    # 밤마다 어두운 구간의 시작·끝 샘플 인덱스 (앞뒤에 '밝음' 을 덧대어 경계가 항상 짝을 이루도록)
+    dark = (margin >= 0).T
+    padded = np.zeros((n_nights, n_steps + 3), dtype=np.int8)
+    padded[:, 1:-1] = dark
+    change = np.diff(padded, axis=1)
+    start_night, start_index = np.nonzero(change == 1)
+    end_night, end_index = np.nonzero(change == -1)
+
+    def boundary_times(night, index):
+        # index j 의 경계는 샘플 j-1 과 j 사이 (구간 양 끝이면 샘플 시각 그대로)
+        times = jd_grid[np.clip(index, 0, n_steps), night]
+        times = np.where(index > n_steps, jd_grid[n_steps, night], times)
+        inner = np.nonzero((index > 0) & (index <= n_steps))[0]
+        if inner.size:
+            i, n = index[inner], night[inner]
+            times[inner] = refine_roots(
+                lambda JD: _darkness_margin(JD, latitude, longitude, threshold_millilux, sun_altitude),
+                jd_grid[i - 1, n], jd_grid[i, n], margin[i - 1, n], margin[i, n], tolerance_seconds
+            )
+        return times
+
+    starts = boundary_times(start_night, start_index)
+    ends = boundary_times(end_night, end_index)
+    lengths = (ends - starts) * 1440.0
+
+    total_minutes = np.bincount(start_night, weights=lengths, minlength=n_nights)
+    # 밤마다 가장 긴 구간: (밤, -길이) 순으로 정렬해 밤별 첫 항목
+    order = np.lexsort((-lengths, start_night))
+    first = order[np.r_[True, start_night[order][1:] != start_night[order][:-1]]] if order.size else order
+    nights = start_night[first]
+
+    best_start = np.full(n_nights, np.nan)
+    best_end = np.full(n_nights, np.nan)
+    duration = np.zeros(n_nights)
+    best_start[nights], best_end[nights], duration[nights] = starts[first], ends[first], lengths[first]
+
+    return {
+        'date': dates,
+        'start': jd_to_datetime64(best_start),
+        'end': jd_to_datetime64(best_end),
+        'duration_minutes': duration,
+        'total_minutes': total_minutes,
+    }
@@ -0,0 +1,40 @@
+# astronomy/grid.py
+
+import numpy as np
+from .vectorized import julian_day_array, calculate_sun_and_moon_terms
+
+def load_grid_points(input_csv):
+    """
+    격자 CSV(grid_info.csv 형식: 경도, 위도, ...)에서 경도와 위도 배열을 읽습니다.
+    """
+    points = np.loadtxt(input_csv, delimiter=',', usecols=(0, 1), ndmin=2)
+    return points[:, 0], points[:, 1]
+
+def calculate_illuminance_cube(times_utc, latitudes, longitudes, chunk_size=64, ephemeris=None, fast=False):
+    """
+    (N_times × N_points) 격자의 지표면 조도 E_surface (lux)를 계산합니다.
+
+    태양·달의 적경·적위, 거리, 위상각, 항성시처럼 시각에만 의존하는 항은 시각마다 한 번만 계산하고,
+    시간각 이후의 좌표 변환과 조도 계산만 모든 격자점으로 브로드캐스트합니다.
+
+    Parameters:
+        times_utc: UTC 시각 배열 (datetime64 또는 datetime 목록), 길이 N_times
+        latitudes: 위도 배열, 길이 N_points
+        longitudes: 경도 배열, 길이 N_points
+        chunk_size: 한 번에 처리할 시각 수 (중간 배열의 메모리 사용량을 제한)
+        ephemeris: 시각별 항을 계산할 객체 (예: chebyshev.ChebyshevEphemeris). 없으면 원래 급수 모델을 사용
+        fast: True 이면 굴절·공기 질량·위상 법칙을 lookup 모듈의 보간 표로 계산 (오차는 lookup.MAX_ERROR)
+
+    Returns:
+        numpy.ndarray: (N_times, N_points) 크기의 E_surface (lux)
+    """
+    JD = np.atleast_1d(julian_day_array(times_utc))
+    latitudes = np.asarray(latitudes, dtype=float).ravel()
+    longitudes = np.asarray(longitudes, dtype=float).ravel()
+
+    cube = np.empty((JD.size, latitudes.size))
+    for start in range(0, JD.size, chunk_size):
+        block = JD[start:start + chunk_size, np.newaxis]
+        sun_data, moon_data = calculate_sun_and_moon_terms(block, latitudes, longitudes, ephemeris, fast)
+        cube[start:start + chunk_size] = sun_data['R_Twilight_sun'] + moon_data['R_light_moon']
+    return cube
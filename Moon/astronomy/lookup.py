@@ -0,0 +1,176 @@
+# astronomy/lookup.py
+"""
+고도나 위상각 하나에만 의존하는 초월함수 계산을 미리 계산한 표의 선형 보간으로 대신하는 "fast" 모드.
+
+대상:
+    atmospheric_refraction_correction  대기 굴절 보정 (helpers)
+    calculate_E_DN_sun / _moon         공기 질량과 대기 투과율 exp(-C·m) (sun, moon)
+    calculate_moon_illuminance         위상 법칙(tan·log)과 지구반사광(earthshine) 항 (moon)
+
+원래 함수와 이름·인자가 같고, 스칼라를 넘기면 float, 배열을 넘기면 배열을 돌려줍니다.
+sun.calculate_sun_position, moon.calculate_moon_position_and_phase 와
+vectorized 의 *_local_terms / moon_time_terms / calculate_sun_and_moon_terms 에 fast=True 를 넘기면 사용됩니다.
+
+표는 처음 쓸 때 한 번 만들며, 0.01° 간격 격자의 점에서는 원래 모델과 같은 값입니다.
+원래 모델 대비 최대 오차는 MAX_ERROR 와 같습니다 (격자 사이 중간점 전체에서 측정).
+    refraction: 굴절 보정 절대 오차 (도)
+    transmittance_sun / transmittance_moon: 투과율 상대 오차, 고도 0° 초과
+        (지평선 아래는 공기 질량 식의 극(약 -1.57°) 근처에서 오차가 커지지만,
+         E_DV / E_surface 는 고도 0° 초과에서만 쓰므로 영향이 없습니다.)
+    phase_law: E_MT 상대 오차, 위상각 179.99° 이하 (가장 큰 곳은 E_MT 가 거의 0 인 삭 무렵)
+        위상각 0° 와 180° 에서는 원래 식이 정의되지 않아(0 lux) 대신 극한값을 쓰며,
+        180° 바로 앞 한 칸은 극한으로의 수렴이 느려 상대 오차가 더 큽니다.
+"""
+
+import math
+import numpy as np
+
+# 표 간격 (도)
+STEP_DEGREES = 0.01
+
+# 굴절 보정 구간 경계 (helpers.atmospheric_refraction_correction 과 같음)
+REFRACTION_LOW = -0.575
+REFRACTION_MID = 5.0
+REFRACTION_HIGH = 85.0
+
+# 공기 질량 식의 적용 하한 (-1 라디안)
+AIR_MASS_MIN_DEGREES = math.degrees(-1.0)
+
+# 원래 모델 대비 최대 오차 (모듈 설명 참고)
+MAX_ERROR = {
+    'refraction': 1e-6,
+    'transmittance_sun': 3e-6,
+    'transmittance_moon': 3e-6,
+    'phase_law': 2e-5,
+}
+
+_INVERSE_STEP = 1.0 / STEP_DEGREES
+
+_tables = None
+
+
+class _UniformTable:
+    """x0 부터 STEP_DEGREES 간격으로 만든 값 표의 선형 보간 (범위 밖은 양 끝 값)."""
+
+    def __init__(self, x0, values):
+        self.x0 = float(x0)
+        self.values = np.asarray(values, dtype=float)
+        self.last = self.values.size - 1
+        self._list = self.values.tolist()
+
+    def __call__(self, x):
+        if isinstance(x, (int, float)):
+            u = (x - self.x0) * _INVERSE_STEP
+            if u <= 0.0:
+                return self._list[0]
+            i = int(u)
+            if i >= self.last:
+                return self._list[-1]
+            v = self._list[i]
+            return v + (u - i) * (self._list[i + 1] - v)
+        u = np.clip((np.asarray(x, dtype=float) - self.x0) / STEP_DEGREES, 0.0, self.last)
+        i = np.minimum(u.astype(np.intp), self.last - 1)
+        v = self.values[i]
+        return v + (u - i) * (self.values[i + 1] - v)
+
+
+def _grid(start, stop):
+    """start ~ stop 을 덮는 STEP_DEGREES 배수 격자 (양 끝을 바깥쪽으로 맞춤)."""
+    first = math.floor(round(start / STEP_DEGREES, 6))
+    last = math.ceil(round(stop / STEP_DEGREES, 6))
+    return np.arange(first, last + 1) * STEP_DEGREES
+
+
+def _transmittance(body, altitude):
+    """원래 calculate_E_DN_sun / calculate_E_DN_moon 의 E_DN / E (exp(-C·m), m 제한 적용)."""
+    from .vectorized import calculate_E_DN_sun, calculate_E_DN_moon
+    if body == 'sun':
+        return calculate_E_DN_sun(1.0, altitude)
+    return calculate_E_DN_moon(1.0, altitude)
+
+
+def _phase_law(phase_angle_moon):
+    """E_MT · 거리²: 위상각에만 의존하는 부분."""
+    from .vectorized import calculate_moon_illuminance
+    return calculate_moon_illuminance(phase_angle_moon, 1.0)
+
+
+def _build_tables():
+    """굴절·투과율·위상 법칙 표를 원래 식으로 계산합니다."""
+    from .sun import C_atmosphere
+    from .moon import C, R_M, E_sm
+
+    # 구간마다 따로 표를 만들고 경계 밖 한 칸까지 같은 식으로 채움 (구간 선택은 원래 경계로)
+    low = _grid(REFRACTION_LOW, REFRACTION_MID)
+    low_values = (1735.0 + low * (-518.2 + low * (103.4 + low * (-12.79 + low * 0.711)))) / 3600.0
+    high = _grid(REFRACTION_MID, REFRACTION_HIGH)
+    tan_high = np.tan(np.radians(high))
+    high_values = (58.1 / tan_high - 0.07 / tan_high**3 + 0.000086 / tan_high**5) / 3600.0
+
+    altitude = _grid(AIR_MASS_MIN_DEGREES, 90.0)
+
+    phase = _grid(0.0, 180.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        phase_values = _phase_law(phase)
+    # 0° 와 180° 에서는 sin·tan·log 항이 0 으로 수렴 (위상 법칙 1, 지구반사광 0 또는 그 반대)
+    scale = 683 * (2 / 3) * C * R_M ** 2
+    phase_values[0] = scale * (1 + 1.27 * 7 / 6) * E_sm
+    phase_values[-1] = scale * 0.19 * 0.5
+
+    return {
+        'refraction_low': _UniformTable(low[0], low_values),
+        'refraction_high': _UniformTable(high[0], high_values),
+        'transmittance_sun': _UniformTable(altitude[0], _transmittance('sun', altitude)),
+        'transmittance_moon': _UniformTable(altitude[0], _transmittance('moon', altitude)),
+        'phase_law': _UniformTable(phase[0], phase_values),
+        # 고도가 -1 라디안 이하일 때의 투과율 (m = 500)
+        'transmittance_floor': math.exp(-C_atmosphere * 500),
+    }
+
+
+def _get_tables():
+    global _tables
+    if _tables is None:
+        _tables = _build_tables()
+    return _tables
+
+
+def atmospheric_refraction_correction(altitude):
+    """helpers.atmospheric_refraction_correction 의 표 보간 버전 (도)."""
+    tables = _tables or _get_tables()
+    if isinstance(altitude, (int, float)):
+        if altitude > REFRACTION_HIGH or altitude <= REFRACTION_LOW:
+            return 0.0
+        if altitude > REFRACTION_MID:
+            return tables['refraction_high'](altitude)
+        return tables['refraction_low'](altitude)
+    altitude = np.asarray(altitude, dtype=float)
+    return np.select(
+        [altitude > REFRACTION_HIGH, altitude > REFRACTION_MID, altitude > REFRACTION_LOW],
+        [0.0, tables['refraction_high'](altitude), tables['refraction_low'](altitude)],
+        default=0.0
+    )
+
+
+def _apply_transmittance(name, E, altitude):
+    """E · 투과율. 고도가 -1 라디안 이하이면 m = 500."""
+    tables = _tables or _get_tables()
+    table, floor = tables[name], tables['transmittance_floor']
+    if isinstance(altitude, (int, float)):
+        return E * (table(altitude) if altitude > AIR_MASS_MIN_DEGREES else floor)
+    return E * np.where(altitude > AIR_MASS_MIN_DEGREES, table(altitude), floor)
+
+
+def calculate_E_DN_sun(E_ST, altitude_sun_deg):
+    """sun.calculate_E_DN_sun 의 표 보간 버전."""
+    return _apply_transmittance('transmittance_sun', E_ST, altitude_sun_deg)
+
+
+def calculate_E_DN_moon(E_MT, altitude_moon_corrected):
+    """moon.calculate_E_DN_moon 의 표 보간 버전."""
+    return _apply_transmittance('transmittance_moon', E_MT, altitude_moon_corrected)
+
+
+def calculate_moon_illuminance(phase_angle_moon, moon_distance):
+    """moon.calculate_moon_illuminance 의 표 보간 버전."""
+    return (_tables or _get_tables())['phase_law'](phase_angle_moon) / (moon_distance ** 2)
@@ -0,0 +1,145 @@
+# astronomy/lunar.py
+"""
+두 날짜 사이의 삭·상현·망·하현과 근지점·원지점 목록을 한 번에 계산합니다.
+
+위상: 평균 편각(moon_mean_elongation)이 0, 90, 180, 270도가 되는 시각을 선형으로 예측해 ±2일 구간을 잡고,
+      모델의 황경 차(λ_moon - λ_sun)가 같은 값이 되는 시각을 근 찾기로 구합니다.
+근지점·원지점: moon_distance 를 6시간 간격으로 계산해 극값 주변 구간을 잡고,
+      거리의 시간 변화율이 0 이 되는 시각을 근 찾기로 구합니다.
+"""
+
+import numpy as np
+from .events import refine_roots
+from .vectorized import (
+    julian_day_array,
+    jd_to_datetime64,
+    get_julian_centuries,
+    calculate_lambda_sun,
+    moon_mean_anomaly,
+    moon_mean_longitude,
+    moon_mean_elongation,
+    moon_argument_of_latitude,
+    moon_equation_of_center,
+    moon_distance,
+    moon_time_terms
+)
+
+# 위상 이름과 황경 차 (도)
+PHASE_ELONGATIONS = {
+    'new_moon': 0.0,
+    'first_quarter': 90.0,
+    'full_moon': 180.0,
+    'last_quarter': 270.0,
+}
+
+# moon_mean_elongation 의 1차 계수 (도/줄리안 세기)와 J2000.0 값
+MEAN_ELONGATION_RATE = 445267.1114034
+MEAN_ELONGATION_J2000 = 297.8501921
+
+# moon_distance 의 상수항 (km)
+MEAN_DISTANCE = 385000.56
+
+PHASE_BRACKET_DAYS = 2.0
+DISTANCE_STEP_DAYS = 0.25
+TOLERANCE_SECONDS = 1.0
+
+
+def _elongation(JD):
+    """모델의 황경 차 λ_moon - λ_sun (도, 0 ~ 360)."""
+    T = get_julian_centuries(JD)
+    M_moon = moon_mean_anomaly(T)
+    D_moon = moon_mean_elongation(T)
+    F_moon = moon_argument_of_latitude(T)
+    lambda_moon = moon_mean_longitude(T) + moon_equation_of_center(T, M_moon, D_moon, F_moon)
+    return (lambda_moon - calculate_lambda_sun(T)) % 360.0
+
+
+def _distance(JD):
+    """달-지구 거리 (km)."""
+    T = get_julian_centuries(JD)
+    return moon_distance(T, moon_mean_elongation(T), moon_mean_anomaly(T), moon_argument_of_latitude(T))
+
+
+def _distance_rate(JD, h=1.0 / 1440.0):
+    """달-지구 거리의 시간 변화율 (km/일, 중앙 차분)."""
+    return (_distance(JD + h) - _distance(JD - h)) / (2 * h)
+
+
+def _find_phases(jd_start, jd_end, elongation):
+    """황경 차가 elongation 이 되는 시각 (JD) 배열."""
+    # 평균 편각이 elongation + 360k 가 되는 시각을 선형으로 예측
+    T_start = get_julian_centuries(jd_start - PHASE_BRACKET_DAYS)
+    T_end = get_julian_centuries(jd_end + PHASE_BRACKET_DAYS)
+    k_start = np.ceil((MEAN_ELONGATION_J2000 + MEAN_ELONGATION_RATE * T_start - elongation) / 360.0)
+    k_end = np.floor((MEAN_ELONGATION_J2000 + MEAN_ELONGATION_RATE * T_end - elongation) / 360.0)
+    k = np.arange(k_start, k_end + 1)
+    jd_guess = 2451545.0 + (elongation + 360.0 * k - MEAN_ELONGATION_J2000) / MEAN_ELONGATION_RATE * 36525.0
+
+    def offset(JD):
+        return (_elongation(JD) - elongation + 180.0) % 360.0 - 180.0
+
+    jd_lo = jd_guess - PHASE_BRACKET_DAYS
+    jd_hi = jd_guess + PHASE_BRACKET_DAYS
+    JD = refine_roots(offset, jd_lo, jd_hi, offset(jd_lo), offset(jd_hi), TOLERANCE_SECONDS)
+    return JD[(JD >= jd_start) & (JD < jd_end)]
+
+
+def _find_distance_extrema(jd_start, jd_end):
+    """
+    근지점과 원지점 시각 (JD) 배열.
+    moon_distance 의 단주기 항 때문에 원지점 부근에 얕은 극소·극대 쌍이 생기므로,
+    평균 거리보다 먼 극소와 가까운 극대는 버리고 연속된 같은 종류의 극값 중에서는 가장 극단인 것만 남깁니다.
+    """
+    JD = np.arange(jd_start - DISTANCE_STEP_DAYS, jd_end + 2 * DISTANCE_STEP_DAYS, DISTANCE_STEP_DAYS)
+    distance = _distance(JD)
+    before, middle, after = distance[:-2], distance[1:-1], distance[2:]
+    minima = np.nonzero((middle < before) & (middle <= after))[0] + 1
+    maxima = np.nonzero((middle > before) & (middle >= after))[0] + 1
+    index = np.concatenate([minima, maxima])
+    is_perigee = np.arange(index.size) < minima.size
+
+    jd_lo, jd_hi = JD[index - 1], JD[index + 1]
+    roots = refine_roots(_distance_rate, jd_lo, jd_hi, _distance_rate(jd_lo), _distance_rate(jd_hi),
+                         TOLERANCE_SECONDS)
+    order = np.argsort(roots)
+    roots, is_perigee = roots[order], is_perigee[order]
+    root_distance = _distance(roots)
+    keep = np.where(is_perigee, root_distance < MEAN_DISTANCE, root_distance > MEAN_DISTANCE)
+    roots, root_distance, is_perigee = roots[keep], root_distance[keep], is_perigee[keep]
+
+    # 같은 종류가 연속되는 구간마다 가장 가까운(근지점) / 먼(원지점) 것 하나만 남김
+    run = np.concatenate([[0], np.cumsum(is_perigee[1:] != is_perigee[:-1])])
+    score = np.where(is_perigee, root_distance, -root_distance)
+    best = np.lexsort((score, run))
+    first = best[np.concatenate([[True], run[best][1:] != run[best][:-1]])]
+
+    result = {}
+    for name, mask in (('perigee', is_perigee[first]), ('apogee', ~is_perigee[first])):
+        JD = roots[first][mask]
+        result[name] = JD[(JD >= jd_start) & (JD < jd_end)]
+    return result
+
+
+def find_lunar_events(start_utc, end_utc):
+    """
+    start_utc ~ end_utc 사이의 달 위상과 근지점·원지점을 계산합니다.
+
+    Returns:
+        dict:
+            'new_moon', 'first_quarter', 'full_moon', 'last_quarter': 시각 (datetime64[ns]) 배열
+            '<위상>_illumination': 해당 시각의 밝은 면 비율 (calculate_phase_angle_geo)
+            'perigee', 'apogee': 시각 배열, 'perigee_distance', 'apogee_distance': 거리 (km)
+    """
+    jd_start = float(julian_day_array(start_utc))
+    jd_end = float(julian_day_array(end_utc))
+
+    result = {}
+    for name, elongation in PHASE_ELONGATIONS.items():
+        JD = _find_phases(jd_start, jd_end, elongation)
+        result[name] = jd_to_datetime64(JD)
+        result[f'{name}_illumination'] = moon_time_terms(JD)['illumination']
+
+    for name, JD in _find_distance_extrema(jd_start, jd_end).items():
+        result[name] = jd_to_datetime64(JD)
+        result[f'{name}_distance'] = _distance(JD)
+    return result
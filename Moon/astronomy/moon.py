@@ -9,6 +9,8 @@ from .helpers import (
     equatorial_to_horizontal,
     atmospheric_refraction_correction
 )
+from . import lookup
+from .series import moon_longitude_scalar, moon_latitude_scalar, moon_distance_scalar, nutation_scalar
 from .sun import calculate_lambda_sun, calculate_sun_earth_distance, solar_mean_anomaly, sun_equation_of_center, eccentricity_earth_orbit
 
 # Constants
@@ -53,124 +55,63 @@ def moon_mean_elongation(T):
          T**3 / 545868 - T**4 / 113065000)
     return D % 360.0
 
-def moon_ecliptic_latitude(T):
+def moon_ecliptic_latitude(T, tier=None):
     """
     달의 황위(β)를 계산합니다.
     T: 줄리안 세기
+    tier: series 모듈의 정확도 단계 (None 이면 현재 기본 단계)
     반환값: 황위 (도 단위)
     """
     F_moon = (93.272 + 483202.0175 * T) % 360.0
-    beta_moon = 5.128 * math.sin(math.radians(F_moon))
-    return beta_moon
+    return moon_latitude_scalar(T, moon_mean_elongation(T), moon_mean_anomaly(T), F_moon, tier)
 
-def moon_equation_of_center(T, M_moon, D_moon, F_moon):
+def moon_equation_of_center(T, M_moon, D_moon, F_moon, tier=None):
     """
-    달의 중심차를 보다 정확하게 계산합니다.
+    달의 중심차를 series 모듈의 계수 표로 계산합니다.
     T: 줄리안 세기
     M_moon: 평균 근점 (도 단위)
     D_moon: 평균 편각 (도 단위)
     F_moon: 달의 평균 황위 (도 단위)
+    tier: 정확도 단계 (None 이면 현재 기본 단계)
     반환값: 중심차 (도 단위)
     """
-    M_rad = math.radians(M_moon)
-    D_rad = math.radians(D_moon)
-    F_rad = math.radians(F_moon)
-    
-    C = (
-        6.289 * math.sin(M_rad)
-        + 1.274 * math.sin(2 * D_rad - M_rad)
-        + 0.658 * math.sin(2 * D_rad)
-        + 0.214 * math.sin(2 * M_rad)
-        + 0.11 * math.sin(D_rad)
-        # 추가적인 항
-        + 0.046 * math.sin(M_rad + F_rad)
-        + 0.014 * math.sin(2 * D_rad - 2 * M_rad)
-        + 0.011 * math.sin(M_rad - F_rad)
-    )
-    return C
+    return moon_longitude_scalar(T, D_moon, M_moon, F_moon, tier)
 
-def moon_distance(T, D_moon, M_moon, F_moon):
+def moon_distance(T, D_moon, M_moon, F_moon, tier=None):
     """
-    달과 지구 사이의 거리를 보다 정확하게 계산합니다.
+    달과 지구 사이의 거리를 series 모듈의 계수 표로 계산합니다.
     T: 줄리안 세기
     D_moon: 평균 편각 (도 단위)
     M_moon: 평균 근점 (도 단위)
     F_moon: 달의 평균 황위 (도 단위)
+    tier: 정확도 단계 (None 이면 현재 기본 단계)
     반환값: 달-지구 거리 (킬로미터)
     """
-    distance = (
-        385000.56
-        - 20905.355 * math.cos(math.radians(M_moon))
-        - 3699.111 * math.cos(math.radians(2 * D_moon))
-        - 2955.968 * math.cos(math.radians(2 * M_moon))
-        - 570.0 * math.cos(math.radians(2 * D_moon - M_moon))
-        + 246.0 * math.cos(math.radians(2 * D_moon + M_moon))
-        - 205.0 * math.cos(math.radians(M_moon + F_moon))
-        + 171.0 * math.cos(math.radians(D_moon - F_moon))
-        - 152.0 * math.cos(math.radians(D_moon + F_moon))
-        + 129.0 * math.cos(math.radians(D_moon - 2 * F_moon))
-        + 63.0 * math.cos(math.radians(2 * D_moon + F_moon))
-        + 63.0 * math.cos(math.radians(M_moon + 2 * F_moon))
-        - 59.0 * math.cos(math.radians(2 * D_moon - 2 * F_moon))
-        - 58.0 * math.cos(math.radians(M_moon - F_moon))
-        + 51.0 * math.cos(math.radians(D_moon + 2 * F_moon))
-        - 48.0 * math.cos(math.radians(D_moon - M_moon))
-        - 46.0 * math.cos(math.radians(2 * D_moon + 2 * F_moon))
-        + 46.0 * math.cos(math.radians(3 * D_moon))
-        + 29.0 * math.cos(math.radians(2 * M_moon + F_moon))
-        + 29.0 * math.cos(math.radians(D_moon + M_moon))
-        + 26.0 * math.cos(math.radians(2 * D_moon - M_moon + F_moon))
-        - 22.0 * math.cos(math.radians(M_moon + 2 * F_moon))
-        + 21.0 * math.cos(math.radians(D_moon - 2 * F_moon))
-        + 17.0 * math.cos(math.radians(2 * D_moon + M_moon))
-        - 16.0 * math.cos(math.radians(D_moon - M_moon - F_moon))
-        - 16.0 * math.cos(math.radians(2 * D_moon + M_moon - F_moon))
-        - 15.0 * math.cos(math.radians(2 * D_moon - M_moon - F_moon))
-    )
-    return distance  # km 단위
+    return moon_distance_scalar(T, D_moon, M_moon, F_moon, tier)  # km 단위
 
-def nutation(T):
+def nutation(T, tier=None):
     """
     지구의 세차와 진동을 계산하여 세차(Δψ)와 진동(Δε)을 반환합니다.
+    tier: series 모듈의 정확도 단계 (None 이면 현재 기본 단계)
     단위: 도
     """
-    D = math.radians((297.85036 + 445267.111480 * T - 0.0019142 * T**2 + T**3 / 189474) % 360)
-    M = math.radians((357.52772 + 35999.050340 * T - 0.0001603 * T**2 - T**3 / 300000) % 360)
-    M_prime = math.radians((134.96298 + 477198.867398 * T + 0.0086972 * T**2 + T**3 / 56250) % 360)
-    F = math.radians((93.27191 + 483202.017538 * T - 0.0036825 * T**2 + T**3 / 327270) % 360)
-    Omega = math.radians((125.04452 - 1934.136261 * T + 0.0020708 * T**2 + T**3 / 450000) % 360)
-    
-    # 세차 Δψ (arcseconds)
-    delta_psi = (-17.20 * math.sin(Omega)
-                - 1.32 * math.sin(2 * D + 2 * F)
-                - 0.23 * math.sin(2 * M)
-                + 0.21 * math.sin(2 * Omega))
-    
-    # 진동 Δε (arcseconds)
-    delta_epsilon = (9.20 * math.cos(Omega)
-                     + 0.57 * math.cos(2 * D + 2 * F)
-                     + 0.10 * math.cos(2 * M)
-                     - 0.09 * math.cos(2 * Omega))
-    
-    # arcseconds to degrees
-    delta_psi_deg = delta_psi / 3600.0
-    delta_epsilon_deg = delta_epsilon / 3600.0
-    
-    return delta_psi_deg, delta_epsilon_deg
+    return nutation_scalar(T, tier)
 
-def mean_obliquity_of_ecliptic(T):
+def mean_obliquity_of_ecliptic(T, delta_epsilon=None):
     """
     세차와 진동을 고려한 평균 황경을 계산합니다.
+    delta_epsilon: 이미 계산한 진동(Δε, 도). 주어지지 않으면 nutation(T)로 계산합니다.
     단위: 도
     """
     # 평균 황경 계산 (초 단위)
     epsilon0 = 23 + (26 + (21.448 - 46.815 * T - 0.00059 * T**2 + 0.001813 * T**3) / 60) / 60
-    delta_psi, delta_epsilon = nutation(T)
+    if delta_epsilon is None:
+        delta_psi, delta_epsilon = nutation(T)
     epsilon = epsilon0 + delta_epsilon
     return epsilon
 
 
-def calculate_phase_angle_geo(lambda_sun, lambda_moon, beta_moon, distance_moon, T):
+def calculate_phase_angle_geo(lambda_sun, lambda_moon, beta_moon, distance_moon, T, r_sun_earth_au=None):
     """
     지리적 경도와 위도를 이용하여 달의 위상각을 계산합니다.
     lambda_sun: 태양의 경도 (도)
@@ -178,19 +119,21 @@ def calculate_phase_angle_geo(lambda_sun, lambda_moon, beta_moon, distance_moon,
     beta_moon: 달의 지리적 위도 (도)
     distance_moon: 달-지구 거리 (km 단위)
     T: 줄리안 세기 (천문 시간 계산)
+    r_sun_earth_au: 이미 계산한 지구-태양 거리 (AU). 주어지지 않으면 T로부터 계산합니다.
     """
     # 경도와 위도를 사용한 psi 계산
     cos_psi = math.cos(math.radians(beta_moon)) * math.cos(math.radians(lambda_moon - lambda_sun))
     psi = math.acos(cos_psi)
 
-    # 태양의 평균 근점, 이심률 및 진이각 계산
-    M_sun = solar_mean_anomaly(T)
-    e = eccentricity_earth_orbit(T)
-    C_sun = sun_equation_of_center(T, M_sun)
-    v = (M_sun + C_sun) % 360.0  # 진이각 (True Anomaly)
-    
-    # 지구-태양 거리(AU 단위로 계산)
-    r_sun_earth_au = calculate_sun_earth_distance(v, e)
+    if r_sun_earth_au is None:
+        # 태양의 평균 근점, 이심률 및 진이각 계산
+        M_sun = solar_mean_anomaly(T)
+        e = eccentricity_earth_orbit(T)
+        C_sun = sun_equation_of_center(T, M_sun)
+        v = (M_sun + C_sun) % 360.0  # 진이각 (True Anomaly)
+
+        # 지구-태양 거리(AU 단위로 계산)
+        r_sun_earth_au = calculate_sun_earth_distance(v, e)
     
     # 지구-태양 거리(AU -> km 변환)
     r_sun_earth_km = r_sun_earth_au * AU_TO_KM
@@ -365,15 +308,14 @@ def calculate_R_light_moon(E_DV_moon):
     return R_light_moon
 
 
-def calculate_moon_position_and_phase(year, month, day, hour, minute, second, latitude, longitude):
+def moon_time_terms(T, lambda_sun=None, r_sun_earth=None, delta_psi=None, delta_epsilon=None, tier=None):
     """
-    달의 위치(고도, 방위각)와 추가 데이터(황경, 황위, 거리, 위상각)를 계산합니다.
-    모든 시간은 UTC 시간 기준으로 합니다.
+    관측 위치와 무관한 달의 시각별 값을 계산합니다.
+    lambda_sun, r_sun_earth, delta_psi, delta_epsilon: 이미 계산한 태양 진황경, 지구-태양 거리(AU), 세차·진동(도).
+    주어지지 않으면 T 로부터 계산합니다.
+    tier: series 모듈의 정확도 단계 (None 이면 현재 기본 단계)
+    반환값: (황경, 황위, 적경, 적위, 거리(km), 위상각, 밝은 면 비율)
     """
-    # 줄리안 날짜 및 세기 계산
-    JD = julian_day(year, month, day, hour, minute, second)
-    T = get_julian_centuries(JD)
-    
     # 달의 평균 근점, 황경, 편각, F_moon 계산
     M_moon = moon_mean_anomaly(T)
     L_moon = moon_mean_longitude(T)
@@ -381,15 +323,16 @@ def calculate_moon_position_and_phase(year, month, day, hour, minute, second, la
     F_moon = (93.272 + 483202.0175 * T) % 360.0  # 달의 평균 황위
     
     # 달의 중심차 계산 (고차항 포함)
-    C_moon = moon_equation_of_center(T, M_moon, D_moon, F_moon)
+    C_moon = moon_equation_of_center(T, M_moon, D_moon, F_moon, tier)
     lambda_moon = L_moon + C_moon
-    beta_moon = moon_ecliptic_latitude(T)
+    beta_moon = moon_ecliptic_latitude(T, tier)
     
     # 세차와 진동 보정
-    delta_psi, delta_epsilon = nutation(T)
+    if delta_psi is None or delta_epsilon is None:
+        delta_psi, delta_epsilon = nutation(T, tier)
     
     # 적경(RA)과 적위(Dec) 계산 (세차와 진동을 반영한 황경 사용)
-    epsilon = mean_obliquity_of_ecliptic(T)
+    epsilon = mean_obliquity_of_ecliptic(T, delta_epsilon)
     lambda_moon_corrected = lambda_moon + delta_psi  # 진황경 보정
     alpha_moon = math.degrees(math.atan2(
         math.cos(math.radians(epsilon)) * math.sin(math.radians(lambda_moon_corrected)),
@@ -400,9 +343,45 @@ def calculate_moon_position_and_phase(year, month, day, hour, minute, second, la
     ))
     alpha_moon = alpha_moon % 360.0
     
-    # 항성시 계산
-    GMST = greenwich_mean_sidereal_time(JD, T)
-    GAST = apparent_sidereal_time(GMST, T)
+    # 달의 거리 계산 (고차항 포함)
+    distance_moon = moon_distance(T, D_moon, M_moon, F_moon, tier)
+    
+    # 태양의 진황경 계산 (위상각 계산에 필요)
+    if lambda_sun is None:
+        lambda_sun = calculate_lambda_sun(T)
+    
+    # 달의 위상각과 조도 계산
+    phase_angle_moon, illumination = calculate_phase_angle_geo(lambda_sun, lambda_moon, beta_moon, distance_moon, T,
+                                                               r_sun_earth)
+    return lambda_moon, beta_moon, alpha_moon, delta_moon, distance_moon, phase_angle_moon, illumination
+
+def calculate_moon_position_and_phase(year, month, day, hour, minute, second, latitude, longitude, context=None,
+                                      fast=False, tier=None):
+    """
+    달의 위치(고도, 방위각)와 추가 데이터(황경, 황위, 거리, 위상각)를 계산합니다.
+    모든 시간은 UTC 시간 기준으로 합니다.
+    context(EphemerisContext)를 넘기면 같은 시각의 공통 중간값을 다시 계산하지 않습니다.
+    fast=True 이면 대기 굴절, 공기 질량, 위상 법칙을 lookup 모듈의 보간 표로 계산합니다.
+    tier: series 모듈의 정확도 단계 (None 이면 현재 기본 단계). context 를 넘기면 context 를 만들 때의 단계를 씁니다.
+    """
+    if context is None:
+        # 줄리안 날짜 및 세기 계산
+        JD = julian_day(year, month, day, hour, minute, second)
+        T = get_julian_centuries(JD)
+
+        # 위치와 무관한 달의 황경·황위, 적경·적위, 거리, 위상각
+        lambda_moon, beta_moon, alpha_moon, delta_moon, distance_moon, phase_angle_moon, illumination = \
+            moon_time_terms(T, tier=tier)
+
+        # 항성시 계산
+        GMST = greenwich_mean_sidereal_time(JD, T)
+        GAST = apparent_sidereal_time(GMST, T)
+    else:
+        lambda_moon, beta_moon = context.lambda_moon, context.beta_moon
+        alpha_moon, delta_moon = context.alpha_moon, context.delta_moon
+        distance_moon, phase_angle_moon, illumination = \
+            context.distance_moon, context.phase_angle_moon, context.illumination
+        GAST = context.GAST
     
     # 지역 항성시(LST) 계산
     LST = (GAST + longitude) % 360.0
@@ -414,22 +393,24 @@ def calculate_moon_position_and_phase(year, month, day, hour, minute, second, la
     altitude_moon, azimuth_moon = equatorial_to_horizontal(delta_moon, HA_moon, latitude)
     
     # 대기 굴절 보정 적용
-    altitude_moon_corrected = altitude_moon + atmospheric_refraction_correction(altitude_moon)
-    
-    # 달의 거리 계산 (고차항 포함)
-    distance_moon = moon_distance(T, D_moon, M_moon, F_moon)
-    
-    # 태양의 진황경 계산 (위상각 계산에 필요)
-    lambda_sun = calculate_lambda_sun(T)
+    if fast:
+        altitude_moon_corrected = altitude_moon + lookup.atmospheric_refraction_correction(altitude_moon)
+    else:
+        altitude_moon_corrected = altitude_moon + atmospheric_refraction_correction(altitude_moon)
     
-    # 달의 위상각과 조도 계산
-    phase_angle_moon, illumination = calculate_phase_angle_geo(lambda_sun, lambda_moon, beta_moon, distance_moon, T)
-
     # 달의 조도(E_MT) 계산
-    E_MT = calculate_moon_illuminance(phase_angle_moon, distance_moon)
+    if fast:
+        E_MT = lookup.calculate_moon_illuminance(phase_angle_moon, distance_moon)
+    elif context is None:
+        E_MT = calculate_moon_illuminance(phase_angle_moon, distance_moon)
+    else:
+        E_MT = context.E_MT
       
     # 대기를 통과한 달빛 조도(E_DN_moon) 계산
-    E_DN_moon = calculate_E_DN_moon(E_MT, altitude_moon_corrected)
+    if fast:
+        E_DN_moon = lookup.calculate_E_DN_moon(E_MT, altitude_moon_corrected)
+    else:
+        E_DN_moon = calculate_E_DN_moon(E_MT, altitude_moon_corrected)
     
      # 표면에서의 달빛 조도(E_DV_moon) 계산
     cos_theta_s_moon = calculate_cos_theta_s_moon(altitude_moon_corrected, azimuth_moon)  
@@ -1,10 +1,35 @@
 #output.py
 
-from .sun import calculate_sun_position
-from .moon import calculate_moon_position_and_phase
+from .vectorized import julian_day_array, jd_to_datetime64, calculate_sun_and_moon_terms
 from datetime import datetime, timedelta, timezone
+import numpy as np
 
-def calculate_and_collect_data(year, month, day, timezone_offset, latitude, longitude):
+# 결과 열: (열 이름, 계산 결과 키, 배율, 표시 형식). 숫자 결과도 같은 이름·단위를 씁니다.
+COLUMNS = [
+    ('Sun Lambda (°)', 'lambda_sun', 1, '.2f'),
+    ('Sun Alt (°)', 'altitude_sun', 1, '.2f'),
+    ('Sun Az (°)', 'azimuth_sun', 1, '.2f'),
+    ('Sun Dist (AU)', 'r_sun_earth', 1, '.6f'),
+    ('Moon Lambda (°)', 'lambda_moon', 1, '.2f'),
+    ('Moon Beta (°)', 'beta_moon', 1, '.2f'),
+    ('Moon Alt (°)', 'altitude', 1, '.2f'),
+    ('Moon Az (°)', 'azimuth', 1, '.2f'),
+    ('Moon Dist (km)', 'distance_moon', 1, '.2f'),
+    ('Moon Phase Angle (°)', 'phase_angle_moon', 1, '.2f'),
+    ('Moon Illumination (%)', 'illumination', 100, '.2f'),
+    ('R_light_sun (lux)', 'R_light_sun', 1, '.2f'),
+    ('R_light_moon (millilux)', 'R_light_moon', 1000, '.2f'),
+    ('R_Twilight_sun (lux)', 'R_Twilight_sun', 1, '.2f'),
+    ('E_surface (millilux)', 'E_surface', 1000, '.2f'),
+]
+
+TIME_COLUMN = 'Local Time'
+
+# 구조화 배열의 dtype (현지 시각 + float64 열)
+RESULT_DTYPE = np.dtype([(TIME_COLUMN, 'datetime64[s]')] + [(name, np.float64) for name, _, _, _ in COLUMNS])
+
+
+def calculate_and_collect_data(year, month, day, timezone_offset, latitude, longitude, result='records'):
     """
     지정된 날짜와 시간대에 대해 태양과 달의 데이터를 계산하고 수집합니다.
     
@@ -15,59 +40,202 @@ def calculate_and_collect_data(year, month, day, timezone_offset, latitude, long
         timezone_offset (int): 시간대 오프셋 (예: KST는 +9)
         latitude (float): 위도
         longitude (float): 경도
+        result (str): 결과 형태
+            'records': 표시용 문자열로 포맷한 딕셔너리 목록 (기존 형태)
+            'array': RESULT_DTYPE 의 구조화 NumPy 배열 ('Local Time' 은 datetime64, 나머지는 float64)
+            'frame': 같은 열의 pandas DataFrame
     
     Returns:
-        list of dict: 각 시간대별 태양과 달의 데이터
+        list of dict, numpy.ndarray 또는 pandas.DataFrame: 각 시간대별 태양과 달의 데이터
     """
-    data = []
-    # 시작 시간과 종료 시간 설정 (UTC 기준, 09:00부터 23:00 UTC)
+    if result not in ('records', 'array', 'frame'):
+        raise ValueError(f"result 는 'records', 'array', 'frame' 중 하나여야 합니다: {result!r}")
+
+    # 시작 시간과 종료 시간 설정 (UTC 기준, 07:00부터 23:00 UTC)
     start_time_utc = datetime(year, month, day, 7, 0, 0, tzinfo=timezone.utc)
     end_time_utc = datetime(year, month, day, 23, 0, 0, tzinfo=timezone.utc)
     delta = timedelta(minutes=10)
-    current_time = start_time_utc
-
-    while current_time <= end_time_utc:
-        # 현지 시간 계산 (timezone_offset을 적용하여 현지 시간으로 변환)
-        local_time = current_time + timedelta(hours=timezone_offset)
-        
-        # 태양 위치 계산 (UTC 시간 기준으로 전달)
-        sun_data = calculate_sun_position(
-            current_time.year, current_time.month, current_time.day,
-            current_time.hour, current_time.minute, current_time.second,
-            latitude, longitude
-        )
-
-        # 달 위치 및 위상 계산 (UTC 시간 기준으로 전달)
-        moon_data = calculate_moon_position_and_phase(
-            current_time.year, current_time.month, current_time.day,
-            current_time.hour, current_time.minute, current_time.second,
-            latitude, longitude
-        )
-
-        # E_surface 계산 (lux 단위)
+    n_times = int((end_time_utc - start_time_utc) / delta) + 1
+
+    # 시각 축 전체를 배열 경로로 한 번에 계산 (현지 시간은 timezone_offset 을 적용)
+    table = next(iter_collected_data(start_time_utc, end_time_utc, delta, latitude, longitude, timezone_offset,
+                                     chunk_size=n_times))
+
+    if result == 'array':
+        return table
+    if result == 'frame':
+        return to_frame(table)
+    return format_records(table)
+
+
+def _to_datetime64(time_utc):
+    """datetime(aware 이면 UTC 로 변환) 또는 datetime64 를 datetime64[ns] 로 바꿉니다."""
+    if isinstance(time_utc, datetime) and time_utc.tzinfo is not None:
+        time_utc = time_utc.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(time_utc, 'ns')
+
+
+def iter_collected_data(start_utc, end_utc, step, latitude, longitude, timezone_offset=0, chunk_size=1440,
+                        ephemeris=None, fast=False):
+    """
+    start_utc 부터 end_utc 까지(끝 포함) step 간격의 태양·달 데이터를 chunk_size 행씩 만들어 내보내는 생성기.
+    한 번에 한 덩어리만 메모리에 두므로 수개월·수년 길이의 분 단위 계열도 파일이나 소켓으로 흘려보낼 수 있습니다.
+
+    Parameters:
+        start_utc, end_utc: 구간의 시작·끝 (datetime 또는 datetime64, 시간대 정보가 없으면 UTC)
+        step: 시간 간격 (timedelta 또는 timedelta64)
+        latitude, longitude: 위도·경도
+        timezone_offset: 'Local Time' 열에 적용할 시간대 오프셋 (시간)
+        chunk_size: 덩어리 하나의 최대 행 수
+        ephemeris, fast: vectorized.calculate_sun_and_moon_terms 에 그대로 전달
+
+    Yields:
+        numpy.ndarray: RESULT_DTYPE 의 구조화 배열 (calculate_and_collect_data(result='array') 와 같은 열)
+    """
+    offset = np.timedelta64(int(round(timezone_offset * 3600)), 's')
+    for times, columns in iter_collected_columns(start_utc, end_utc, step, latitude, longitude, chunk_size,
+                                                 ephemeris=ephemeris, fast=fast):
+        chunk = np.empty(times.size, dtype=RESULT_DTYPE)
+        chunk[TIME_COLUMN] = times + offset
+        for name, values in columns.items():
+            chunk[name] = values
+        yield chunk
+
+
+def _iter_time_chunks(start_utc, end_utc, step, chunk_size):
+    """start_utc ~ end_utc (끝 포함) step 간격 시각을 chunk_size 개씩 datetime64[ns] 배열로 내보냅니다."""
+    start = _to_datetime64(start_utc)
+    step_ns = np.timedelta64(step, 'ns').astype(np.int64)
+    if step_ns <= 0:
+        raise ValueError(f"step 은 0 보다 커야 합니다: {step!r}")
+    n_times = int((_to_datetime64(end_utc) - start).astype(np.int64) // step_ns) + 1
+    for first in range(0, max(n_times, 0), chunk_size):
+        index = np.arange(first, min(first + chunk_size, n_times), dtype=np.int64)
+        yield start + (index * step_ns).astype('timedelta64[ns]')
+
+
+def iter_collected_columns(start_utc, end_utc, step, latitudes, longitudes, chunk_size=1440, columns=None,
+                           ephemeris=None, fast=False):
+    """
+    여러 위치의 계열을 시각 chunk_size 개씩 열 배열로 내보내는 생성기.
+    시각별 항은 덩어리마다 한 번 계산해 모든 위치로 브로드캐스트합니다.
+
+    Parameters:
+        latitudes, longitudes: 위치 배열 (스칼라이면 열 배열도 (시각 수,) 모양)
+        columns: 계산할 열 이름 목록 (COLUMNS 의 이름, 기본: 전체)
+        나머지는 iter_collected_data 와 같음
+
+    Yields:
+        (times, columns): UTC datetime64[ns] (시각 수,) 배열과 {열 이름: (시각 수, 위치 수) float64 배열}
+    """
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+    selected = [column for column in COLUMNS if columns is None or column[0] in columns]
+    for times in _iter_time_chunks(start_utc, end_utc, step, chunk_size):
+        JD = julian_day_array(times)
+        if latitudes.ndim or longitudes.ndim:
+            JD = JD[:, np.newaxis]
+        sun_data, moon_data = calculate_sun_and_moon_terms(JD, latitudes, longitudes, ephemeris, fast)
+        values = {**sun_data, **moon_data, 'E_surface': sun_data['R_Twilight_sun'] + moon_data['R_light_moon']}
+        yield times, {name: values[key] * scale for name, key, scale, _ in selected}
+
+
+def to_frame(table):
+    """calculate_and_collect_data 의 구조화 배열을 pandas DataFrame 으로 바꿉니다."""
+    import pandas as pd
+    return pd.DataFrame({name: table[name] for name in table.dtype.names})
+
+
+def format_records(table):
+    """
+    숫자 결과(구조화 배열 또는 DataFrame)를 표시용 문자열 딕셔너리 목록으로 포맷합니다.
+    타임테이블을 그릴 때만 호출합니다.
+    """
+    times = np.asarray(table[TIME_COLUMN], dtype='datetime64[m]')
+    columns = [(name, np.asarray(table[name], dtype=float).tolist(), fmt) for name, _, _, fmt in COLUMNS]
+    records = []
+    for i, local_time in enumerate(times.tolist()):
+        record = {TIME_COLUMN: local_time.strftime('%Y-%m-%d %H:%M')}
+        for name, values, fmt in columns:
+            record[name] = format(values[i], fmt)
+        records.append(record)
+    return records
+
+
+def calculate_darkness_index(dates, latitudes, longitudes, thresholds_millilux=(0.1, 1.0), step_minutes=10,
+                             sun_altitude_limit=0.0, chunk_size=256):
+    """
+    (날짜, 위치) 쌍마다 그날 밤의 어두움 지표를 계산합니다. 문자열 행을 만들지 않고 배열로 바로 계산합니다.
+
+    밤: 지방 평균 태양시 정오(UTC 12시 - 경도/15 시간)부터 다음 날 정오까지 중
+        태양 고도(굴절 보정 후)가 sun_altitude_limit 미만인 시각
+    적분은 step_minutes 간격 구간의 중간점 값으로 합산합니다.
+
+    Parameters:
+        dates: 날짜 배열 (datetime.date, 'YYYY-MM-DD' 문자열, datetime64 등)
+        latitudes, longitudes: 위도·경도 배열 (dates 와 브로드캐스트 가능)
+        thresholds_millilux: '몇 분 동안 이 값보다 어두웠는가' 를 셀 기준 조도 (millilux)
+        step_minutes: 샘플 간격 (분)
+        sun_altitude_limit: 밤으로 볼 태양 고도 상한 (도, 0: 일몰~일출, -18: 천문 박명 이후)
+        chunk_size: 한 번에 계산할 쌍의 수 (메모리 사용량 제한)
+
+    Returns:
+        dict: 쌍마다 하나씩인 배열
+            'date', 'latitude', 'longitude'
+            'integrated_lux_hours': 밤 동안 E_surface 의 시간 적분 (lux·h)
+            'night_minutes': 밤의 길이 (분)
+            'minutes_below': (쌍 수, 기준 수) 배열, 밤 중 E_surface 가 기준보다 낮은 시간 (분)
+            'thresholds_millilux': 기준 조도 배열
+            'peak_moonlight': 밤 중 R_light_moon 의 최댓값 (lux)
+            'peak_moonlight_time': 그 시각 (UTC, datetime64[ns]; 달이 뜨지 않으면 NaT)
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    dates, latitudes, longitudes = np.broadcast_arrays(dates, np.asarray(latitudes, dtype=float),
+                                                       np.asarray(longitudes, dtype=float))
+    dates, latitudes, longitudes = dates.ravel(), latitudes.ravel(), longitudes.ravel()
+    thresholds = np.asarray(thresholds_millilux, dtype=float).ravel() / 1000.0
+
+    n_steps = int(round(24 * 60 / step_minutes))
+    step_days = step_minutes / 1440.0
+    offsets = (np.arange(n_steps) + 0.5)[:, np.newaxis] * step_days
+
+    n_pairs = dates.size
+    integrated = np.empty(n_pairs)
+    night_minutes = np.empty(n_pairs)
+    minutes_below = np.empty((n_pairs, thresholds.size))
+    peak_moonlight = np.empty(n_pairs)
+    peak_time = np.full(n_pairs, np.nan)
+
+    for start in range(0, n_pairs, chunk_size):
+        block = slice(start, start + chunk_size)
+        lat, lon = latitudes[block], longitudes[block]
+        # 지방 평균 태양시 정오의 줄리안 날짜
+        jd_noon = julian_day_array(dates[block]) + 0.5 - lon / 360.0
+        JD = jd_noon + offsets
+
+        sun_data, moon_data = calculate_sun_and_moon_terms(JD, lat, lon)
         E_surface = sun_data['R_Twilight_sun'] + moon_data['R_light_moon']
+        night = sun_data['altitude_sun'] < sun_altitude_limit
+
+        integrated[block] = np.sum(E_surface, axis=0, where=night) * step_days * 24.0
+        night_minutes[block] = night.sum(axis=0) * step_minutes
+        below = (E_surface[..., np.newaxis] < thresholds) & night[..., np.newaxis]
+        minutes_below[block] = below.sum(axis=0) * step_minutes
+
+        moonlight = np.where(night, moon_data['R_light_moon'], 0.0)
+        index = np.argmax(moonlight, axis=0)
+        columns = np.arange(index.size)
+        peak_moonlight[block] = moonlight[index, columns]
+        peak_time[block] = np.where(peak_moonlight[block] > 0, JD[index, columns], np.nan)
 
-        # 데이터 수집 (달빛 조도(E_MT) 및 태양 외계 조도(E_ST) 추가)
-        data.append({
-            'Local Time': local_time.strftime('%Y-%m-%d %H:%M'),
-            'Sun Lambda (°)': f"{sun_data['lambda_sun']:.2f}",
-            'Sun Alt (°)': f"{sun_data['altitude_sun']:.2f}",
-            'Sun Az (°)': f"{sun_data['azimuth_sun']:.2f}",
-            'Sun Dist (AU)': f"{sun_data['r_sun_earth']:.6f}",
-            'Moon Lambda (°)': f"{moon_data['lambda_moon']:.2f}",
-            'Moon Beta (°)': f"{moon_data['beta_moon']:.2f}",
-            'Moon Alt (°)': f"{moon_data['altitude']:.2f}",
-            'Moon Az (°)': f"{moon_data['azimuth']:.2f}",
-            'Moon Dist (km)': f"{moon_data['distance_moon']:.2f}",
-            'Moon Phase Angle (°)': f"{moon_data['phase_angle_moon']:.2f}",
-            'Moon Illumination (%)': f"{moon_data['illumination'] * 100:.2f}",
-            'R_light_sun (lux)': f"{sun_data['R_light_sun']:.2f}",    
-            'R_light_moon (millilux)': f"{moon_data['R_light_moon'] * 1000:.2f}",  
-            'R_Twilight_sun (lux)': f"{sun_data['R_Twilight_sun']:.2f}",
-            'E_surface (millilux)': f"{E_surface * 1000:.2f}"      
-        })
-
-        # 다음 시간으로 이동
-        current_time += delta
-
-    return data
+    return {
+        'date': dates,
+        'latitude': latitudes,
+        'longitude': longitudes,
+        'integrated_lux_hours': integrated,
+        'night_minutes': night_minutes,
+        'minutes_below': minutes_below,
+        'thresholds_millilux': np.asarray(thresholds_millilux, dtype=float).ravel(),
+        'peak_moonlight': peak_moonlight,
+        'peak_moonlight_time': jd_to_datetime64(peak_time),
+    }
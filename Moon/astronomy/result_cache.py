@@ -0,0 +1,342 @@
+# astronomy/result_cache.py
+"""
+calculate_and_collect_data 결과(숫자 구조화 배열)의 캐시.
+
+MemoryResultCache: 프로세스 안의 LRU. 같은 요청을 처리하는 여러 콜백(스레드)이 결과를 공유합니다.
+ResultCache: SQLite 파일에 저장하는 영구 캐시.
+
+ResultCache 는 여러 워커 프로세스가 같은 파일을 함께 쓰며, 재시작하거나 새로 뜬 워커도 이전 결과를 바로 씁니다.
+- 키: 날짜, 양자화한 위도·경도, 시간대 오프셋, 모델 해시(model_fingerprint)
+  모델 소스(series.MODEL_SOURCES: helpers.py, sun.py, moon.py, series.py, vectorized.py)나 정확도 단계,
+  결과 열 구성이 바뀌면 해시가 달라져 이전 항목은 더 이상 쓰이지 않고, 크기 상한에 따라 차례로 지워집니다.
+- 조회 시각: 적중할 때마다 쓰지 않고 프로세스 안에 모아 두었다가 ACCESS_FLUSH_SECONDS 초 또는
+  ACCESS_FLUSH_ENTRIES 개마다, 그리고 저장(제거 직전) 때 한 트랜잭션으로 기록합니다.
+  읽기가 WAL 쓰기를 만들지 않으므로 워커 사이의 잠금 경합이 줄고, 제거 순서는 그만큼 근사가 됩니다.
+- 동시성: WAL 모드와 busy timeout 으로 여러 프로세스의 읽기·쓰기를 SQLite 잠금에 맡기며,
+  연결은 프로세스·스레드마다 따로 엽니다.
+- 제거: 저장된 값의 크기 합이 max_bytes 를 넘으면 가장 오래 쓰이지 않은 항목부터 지웁니다.
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from . import series
+from .output import COLUMNS, RESULT_DTYPE, calculate_and_collect_data
+
+# 환경 변수: 캐시 파일 경로와 크기 상한 (바이트)
+CACHE_PATH_ENV = 'MOON_RESULT_CACHE'
+CACHE_BYTES_ENV = 'MOON_RESULT_CACHE_BYTES'
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# 메모리 캐시의 기본 항목 수
+DEFAULT_MAX_ENTRIES = 128
+
+# 위도·경도 양자화 간격 (도)
+QUANTIZE_DEGREES = 0.01
+
+# 조회 시각(accessed)을 모아서 기록하는 주기 (초)와 최대 항목 수
+ACCESS_FLUSH_SECONDS = 30.0
+ACCESS_FLUSH_ENTRIES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+_fingerprint = None
+
+
+def model_fingerprint():
+    """모델 소스 해시(series.model_source_hash)와 결과 열 구성의 해시, series 정확도 단계."""
+    global _fingerprint
+    if _fingerprint is None:
+        source = repr([series.model_source_hash(), COLUMNS, RESULT_DTYPE.descr])
+        _fingerprint = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+    return f"{_fingerprint}-{series.get_series_tier()}"
+
+
+def quantize(value, step=QUANTIZE_DEGREES):
+    """위도·경도를 step 간격으로 반올림합니다."""
+    return round(round(float(value) / step) * step, 6)
+
+
+def _dumps(table):
+    buffer = io.BytesIO()
+    np.save(buffer, table, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _loads(blob):
+    return np.load(io.BytesIO(blob), allow_pickle=False)
+
+
+class ResultCache:
+    """
+    SQLite 파일 하나에 결과를 저장하는 프로세스 간 공유 캐시.
+
+    path: SQLite 파일 경로 (디렉터리가 없으면 만듦)
+    max_bytes: 저장할 값의 크기 합 상한 (바이트)
+    quantize_degrees: 키와 계산에 쓰는 위도·경도 간격 (도)
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, quantize_degrees=QUANTIZE_DEGREES, timeout=30.0):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.quantize_degrees = quantize_degrees
+        self.timeout = timeout
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._touched = {}  # 아직 기록하지 않은 조회 시각: 키 -> time.time()
+        self._flushed = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self):
+        """프로세스·스레드마다 하나씩 여는 연결 (fork 후에는 새로 엶)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def make_key(self, date, latitude, longitude, timezone_offset):
+        """(날짜, 양자화 위도·경도, 시간대 오프셋, 모델 해시) 키 문자열."""
+        step = self.quantize_degrees
+        return (f"{date}|{quantize(latitude, step):.6f}|{quantize(longitude, step):.6f}|"
+                f"{float(timezone_offset):g}|{model_fingerprint()}")
+
+    def get(self, key):
+        """키의 구조화 배열. 없으면 None."""
+        connection = self._connect()
+        row = connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            with self._stats_lock:
+                self.misses += 1
+            return None
+        with self._stats_lock:
+            self.hits += 1
+            self._touched[key] = time.time()
+            due = (len(self._touched) >= ACCESS_FLUSH_ENTRIES or
+                   time.monotonic() - self._flushed >= ACCESS_FLUSH_SECONDS)
+        if due:
+            self.flush_access_times()
+        return _loads(row[0])
+
+    def _take_touched(self):
+        """모아 둔 조회 시각을 꺼냅니다."""
+        with self._stats_lock:
+            touched, self._touched = self._touched, {}
+            self._flushed = time.monotonic()
+        return touched
+
+    @staticmethod
+    def _write_touched(connection, touched):
+        """조회 시각을 기록합니다 (트랜잭션 안에서 호출). 더 최근 값은 덮어쓰지 않습니다."""
+        connection.executemany('UPDATE results SET accessed = MAX(accessed, ?) WHERE key = ?',
+                               [(accessed, key) for key, accessed in touched.items()])
+
+    def flush_access_times(self):
+        """모아 둔 조회 시각을 한 트랜잭션으로 기록합니다."""
+        touched = self._take_touched()
+        if not touched:
+            return
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            self._write_touched(connection, touched)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def put(self, key, table):
+        """구조화 배열을 저장하고, 크기 상한을 넘으면 오래 쓰이지 않은 항목부터 지웁니다."""
+        blob = _dumps(table)
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)',
+                               (key, blob, len(blob), time.time()))
+            # 제거 순서가 이 프로세스의 최근 조회를 반영하도록 먼저 기록
+            self._write_touched(connection, self._take_touched())
+            self._evict(connection)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def _evict(self, connection):
+        """크기 합이 max_bytes 이하가 될 때까지 accessed 가 오래된 항목을 지웁니다 (트랜잭션 안에서 호출)."""
+        total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        removed = []
+        for key, size in connection.execute('SELECT key, size FROM results ORDER BY accessed'):
+            removed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany('DELETE FROM results WHERE key = ?', removed)
+
+    def get_or_compute(self, year, month, day, timezone_offset, latitude, longitude):
+        """
+        calculate_and_collect_data(..., result='array') 의 캐시 버전.
+        위도·경도는 양자화한 값으로 계산하므로 같은 키의 결과는 어느 프로세스가 계산해도 같습니다.
+        """
+        latitude = quantize(latitude, self.quantize_degrees)
+        longitude = quantize(longitude, self.quantize_degrees)
+        key = self.make_key(f"{year:04d}-{month:02d}-{day:02d}", latitude, longitude, timezone_offset)
+        table = self.get(key)
+        if table is None:
+            table = _compute_array(year, month, day, timezone_offset, latitude, longitude)
+            self.put(key, table)
+        return table
+
+    def configure(self, max_bytes=None):
+        """크기 상한을 바꾸고 바로 적용합니다."""
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            self._evict(connection)
+            connection.execute('COMMIT')
+
+    def clear(self):
+        """모든 항목과 이 프로세스의 통계를 지웁니다."""
+        self._connect().execute('DELETE FROM results')
+        with self._stats_lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """이 프로세스의 적중·실패 횟수와 파일 전체의 항목 수·크기(바이트)."""
+        entries, size = self._connect().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+        with self._stats_lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'path': self.path,
+            }
+
+
+class MemoryResultCache:
+    """
+    (날짜, 양자화 위도·경도, 시간대 오프셋, 모델 해시) 를 키로 결과를 보관하는 스레드 안전 LRU 캐시.
+
+    compute: 실제 계산 함수 compute(year, month, day, timezone_offset, latitude, longitude) -> 구조화 배열
+        (기본: calculate_and_collect_data(..., result='array'); ResultCache.get_or_compute 를 넘겨 영구 캐시 앞에 둘 수 있음)
+    max_entries: 보관할 항목 수
+    quantize_degrees: 키와 계산에 쓰는 위도·경도 간격 (도)
+
+    같은 키를 여러 스레드가 동시에 요청하면 한 스레드만 계산하고 나머지는 그 결과를 기다립니다.
+    """
+
+    def __init__(self, compute=None, max_entries=DEFAULT_MAX_ENTRIES, quantize_degrees=QUANTIZE_DEGREES):
+        self.compute = compute or _compute_array
+        self.max_entries = max_entries
+        self.quantize_degrees = quantize_degrees
+        self._entries = OrderedDict()
+        self._pending = {}  # 계산 중인 키 -> threading.Event
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, year, month, day, timezone_offset, latitude, longitude):
+        """캐시된 구조화 배열 (읽기 전용으로 다룰 것). 없으면 계산해 저장합니다."""
+        latitude = quantize(latitude, self.quantize_degrees)
+        longitude = quantize(longitude, self.quantize_degrees)
+        key = (year, month, day, float(timezone_offset), latitude, longitude, model_fingerprint())
+        while True:
+            with self._lock:
+                table = self._entries.get(key)
+                if table is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return table
+                event = self._pending.get(key)
+                if event is None:
+                    self.misses += 1
+                    event = self._pending[key] = threading.Event()
+                    break
+            # 다른 스레드가 계산 중: 끝나면 다시 조회 (그 계산이 실패했으면 이 스레드가 계산)
+            event.wait()
+
+        try:
+            table = self.compute(year, month, day, timezone_offset, latitude, longitude)
+            with self._lock:
+                self._entries[key] = table
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
+        return table
+
+    def configure(self, max_entries=None, quantize_degrees=None):
+        """항목 수와 양자화 간격을 바꿉니다 (None 인 인자는 그대로 둠). 간격을 바꾸면 기존 항목을 버립니다."""
+        with self._lock:
+            if quantize_degrees is not None and quantize_degrees != self.quantize_degrees:
+                self.quantize_degrees = quantize_degrees
+                self._entries.clear()
+            if max_entries is not None:
+                self.max_entries = max_entries
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def clear(self):
+        """모든 항목과 통계를 지웁니다."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """적중·실패 횟수, 적중률, 항목 수."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'quantize_degrees': self.quantize_degrees,
+            }
+
+
+def _compute_array(year, month, day, timezone_offset, latitude, longitude):
+    return calculate_and_collect_data(year, month, day, timezone_offset, latitude, longitude, result='array')
+
+
+def open_result_cache(default_path):
+    """
+    환경 변수 MOON_RESULT_CACHE (파일 경로, 'off' 이면 사용 안 함)와 MOON_RESULT_CACHE_BYTES 로 설정한 캐시.
+    경로가 지정되지 않으면 default_path 를 씁니다. 사용하지 않으면 None.
+    """
+    path = os.environ.get(CACHE_PATH_ENV, default_path)
+    if not path or path.lower() in ('off', 'none', '0'):
+        return None
+    max_bytes = int(os.environ.get(CACHE_BYTES_ENV, DEFAULT_MAX_BYTES))
+    return ResultCache(path, max_bytes=max_bytes)
@@ -0,0 +1,529 @@
+# astronomy/series.py
+"""
+달의 황경(중심차)·황위·거리와 세차·진동을 계수 표로 계산합니다.
+
+각 표의 행은 하나의 주기항이며, 앞 다섯 열은 기본 인수 (D, M, M′, F, Ω) 의 배수, 나머지 열은 진폭입니다.
+    D: 달의 평균 편각, M: 태양의 평균 근점, M′: 달의 평균 근점, F: 달의 평균 황위 인수, Ω: 달 궤도 승교점 황경
+배열 입력(vectorized.py)은 인수 벡터와 배수 행렬의 곱으로 모든 항의 각을 한 번에 구하고, sin/cos 값과 진폭 벡터의 곱으로 합산합니다.
+스칼라 입력(moon.py)은 *_scalar 함수가 같은 표의 행을 math 로 차례로 더합니다 (NumPy 호출 비용이 항 계산보다 큼).
+
+정확도 단계 (tier):
+    'coarse':   'standard' 에서 큰 항만 남긴 것 (히트맵 미리보기 등)
+    'standard': 기존 moon.py 의 식과 같은 항 (기본값)
+    'full':     Meeus, Astronomical Algorithms 47장 표 47.A/47.B 전체 (60 + 60 항, 이심률 보정 E 와 A1~A3 항 포함)
+                세차·진동은 22장 표 22.A 전체 (63 항)
+
+단계는 환경 변수 MOON_ASTRONOMY_SERIES 또는 set_series_tier() 로 고르며, 급수 함수와
+moon.moon_time_terms / calculate_moon_position_and_phase, vectorized.moon_time_terms / calculate_sun_and_moon_terms 의
+tier 인자로 바꿀 수도 있습니다.
+"""
+
+import hashlib
+import math
+import os
+import numpy as np
+from .sun import solar_mean_anomaly
+
+SERIES_ENV = 'MOON_ASTRONOMY_SERIES'
+SERIES_TIERS = ('coarse', 'standard', 'full')
+
+# 모델 식과 상수가 들어 있는 소스 파일 (model_source_hash 의 대상)
+MODEL_SOURCES = ('helpers.py', 'sun.py', 'moon.py', 'series.py', 'vectorized.py')
+
+# ---------------------------------------------------------------------------
+# 황경 (중심차, sin 항): D, M, M′, F, Ω, 진폭 (도)
+# ---------------------------------------------------------------------------
+
+# moon.moon_equation_of_center 의 항
+_LONGITUDE_STANDARD = [
+    (0, 0, 1, 0, 0, 6.289),
+    (2, 0, -1, 0, 0, 1.274),
+    (2, 0, 0, 0, 0, 0.658),
+    (0, 0, 2, 0, 0, 0.214),
+    (1, 0, 0, 0, 0, 0.11),
+    (0, 0, 1, 1, 0, 0.046),
+    (2, 0, -2, 0, 0, 0.014),
+    (0, 0, 1, -1, 0, 0.011),
+]
+
+# Meeus 표 47.A: D, M, M′, F, Σl (1e-6 도), Σr (1e-3 km)
+_MEEUS_47A = [
+    (0, 0, 1, 0, 6288774, -20905355),
+    (2, 0, -1, 0, 1274027, -3699111),
+    (2, 0, 0, 0, 658314, -2955968),
+    (0, 0, 2, 0, 213618, -569925),
+    (0, 1, 0, 0, -185116, 48888),
+    (0, 0, 0, 2, -114332, -3149),
+    (2, 0, -2, 0, 58793, 246158),
+    (2, -1, -1, 0, 57066, -152138),
+    (2, 0, 1, 0, 53322, -170733),
+    (2, -1, 0, 0, 45758, -204586),
+    (0, 1, -1, 0, -40923, -129620),
+    (1, 0, 0, 0, -34720, 108743),
+    (0, 1, 1, 0, -30383, 104755),
+    (2, 0, 0, -2, 15327, 10321),
+    (0, 0, 1, 2, -12528, 0),
+    (0, 0, 1, -2, 10980, 79661),
+    (4, 0, -1, 0, 10675, -34782),
+    (0, 0, 3, 0, 10034, -23210),
+    (4, 0, -2, 0, 8548, -21636),
+    (2, 1, -1, 0, -7888, 24208),
+    (2, 1, 0, 0, -6766, 30824),
+    (1, 0, -1, 0, -5163, -8379),
+    (1, 1, 0, 0, 4987, -16675),
+    (2, -1, 1, 0, 4036, -12831),
+    (2, 0, 2, 0, 3994, -10445),
+    (4, 0, 0, 0, 3861, -11650),
+    (2, 0, -3, 0, 3665, 14403),
+    (0, 1, -2, 0, -2689, -7003),
+    (2, 0, -1, 2, -2602, 0),
+    (2, -1, -2, 0, 2390, 10056),
+    (1, 0, 1, 0, -2348, 6322),
+    (2, -2, 0, 0, 2236, -9884),
+    (0, 1, 2, 0, -2120, 5751),
+    (0, 2, 0, 0, -2069, 0),
+    (2, -2, -1, 0, 2048, -4950),
+    (2, 0, 1, -2, -1773, 4130),
+    (2, 0, 0, 2, -1595, 0),
+    (4, -1, -1, 0, 1215, -3958),
+    (0, 0, 2, 2, -1110, 0),
+    (3, 0, -1, 0, -892, 3258),
+    (2, 1, 1, 0, -810, 2616),
+    (4, -1, -2, 0, 759, -1897),
+    (0, 2, -1, 0, -713, -2117),
+    (2, 2, -1, 0, -700, 2354),
+    (2, 1, -2, 0, 691, 0),
+    (2, -1, 0, -2, 596, 0),
+    (4, 0, 1, 0, 549, -1423),
+    (0, 0, 4, 0, 537, -1117),
+    (4, -1, 0, 0, 520, -1571),
+    (1, 0, -2, 0, -487, -1739),
+    (2, 1, 0, -2, -399, 0),
+    (0, 0, 2, -2, -381, -4421),
+    (1, 1, 1, 0, 351, 0),
+    (3, 0, -2, 0, -340, 0),
+    (4, 0, -3, 0, 330, 0),
+    (2, -1, 2, 0, 327, 0),
+    (0, 2, 1, 0, -323, 1165),
+    (1, 1, -1, 0, 299, 0),
+    (2, 0, 3, 0, 294, 0),
+    (2, 0, -1, -2, 0, 8752),
+]
+
+# ---------------------------------------------------------------------------
+# 황위 (sin 항): D, M, M′, F, Ω, 진폭 (도)
+# ---------------------------------------------------------------------------
+
+# moon.moon_ecliptic_latitude 의 항
+_LATITUDE_STANDARD = [
+    (0, 0, 0, 1, 0, 5.128),
+]
+
+# Meeus 표 47.B: D, M, M′, F, Σb (1e-6 도)
+_MEEUS_47B = [
+    (0, 0, 0, 1, 5128122),
+    (0, 0, 1, 1, 280602),
+    (0, 0, 1, -1, 277693),
+    (2, 0, 0, -1, 173237),
+    (2, 0, -1, 1, 55413),
+    (2, 0, -1, -1, 46271),
+    (2, 0, 0, 1, 32573),
+    (0, 0, 2, 1, 17198),
+    (2, 0, 1, -1, 9266),
+    (0, 0, 2, -1, 8822),
+    (2, -1, 0, -1, 8216),
+    (2, 0, -2, -1, 4324),
+    (2, 0, 1, 1, 4200),
+    (2, 1, 0, -1, -3359),
+    (2, -1, -1, 1, 2463),
+    (2, -1, 0, 1, 2211),
+    (2, -1, -1, -1, 2065),
+    (0, 1, -1, -1, -1870),
+    (4, 0, -1, -1, 1828),
+    (0, 1, 0, 1, -1794),
+    (0, 0, 0, 3, -1749),
+    (0, 1, -1, 1, -1565),
+    (1, 0, 0, 1, -1491),
+    (0, 1, 1, 1, -1475),
+    (0, 1, 1, -1, -1410),
+    (0, 1, 0, -1, -1344),
+    (1, 0, 0, -1, -1335),
+    (0, 0, 3, 1, 1107),
+    (4, 0, 0, -1, 1021),
+    (4, 0, -1, 1, 833),
+    (0, 0, 1, -3, 777),
+    (4, 0, -2, 1, 671),
+    (2, 0, 0, -3, 607),
+    (2, 0, 2, -1, 596),
+    (2, -1, 1, -1, 491),
+    (2, 0, -2, 1, -451),
+    (0, 0, 3, -1, 439),
+    (2, 0, 2, 1, 422),
+    (2, 0, -3, -1, 421),
+    (2, 1, -1, 1, -366),
+    (2, 1, 0, 1, -351),
+    (4, 0, 0, 1, 331),
+    (2, -1, 1, 1, 315),
+    (2, -2, 0, -1, 302),
+    (0, 0, 1, 3, -283),
+    (2, 1, 1, -1, -229),
+    (1, 1, 0, -1, 223),
+    (1, 1, 0, 1, 223),
+    (0, 1, -2, -1, -220),
+    (2, 1, -1, -1, -220),
+    (1, 0, 1, 1, -185),
+    (2, -1, -2, -1, 181),
+    (0, 1, 2, 1, -177),
+    (4, 0, -2, -1, 176),
+    (4, -1, -1, -1, 166),
+    (1, 0, 1, -1, -164),
+    (4, 0, 1, -1, 132),
+    (1, 0, -1, -1, -119),
+    (4, -1, 0, -1, 115),
+    (2, -2, 0, 1, 107),
+]
+
+# ---------------------------------------------------------------------------
+# 거리 (cos 항): D, M, M′, F, Ω, 진폭 (km)
+# ---------------------------------------------------------------------------
+
+# 평균 거리 (km)
+MEAN_DISTANCE = 385000.56
+
+# moon.moon_distance 의 항
+_DISTANCE_STANDARD = [
+    (0, 0, 1, 0, 0, -20905.355),
+    (2, 0, 0, 0, 0, -3699.111),
+    (0, 0, 2, 0, 0, -2955.968),
+    (2, 0, -1, 0, 0, -570.0),
+    (2, 0, 1, 0, 0, 246.0),
+    (0, 0, 1, 1, 0, -205.0),
+    (1, 0, 0, -1, 0, 171.0),
+    (1, 0, 0, 1, 0, -152.0),
+    (1, 0, 0, -2, 0, 129.0),
+    (2, 0, 0, 1, 0, 63.0),
+    (0, 0, 1, 2, 0, 63.0),
+    (2, 0, 0, -2, 0, -59.0),
+    (0, 0, 1, -1, 0, -58.0),
+    (1, 0, 0, 2, 0, 51.0),
+    (1, 0, -1, 0, 0, -48.0),
+    (2, 0, 0, 2, 0, -46.0),
+    (3, 0, 0, 0, 0, 46.0),
+    (0, 0, 2, 1, 0, 29.0),
+    (1, 0, 1, 0, 0, 29.0),
+    (2, 0, -1, 1, 0, 26.0),
+    (0, 0, 1, 2, 0, -22.0),
+    (1, 0, 0, -2, 0, 21.0),
+    (2, 0, 1, 0, 0, 17.0),
+    (1, 0, -1, -1, 0, -16.0),
+    (2, 0, 1, -1, 0, -16.0),
+    (2, 0, -1, -1, 0, -15.0),
+]
+
+# ---------------------------------------------------------------------------
+# 세차·진동: D, M, M′, F, Ω, Δψ (sin, 0.0001"), Δψ·T, Δε (cos, 0.0001"), Δε·T
+# ---------------------------------------------------------------------------
+
+# moon.nutation 의 항
+_NUTATION_STANDARD = [
+    (0, 0, 0, 0, 1, -172000, 0, 92000, 0),
+    (2, 0, 0, 2, 0, -13200, 0, 5700, 0),
+    (0, 2, 0, 0, 0, -2300, 0, 1000, 0),
+    (0, 0, 0, 0, 2, 2100, 0, -900, 0),
+]
+
+# Meeus 표 22.A
+_MEEUS_22A = [
+    (0, 0, 0, 0, 1, -171996, -174.2, 92025, 8.9),
+    (-2, 0, 0, 2, 2, -13187, -1.6, 5736, -3.1),
+    (0, 0, 0, 2, 2, -2274, -0.2, 977, -0.5),
+    (0, 0, 0, 0, 2, 2062, 0.2, -895, 0.5),
+    (0, 1, 0, 0, 0, 1426, -3.4, 54, -0.1),
+    (0, 0, 1, 0, 0, 712, 0.1, -7, 0),
+    (-2, 1, 0, 2, 2, -517, 1.2, 224, -0.6),
+    (0, 0, 0, 2, 1, -386, -0.4, 200, 0),
+    (0, 0, 1, 2, 2, -301, 0, 129, -0.1),
+    (-2, -1, 0, 2, 2, 217, -0.5, -95, 0.3),
+    (-2, 0, 1, 0, 0, -158, 0, 0, 0),
+    (-2, 0, 0, 2, 1, 129, 0.1, -70, 0),
+    (0, 0, -1, 2, 2, 123, 0, -53, 0),
+    (2, 0, 0, 0, 0, 63, 0, 0, 0),
+    (0, 0, 1, 0, 1, 63, 0.1, -33, 0),
+    (2, 0, -1, 2, 2, -59, 0, 26, 0),
+    (0, 0, -1, 0, 1, -58, -0.1, 32, 0),
+    (0, 0, 1, 2, 1, -51, 0, 27, 0),
+    (-2, 0, 2, 0, 0, 48, 0, 0, 0),
+    (0, 0, -2, 2, 1, 46, 0, -24, 0),
+    (2, 0, 0, 2, 2, -38, 0, 16, 0),
+    (0, 0, 2, 2, 2, -31, 0, 13, 0),
+    (0, 0, 2, 0, 0, 29, 0, 0, 0),
+    (-2, 0, 1, 2, 2, 29, 0, -12, 0),
+    (0, 0, 0, 2, 0, 26, 0, 0, 0),
+    (-2, 0, 0, 2, 0, -22, 0, 0, 0),
+    (0, 0, -1, 2, 1, 21, 0, -10, 0),
+    (0, 2, 0, 0, 0, 17, -0.1, 0, 0),
+    (2, 0, -1, 0, 1, 16, 0, -8, 0),
+    (-2, 2, 0, 2, 2, -16, 0.1, 7, 0),
+    (0, 1, 0, 0, 1, -15, 0, 9, 0),
+    (-2, 0, 1, 0, 1, -13, 0, 7, 0),
+    (0, -1, 0, 0, 1, -12, 0, 6, 0),
+    (0, 0, 2, -2, 0, 11, 0, 0, 0),
+    (2, 0, -1, 2, 1, -10, 0, 5, 0),
+    (2, 0, 1, 2, 2, -8, 0, 3, 0),
+    (0, 1, 0, 2, 2, 7, 0, -3, 0),
+    (-2, 1, 1, 0, 0, -7, 0, 0, 0),
+    (0, -1, 0, 2, 2, -7, 0, 3, 0),
+    (2, 0, 0, 2, 1, -7, 0, 3, 0),
+    (2, 0, 1, 0, 0, 6, 0, 0, 0),
+    (-2, 0, 2, 2, 2, 6, 0, -3, 0),
+    (-2, 0, 1, 2, 1, 6, 0, -3, 0),
+    (2, 0, -2, 0, 1, -6, 0, 3, 0),
+    (2, 0, 0, 0, 1, -6, 0, 3, 0),
+    (0, -1, 1, 0, 0, 5, 0, 0, 0),
+    (-2, -1, 0, 2, 1, -5, 0, 3, 0),
+    (-2, 0, 0, 0, 1, -5, 0, 3, 0),
+    (0, 0, 2, 2, 1, -5, 0, 3, 0),
+    (-2, 0, 2, 0, 1, 4, 0, 0, 0),
+    (-2, 1, 0, 2, 1, 4, 0, 0, 0),
+    (0, 0, 1, -2, 0, 4, 0, 0, 0),
+    (-1, 0, 1, 0, 0, -4, 0, 0, 0),
+    (-2, 1, 0, 0, 0, -4, 0, 0, 0),
+    (1, 0, 0, 0, 0, -4, 0, 0, 0),
+    (0, 0, 1, 2, 0, 3, 0, 0, 0),
+    (0, 0, -2, 2, 2, -3, 0, 0, 0),
+    (-1, -1, 1, 0, 0, -3, 0, 0, 0),
+    (0, 1, 1, 0, 0, -3, 0, 0, 0),
+    (0, -1, 1, 2, 2, -3, 0, 0, 0),
+    (2, -1, -1, 2, 2, -3, 0, 0, 0),
+    (0, 0, 3, 2, 2, -3, 0, 0, 0),
+    (2, -1, 0, 2, 2, -3, 0, 0, 0),
+]
+
+
+def _meeus_47(rows, column, scale):
+    """Meeus 47장 표 (D, M, M′, F, 값...) 에 Ω 열을 넣고 column 번째 값을 scale 배 한 표."""
+    rows = np.array(rows, dtype=float)
+    rows = rows[rows[:, column] != 0]
+    return np.column_stack([rows[:, :4], np.zeros(len(rows)), rows[:, column] * scale])
+
+
+def _nutation_table(rows):
+    """진폭 단위를 0.0001" 에서 도로 바꾼 세차·진동 표."""
+    rows = np.array(rows, dtype=float)
+    return np.column_stack([rows[:, :5], rows[:, 5:] / 3600e4])
+
+
+# 단계별 표. 'coarse' 는 'standard' 에서 진폭이 큰 앞쪽 항만 사용
+LONGITUDE_TERMS = {
+    'coarse': np.array(_LONGITUDE_STANDARD[:4], dtype=float),
+    'standard': np.array(_LONGITUDE_STANDARD, dtype=float),
+    'full': _meeus_47(_MEEUS_47A, 4, 1e-6),
+}
+LATITUDE_TERMS = {
+    'coarse': np.array(_LATITUDE_STANDARD, dtype=float),
+    'standard': np.array(_LATITUDE_STANDARD, dtype=float),
+    'full': _meeus_47(_MEEUS_47B, 4, 1e-6),
+}
+DISTANCE_TERMS = {
+    'coarse': np.array(_DISTANCE_STANDARD[:3], dtype=float),
+    'standard': np.array(_DISTANCE_STANDARD, dtype=float),
+    'full': _meeus_47(_MEEUS_47A, 5, 1e-3),
+}
+NUTATION_TERMS = {
+    'coarse': _nutation_table(_NUTATION_STANDARD[:1]),
+    'standard': _nutation_table(_NUTATION_STANDARD),
+    'full': _nutation_table(_MEEUS_22A),
+}
+
+# 스칼라 함수용: 같은 표를 파이썬 float 튜플의 목록으로
+_LONGITUDE_ROWS = {tier: [tuple(row) for row in terms.tolist()] for tier, terms in LONGITUDE_TERMS.items()}
+_LATITUDE_ROWS = {tier: [tuple(row) for row in terms.tolist()] for tier, terms in LATITUDE_TERMS.items()}
+_DISTANCE_ROWS = {tier: [tuple(row) for row in terms.tolist()] for tier, terms in DISTANCE_TERMS.items()}
+_NUTATION_ROWS = {tier: [tuple(row) for row in terms.tolist()] for tier, terms in NUTATION_TERMS.items()}
+
+_tier = os.environ.get(SERIES_ENV, 'standard').lower()
+if _tier not in SERIES_TIERS:
+    raise ValueError(f"{SERIES_ENV}={_tier} 는 지원하지 않는 단계입니다 (가능: {', '.join(SERIES_TIERS)})")
+
+
+def set_series_tier(name):
+    """기본 정확도 단계를 'coarse', 'standard', 'full' 중 하나로 설정합니다."""
+    global _tier
+    name = name.lower()
+    if name not in SERIES_TIERS:
+        raise ValueError(f"지원하지 않는 단계입니다: {name} (가능: {', '.join(SERIES_TIERS)})")
+    _tier = name
+
+
+def get_series_tier():
+    """현재 기본 정확도 단계."""
+    return _tier
+
+
+_source_hash = None
+
+
+def model_source_hash():
+    """
+    MODEL_SOURCES 파일 내용의 해시 (16자리). 함수 안의 계수까지 포함하므로 모델 식이나 상수가 바뀌면 달라집니다.
+    미리 계산해 저장하는 결과(체비쇼프 천체력 파일, 결과 캐시)의 키로 정확도 단계와 함께 씁니다.
+    """
+    global _source_hash
+    if _source_hash is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in MODEL_SOURCES:
+            with open(os.path.join(directory, name), 'rb') as f:
+                # 줄바꿈 방식(CRLF/LF)만 다른 체크아웃은 같은 해시가 되도록
+                digest.update(name.encode('utf-8') + b'\0' + f.read().replace(b'\r\n', b'\n'))
+        _source_hash = digest.hexdigest()[:16]
+    return _source_hash
+
+
+def _lunar_arguments(T, D_moon, M_moon, F_moon):
+    """(D, M, M′, F, Ω) 인수 배열. D, M′, F 는 moon.py 의 값, M 은 sun.solar_mean_anomaly 를 사용."""
+    D_moon, M_moon, F_moon, M_sun = np.broadcast_arrays(D_moon, M_moon, F_moon, solar_mean_anomaly(T))
+    return np.stack([D_moon, M_sun, M_moon, F_moon, np.zeros_like(D_moon)], axis=-1)
+
+
+def _eccentricity_factor(T, terms):
+    """M 항의 진폭에 곱하는 지구 궤도 이심률 보정 E^|M 배수| (Meeus 47.6)."""
+    E = 1 - 0.002516 * T - 0.0000074 * T**2
+    return np.asarray(E)[..., np.newaxis] ** np.abs(terms[:, 1])
+
+
+def _lunar_series(T, D_moon, M_moon, F_moon, tables, tier, function):
+    """Meeus 47장 형식(E 보정 포함)의 달 급수 합."""
+    terms = tables[tier or _tier]
+    arguments = _lunar_arguments(T, D_moon, M_moon, F_moon)
+    values = function(np.radians(arguments @ terms[:, :5].T))
+    if np.any(terms[:, 1] != 0):
+        values = values * _eccentricity_factor(T, terms)
+    return values @ terms[:, 5]
+
+
+def _mean_longitude(T):
+    """달의 평균 황경 L′ (moon.moon_mean_longitude 와 같은 식, 도)."""
+    return (218.3164477 + 481267.88123421 * T - 0.0015786 * T**2 +
+            T**3 / 538841 - T**4 / 65194000) % 360.0
+
+
+def _additive_terms(T):
+    """Meeus 47장의 금성(A1)·목성(A2)·지구 편평도(A3) 보정 인수 (라디안)와 L′."""
+    A1 = np.radians((119.75 + 131.849 * T) % 360.0)
+    A2 = np.radians((53.09 + 479264.290 * T) % 360.0)
+    A3 = np.radians((313.45 + 481266.484 * T) % 360.0)
+    return A1, A2, A3, np.radians(_mean_longitude(T))
+
+
+def moon_longitude_series(T, D_moon, M_moon, F_moon, tier=None):
+    """달의 중심차 (λ - L′, 도). M_moon 은 달의 평균 근점 M′."""
+    result = _lunar_series(T, D_moon, M_moon, F_moon, LONGITUDE_TERMS, tier, np.sin)
+    if (tier or _tier) == 'full':
+        A1, A2, _, L_prime = _additive_terms(T)
+        F_rad = np.radians(F_moon)
+        result = result + (3958 * np.sin(A1) + 1962 * np.sin(L_prime - F_rad) + 318 * np.sin(A2)) * 1e-6
+    return result
+
+
+def moon_latitude_series(T, D_moon, M_moon, F_moon, tier=None):
+    """달의 황위 β (도)."""
+    result = _lunar_series(T, D_moon, M_moon, F_moon, LATITUDE_TERMS, tier, np.sin)
+    if (tier or _tier) == 'full':
+        A1, _, A3, L_prime = _additive_terms(T)
+        F_rad = np.radians(F_moon)
+        M_rad = np.radians(M_moon)
+        result = result + (-2235 * np.sin(L_prime) + 382 * np.sin(A3)
+                           + 175 * np.sin(A1 - F_rad) + 175 * np.sin(A1 + F_rad)
+                           + 127 * np.sin(L_prime - M_rad) - 115 * np.sin(L_prime + M_rad)) * 1e-6
+    return result
+
+
+def moon_distance_series(T, D_moon, M_moon, F_moon, tier=None):
+    """달-지구 거리 (km)."""
+    return MEAN_DISTANCE + _lunar_series(T, D_moon, M_moon, F_moon, DISTANCE_TERMS, tier, np.cos)
+
+
+def nutation_series(T, tier=None):
+    """세차 Δψ 와 진동 Δε (도). 기본 인수는 Meeus 22장의 식을 사용합니다."""
+    terms = NUTATION_TERMS[tier or _tier]
+    D = (297.85036 + 445267.111480 * T - 0.0019142 * T**2 + T**3 / 189474) % 360
+    M = (357.52772 + 35999.050340 * T - 0.0001603 * T**2 - T**3 / 300000) % 360
+    M_prime = (134.96298 + 477198.867398 * T + 0.0086972 * T**2 + T**3 / 56250) % 360
+    F = (93.27191 + 483202.017538 * T - 0.0036825 * T**2 + T**3 / 327270) % 360
+    Omega = (125.04452 - 1934.136261 * T + 0.0020708 * T**2 + T**3 / 450000) % 360
+    angles = np.radians(np.stack(np.broadcast_arrays(D, M, M_prime, F, Omega), axis=-1) @ terms[:, :5].T)
+    sin_angles, cos_angles = np.sin(angles), np.cos(angles)
+    delta_psi = sin_angles @ terms[:, 5] + T * (sin_angles @ terms[:, 6])
+    delta_epsilon = cos_angles @ terms[:, 7] + T * (cos_angles @ terms[:, 8])
+    return delta_psi, delta_epsilon
+
+
+# ---------------------------------------------------------------------------
+# 스칼라 버전 (moon.py): 같은 표를 math 로 합산
+# ---------------------------------------------------------------------------
+
+def _lunar_series_scalar(T, D_moon, M_moon, F_moon, rows, function):
+    """_lunar_series 의 스칼라 버전. 달 급수의 Ω 배수는 모두 0 이므로 Ω 는 넣지 않습니다."""
+    M_sun = solar_mean_anomaly(T)
+    E = 1 - 0.002516 * T - 0.0000074 * T**2
+    total = 0.0
+    for d, m, m_prime, f, _, amplitude in rows:
+        term = amplitude * function(math.radians(d * D_moon + m * M_sun + m_prime * M_moon + f * F_moon))
+        if m:
+            term *= E ** abs(m)
+        total += term
+    return total
+
+
+def _additive_terms_scalar(T):
+    """_additive_terms 의 스칼라 버전 (A1, A2, A3, L′ 라디안)."""
+    A1 = math.radians((119.75 + 131.849 * T) % 360.0)
+    A2 = math.radians((53.09 + 479264.290 * T) % 360.0)
+    A3 = math.radians((313.45 + 481266.484 * T) % 360.0)
+    return A1, A2, A3, math.radians(_mean_longitude(T))
+
+
+def moon_longitude_scalar(T, D_moon, M_moon, F_moon, tier=None):
+    """moon_longitude_series 의 스칼라 버전 (도)."""
+    tier = tier or _tier
+    result = _lunar_series_scalar(T, D_moon, M_moon, F_moon, _LONGITUDE_ROWS[tier], math.sin)
+    if tier == 'full':
+        A1, A2, _, L_prime = _additive_terms_scalar(T)
+        F_rad = math.radians(F_moon)
+        result += (3958 * math.sin(A1) + 1962 * math.sin(L_prime - F_rad) + 318 * math.sin(A2)) * 1e-6
+    return result
+
+
+def moon_latitude_scalar(T, D_moon, M_moon, F_moon, tier=None):
+    """moon_latitude_series 의 스칼라 버전 (도)."""
+    tier = tier or _tier
+    result = _lunar_series_scalar(T, D_moon, M_moon, F_moon, _LATITUDE_ROWS[tier], math.sin)
+    if tier == 'full':
+        A1, _, A3, L_prime = _additive_terms_scalar(T)
+        F_rad = math.radians(F_moon)
+        M_rad = math.radians(M_moon)
+        result += (-2235 * math.sin(L_prime) + 382 * math.sin(A3)
+                   + 175 * math.sin(A1 - F_rad) + 175 * math.sin(A1 + F_rad)
+                   + 127 * math.sin(L_prime - M_rad) - 115 * math.sin(L_prime + M_rad)) * 1e-6
+    return result
+
+
+def moon_distance_scalar(T, D_moon, M_moon, F_moon, tier=None):
+    """moon_distance_series 의 스칼라 버전 (km)."""
+    return MEAN_DISTANCE + _lunar_series_scalar(T, D_moon, M_moon, F_moon, _DISTANCE_ROWS[tier or _tier], math.cos)
+
+
+def nutation_scalar(T, tier=None):
+    """nutation_series 의 스칼라 버전 (Δψ, Δε, 도)."""
+    D = (297.85036 + 445267.111480 * T - 0.0019142 * T**2 + T**3 / 189474) % 360
+    M = (357.52772 + 35999.050340 * T - 0.0001603 * T**2 - T**3 / 300000) % 360
+    M_prime = (134.96298 + 477198.867398 * T + 0.0086972 * T**2 + T**3 / 56250) % 360
+    F = (93.27191 + 483202.017538 * T - 0.0036825 * T**2 + T**3 / 327270) % 360
+    Omega = (125.04452 - 1934.136261 * T + 0.0020708 * T**2 + T**3 / 450000) % 360
+    delta_psi = delta_epsilon = 0.0
+    for d, m, m_prime, f, omega, psi, psi_t, epsilon, epsilon_t in _NUTATION_ROWS[tier or _tier]:
+        angle = math.radians(d * D + m * M + m_prime * M_prime + f * F + omega * Omega)
+        delta_psi += (psi + psi_t * T) * math.sin(angle)
+        delta_epsilon += (epsilon + epsilon_t * T) * math.cos(angle)
+    return delta_psi, delta_epsilon
@@ -3,6 +3,7 @@
 import math
 from .helpers import julian_day, get_julian_centuries, greenwich_mean_sidereal_time, \
     apparent_sidereal_time, mean_obliquity_of_ecliptic, equatorial_to_horizontal, atmospheric_refraction_correction
+from . import lookup
 
 K_norm = 1.0  # Normal lobe contribution (assuming dull white surface)
 C_aerosol = 0.0218  # Clear
@@ -56,6 +57,29 @@ def calculate_sun_earth_distance(v, e):
     r_sun_earth = (1.000001018 * (1 - e**2)) / (1 + e * math.cos(v_rad))  # AU 단위
     return r_sun_earth
 
+def sun_earth_distance(T):
+    """줄리안 세기 T 에서의 지구-태양 거리(AU)를 계산합니다."""
+    M_sun = solar_mean_anomaly(T)
+    e = eccentricity_earth_orbit(T)  # 이심률 계산
+    C_sun = sun_equation_of_center(T, M_sun)
+    v = (M_sun + C_sun) % 360.0  # 진이각 (True Anomaly)
+    return calculate_sun_earth_distance(v, e)
+
+def sun_equatorial_coordinates(T, lambda_sun):
+    """
+    태양의 진황경(λ)으로부터 적경(0~360도)과 적위를 계산합니다.
+    """
+    # 황도 경사각 계산
+    epsilon0_sun = mean_obliquity_of_ecliptic(T)
+    epsilon_sun = epsilon0_sun + 0.00256 * math.cos(math.radians(125.04 - 1934.136 * T))
+    
+    # 적경(RA)과 적위(Dec) 계산
+    alpha_sun = math.degrees(math.atan2(math.cos(math.radians(epsilon_sun)) * math.sin(math.radians(lambda_sun)), math.cos(math.radians(lambda_sun))))
+    delta_sun = math.degrees(math.asin(math.sin(math.radians(epsilon_sun)) * math.sin(math.radians(lambda_sun))))
+    
+    # 적경을 0~360도로 조정
+    return alpha_sun % 360.0, delta_sun
+
 def calculate_extraterrestrial_solar_illuminance(JD, T):
     """
     태양의 외계 조도(E_ST)를 계산하는 함수.
@@ -219,38 +243,32 @@ def calculate_R_Twilight_sun(altitude_sun, R_light_sun, E_h_1, E_h_2):
     return R_Twilight_sun
         
 
-def calculate_sun_position(year, month, day, hour, minute, second, latitude, longitude):
+def calculate_sun_position(year, month, day, hour, minute, second, latitude, longitude, context=None, fast=False):
     """
     태양의 위치(고도, 방위각)와 지구-태양 거리(AU), 지표면 조도(E_surface_sun)를 계산합니다.
     모든 시간은 UTC 시간 기준으로 합니다.
+    context(EphemerisContext)를 넘기면 같은 시각의 공통 중간값을 다시 계산하지 않습니다.
+    fast=True 이면 대기 굴절과 공기 질량을 lookup 모듈의 보간 표로 계산합니다.
     """
-    # 줄리안 날짜 및 세기 계산
-    JD = julian_day(year, month, day, hour, minute, second)
-    T = get_julian_centuries(JD)
-    
-    # 태양의 평균 황경, 평균 근점, 이심률, 중심차 계산
-    L0_sun = solar_mean_longitude(T)
-    M_sun = solar_mean_anomaly(T)
-    e = eccentricity_earth_orbit(T)  # 이심률 계산
-    C_sun = sun_equation_of_center(T, M_sun)
-    
-    # 태양의 진황경 계산
-    lambda_sun = calculate_lambda_sun(T)
-    
-    # 황도 경사각 계산
-    epsilon0_sun = mean_obliquity_of_ecliptic(T)
-    epsilon_sun = epsilon0_sun + 0.00256 * math.cos(math.radians(125.04 - 1934.136 * T))
-    
-    # 적경(RA)과 적위(Dec) 계산
-    alpha_sun = math.degrees(math.atan2(math.cos(math.radians(epsilon_sun)) * math.sin(math.radians(lambda_sun)), math.cos(math.radians(lambda_sun))))
-    delta_sun = math.degrees(math.asin(math.sin(math.radians(epsilon_sun)) * math.sin(math.radians(lambda_sun))))
-    
-    # 적경을 0~360도로 조정
-    alpha_sun = alpha_sun % 360.0
-    
-    # 항성시 계산
-    GMST = greenwich_mean_sidereal_time(JD, T)
-    GAST = apparent_sidereal_time(GMST, T)
+    if context is None:
+        # 줄리안 날짜 및 세기 계산
+        JD = julian_day(year, month, day, hour, minute, second)
+        T = get_julian_centuries(JD)
+
+        # 태양의 진황경 계산
+        lambda_sun = calculate_lambda_sun(T)
+
+        # 항성시 계산
+        GMST = greenwich_mean_sidereal_time(JD, T)
+        GAST = apparent_sidereal_time(GMST, T)
+
+        # 적경(RA)과 적위(Dec) 계산
+        alpha_sun, delta_sun = sun_equatorial_coordinates(T, lambda_sun)
+    else:
+        JD, T = context.JD, context.T
+        lambda_sun = context.lambda_sun
+        GAST = context.GAST
+        alpha_sun, delta_sun = context.alpha_sun, context.delta_sun
     
     # 지역 항성시(LST) 계산
     LST = (GAST + longitude) % 360.0
@@ -262,19 +280,24 @@ def calculate_sun_position(year, month, day, hour, minute, second, latitude, lon
     altitude_sun, azimuth_sun = equatorial_to_horizontal(delta_sun, HA_sun, latitude)
     
     # 대기 굴절 보정 적용
-    altitude_sun_corrected = altitude_sun + atmospheric_refraction_correction(altitude_sun)
-    
-    # 진이각 계산
-    v = (M_sun + C_sun) % 360.0  # 진이각 (True Anomaly)
-    
-    # 지구-태양 거리(AU) 계산
-    r_sun_earth = calculate_sun_earth_distance(v, e)
+    if fast:
+        altitude_sun_corrected = altitude_sun + lookup.atmospheric_refraction_correction(altitude_sun)
+    else:
+        altitude_sun_corrected = altitude_sun + atmospheric_refraction_correction(altitude_sun)
     
-    # 태양 외계 조도 계산
-    E_ST = calculate_extraterrestrial_solar_illuminance(JD, T)
+    # 지구-태양 거리(AU)와 태양 외계 조도 계산
+    if context is None:
+        r_sun_earth = sun_earth_distance(T)
+        E_ST = calculate_extraterrestrial_solar_illuminance(JD, T)
+    else:
+        r_sun_earth = context.r_sun_earth
+        E_ST = context.E_ST
        
     # 대기를 통과한 태양 조도 E_DN_sun 계산
-    E_DN_sun = calculate_E_DN_sun(E_ST, altitude_sun_corrected)
+    if fast:
+        E_DN_sun = lookup.calculate_E_DN_sun(E_ST, altitude_sun_corrected)
+    else:
+        E_DN_sun = calculate_E_DN_sun(E_ST, altitude_sun_corrected)
     
     # 표면에서의 태양 조도 E_DV_sun 계산
     cos_theta_s_sun = calculate_cos_theta_s_sun(altitude_sun_corrected, azimuth_sun) 
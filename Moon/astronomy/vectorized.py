@@ -0,0 +1,485 @@
+# astronomy/vectorized.py
+
+import numpy as np
+from . import lookup
+from .series import moon_longitude_series, moon_latitude_series, moon_distance_series, nutation_series
+from .sun import K_norm, C_atmosphere
+from .moon import AU_TO_KM, R_M, E_sm, C
+
+# datetime64 기준 시각(1970-01-01T00:00Z)의 줄리안 날짜
+JD_UNIX_EPOCH = 2440587.5
+NS_PER_DAY = 86400 * 10**9
+
+# ---------------------------------------------------------------------------
+# 공통 헬퍼 (helpers.py 의 배열 버전)
+# ---------------------------------------------------------------------------
+
+def julian_day_array(times_utc):
+    """
+    UTC 시각 배열(datetime64 또는 datetime 목록)을 줄리안 날짜 배열로 변환합니다.
+    helpers.julian_day 와 같은 그레고리력 기준 값을 돌려줍니다.
+    """
+    times = np.asarray(times_utc, dtype='datetime64[ns]')
+    ns = times.astype(np.int64)
+    # 정수부와 소수부를 나누어 float64 정밀도 손실을 줄임
+    days, rem = np.divmod(ns, NS_PER_DAY)
+    return JD_UNIX_EPOCH + days + rem / NS_PER_DAY
+
+def jd_to_datetime64(JD):
+    """줄리안 날짜 배열을 UTC datetime64[ns] 배열로 변환합니다 (julian_day_array 의 역변환). NaN 은 NaT 가 됩니다."""
+    JD = np.asarray(JD, dtype=float)
+    days = JD - JD_UNIX_EPOCH
+    ns = np.where(np.isfinite(days), np.round(days * NS_PER_DAY), 0).astype(np.int64)
+    return np.where(np.isfinite(days), ns.astype('datetime64[ns]'), np.datetime64('NaT'))
+
+def get_julian_centuries(JD):
+    """J2000.0으로부터의 줄리안 세기를 계산합니다."""
+    return (JD - 2451545.0) / 36525.0
+
+def greenwich_mean_sidereal_time(JD, T):
+    """그리니치 평균 항성시(GMST)를 계산합니다."""
+    GMST = 280.46061837 + 360.98564736629 * (JD - 2451545) + \
+           0.000387933 * T**2 - T**3 / 38710000
+    return GMST % 360.0
+
+def mean_obliquity_of_ecliptic(T):
+    """황도 경사각(ε)의 평균 값을 계산합니다."""
+    seconds = 21.448 - T * (46.815 + T * (0.00059 - T * 0.001813))
+    return 23 + (26 + (seconds / 60)) / 60
+
+def apparent_sidereal_time(GMST, T):
+    """겉보기 항성시(GAST)를 계산합니다."""
+    omega = 125.04 - 1934.136 * T
+    delta_psi = -0.00478 * np.sin(np.radians(omega))
+    epsilon = mean_obliquity_of_ecliptic(T) + 0.00256 * np.cos(np.radians(omega))
+    GAST = GMST + delta_psi * np.cos(np.radians(epsilon))
+    return GAST % 360.0
+
+def equatorial_to_horizontal(delta, HA, lat):
+    """적위와 시간각을 고도와 방위각 배열로 변환합니다."""
+    dec_rad = np.radians(delta)
+    HA_rad = np.radians(HA)
+    lat_rad = np.radians(lat)
+
+    altitude = np.degrees(np.arcsin(np.sin(dec_rad) * np.sin(lat_rad) +
+                                    np.cos(dec_rad) * np.cos(lat_rad) * np.cos(HA_rad)))
+
+    azimuth = np.degrees(np.arctan2(-np.sin(HA_rad),
+                                    np.tan(dec_rad) * np.cos(lat_rad) -
+                                    np.sin(lat_rad) * np.cos(HA_rad)))
+    azimuth = (azimuth + 360) % 360
+    return altitude, azimuth
+
+def atmospheric_refraction_correction(altitude):
+    """
+    helpers.atmospheric_refraction_correction 의 배열 버전.
+    85도 초과, 5~85도, -0.575~5도, 그 이하의 네 구간을 np.select 로 나누어 적용합니다.
+    """
+    altitude = np.asarray(altitude, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tan_alt = np.tan(np.radians(altitude))
+        meeus = (58.1 / tan_alt - 0.07 / tan_alt**3 + 0.000086 / tan_alt**5) / 3600.0
+    low = (1735.0 + altitude * (-518.2 + altitude * (103.4 + altitude * (-12.79 + altitude * 0.711)))) / 3600.0
+    return np.select(
+        [altitude > 85, altitude > 5, altitude > -0.575],
+        [0.0, meeus, low],
+        default=0.0
+    )
+
+def _cos_theta_s(altitude, azimuth):
+    """수평면 법선 (0, 0, 1)과 입사 벡터 사이의 cos(theta_s)를 계산합니다."""
+    altitude_rad = np.radians(altitude)
+    azimuth_rad = np.radians(azimuth)
+    x = np.cos(altitude_rad) * np.cos(azimuth_rad)
+    y = np.cos(altitude_rad) * np.sin(azimuth_rad)
+    z = np.sin(altitude_rad)
+    return z / np.sqrt(x**2 + y**2 + z**2)
+
+def _air_mass(altitude_deg):
+    """
+    E_DN_sun / E_DN_moon 에서 쓰는 광학적 공기 질량 m (제한 적용 전).
+    고도가 -1 라디안 이하인 경우는 NaN 으로 두고 호출하는 쪽에서 500 으로 바꿉니다.
+    """
+    altitude_rad = np.radians(altitude_deg)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = 1 / (np.cos(np.pi / 2 - altitude_rad) + 0.15 * (3.885 + altitude_rad)**-1.253)
+    return np.where(altitude_rad > -1, m, np.nan)
+
+# ---------------------------------------------------------------------------
+# 태양 (sun.py 의 배열 버전)
+# ---------------------------------------------------------------------------
+
+def solar_mean_longitude(T):
+    """태양의 평균 황경을 계산합니다."""
+    return (280.46646 + 36000.76983 * T + 0.0003032 * T**2) % 360.0
+
+def solar_mean_anomaly(T):
+    """태양의 평균 근점을 계산합니다."""
+    return (357.52911 + 35999.05029 * T - 0.0001537 * T**2) % 360.0
+
+def eccentricity_earth_orbit(T):
+    """지구 궤도의 이심률을 계산합니다."""
+    return 0.016708634 - 0.000042037 * T - 0.0000001267 * T**2
+
+def sun_equation_of_center(T, M_sun):
+    """태양의 중심차를 계산합니다."""
+    M_rad = np.radians(M_sun)
+    return (1.914602 - 0.004817 * T - 0.000014 * T**2) * np.sin(M_rad) \
+        + (0.019993 - 0.000101 * T) * np.sin(2 * M_rad) \
+        + 0.000289 * np.sin(3 * M_rad)
+
+def calculate_lambda_sun(T):
+    """태양의 진황경(λ)을 계산합니다."""
+    true_long_sun = solar_mean_longitude(T) + sun_equation_of_center(T, solar_mean_anomaly(T))
+    omega = 125.04 - 1934.136 * T
+    lambda_sun = true_long_sun - 0.00569 - 0.00478 * np.sin(np.radians(omega))
+    return lambda_sun % 360.0
+
+def calculate_sun_earth_distance(v, e):
+    """태양과 지구 사이의 거리(AU)를 계산합니다."""
+    return (1.000001018 * (1 - e**2)) / (1 + e * np.cos(np.radians(v)))
+
+def calculate_extraterrestrial_solar_illuminance(JD, T):
+    """태양의 외계 조도(E_ST, lux)를 계산합니다."""
+    E_SC = 127500
+    epsilon = eccentricity_earth_orbit(T)
+    term1 = (1 + epsilon * np.cos(2 * np.pi * (JD - 2) / 365.2)) ** 2
+    term2 = 1 - epsilon ** 2
+    return E_SC * (term1 / term2)
+
+def calculate_E_DN_sun(E_ST, altitude_sun_deg):
+    """
+    대기를 통과한 태양 조도 E_DN_sun 배열.
+    공기 질량은 500으로 제한하며, exp 오버플로(스칼라 버전의 OverflowError)는 0 으로 둡니다.
+    """
+    m = _air_mass(altitude_sun_deg)
+    m = np.where(np.isnan(m) | (m > 500), 500.0, m)
+    with np.errstate(over='ignore'):
+        E_DN_sun = E_ST * np.exp(-C_atmosphere * m)
+    return np.where(np.isfinite(E_DN_sun), E_DN_sun, 0.0)
+
+def calculate_E_DV_sun(E_DN_sun, altitude_sun, azimuth_sun):
+    """표면에서의 태양 조도 E_DV_sun 배열 (태양이 지평선 아래면 0)."""
+    return np.where(altitude_sun > 0, E_DN_sun * _cos_theta_s(altitude_sun, azimuth_sun), 0.0)
+
+def calculate_R_light_sun(E_DV_sun):
+    """반사된 태양광의 양 R_light_sun 배열."""
+    return E_DV_sun * K_norm * (1 / np.pi)
+
+def calculate_R_Twilight_sun(altitude_sun, R_light_sun):
+    """
+    sun.calculate_R_Twilight_sun 의 배열 버전.
+    h > 0: R_light_sun + 400, 0 ~ -6: 400·e^(0.7951h), -6 ~ -12: 3.4·e^(0.4728(h+6)), 그 외 0.
+    """
+    altitude_sun = np.asarray(altitude_sun, dtype=float)
+    with np.errstate(over='ignore'):
+        E_h_1 = 400 * np.exp(0.7951 * altitude_sun)
+        E_h_2 = 3.4 * np.exp(0.4728 * (altitude_sun + 6))
+    return np.select(
+        [altitude_sun > 0, altitude_sun >= -6, altitude_sun >= -12],
+        [R_light_sun + 400, E_h_1, E_h_2],
+        default=0.0
+    )
+
+def sun_time_terms(JD):
+    """
+    관측 위치와 무관한 태양의 시각별 항(적경·적위, 거리, 외계 조도, 겉보기 항성시)을 계산합니다.
+    JD: 줄리안 날짜 배열
+    """
+    JD = np.asarray(JD, dtype=float)
+    T = get_julian_centuries(JD)
+
+    M_sun = solar_mean_anomaly(T)
+    e = eccentricity_earth_orbit(T)
+    C_sun = sun_equation_of_center(T, M_sun)
+    lambda_sun = calculate_lambda_sun(T)
+
+    epsilon_sun = mean_obliquity_of_ecliptic(T) + 0.00256 * np.cos(np.radians(125.04 - 1934.136 * T))
+    eps_rad = np.radians(epsilon_sun)
+    lam_rad = np.radians(lambda_sun)
+    alpha_sun = np.degrees(np.arctan2(np.cos(eps_rad) * np.sin(lam_rad), np.cos(lam_rad))) % 360.0
+    delta_sun = np.degrees(np.arcsin(np.sin(eps_rad) * np.sin(lam_rad)))
+
+    return {
+        'JD': JD,
+        'T': T,
+        'lambda_sun': lambda_sun,
+        'alpha_sun': alpha_sun,
+        'delta_sun': delta_sun,
+        'r_sun_earth': calculate_sun_earth_distance((M_sun + C_sun) % 360.0, e),
+        'E_ST': calculate_extraterrestrial_solar_illuminance(JD, T),
+        'GAST': apparent_sidereal_time(greenwich_mean_sidereal_time(JD, T), T)
+    }
+
+def sun_local_terms(time_terms, latitude, longitude, fast=False):
+    """
+    sun_time_terms 의 결과를 관측 위치에 적용해 calculate_sun_position 과 같은 키의 열 배열을 만듭니다.
+    시각 축과 위치 축이 브로드캐스트되므로 (N_times, 1) 과 (N_points,) 를 넘기면 격자 결과가 됩니다.
+    fast=True 이면 대기 굴절과 공기 질량을 lookup 모듈의 보간 표로 계산합니다.
+    """
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float)
+
+    LST = (time_terms['GAST'] + longitude) % 360.0
+    HA_sun = (LST - time_terms['alpha_sun'] + 180) % 360 - 180
+
+    altitude_sun, azimuth_sun = equatorial_to_horizontal(time_terms['delta_sun'], HA_sun, latitude)
+    if fast:
+        altitude_sun_corrected = altitude_sun + lookup.atmospheric_refraction_correction(altitude_sun)
+        E_DN_sun = lookup.calculate_E_DN_sun(time_terms['E_ST'], altitude_sun_corrected)
+    else:
+        altitude_sun_corrected = altitude_sun + atmospheric_refraction_correction(altitude_sun)
+        E_DN_sun = calculate_E_DN_sun(time_terms['E_ST'], altitude_sun_corrected)
+    cos_theta_s_sun = _cos_theta_s(altitude_sun_corrected, azimuth_sun)
+    E_DV_sun = calculate_E_DV_sun(E_DN_sun, altitude_sun_corrected, azimuth_sun)
+    R_light_sun = calculate_R_light_sun(E_DV_sun)
+    # 스칼라 버전과 같이 박명 구간 판정에는 굴절 보정 전 고도를 사용
+    R_Twilight_sun = calculate_R_Twilight_sun(altitude_sun, R_light_sun)
+
+    shape = altitude_sun.shape
+    return {
+        'altitude_sun': altitude_sun_corrected,
+        'azimuth_sun': azimuth_sun,
+        'lambda_sun': np.broadcast_to(time_terms['lambda_sun'], shape),
+        'r_sun_earth': np.broadcast_to(time_terms['r_sun_earth'], shape),
+        'E_ST': np.broadcast_to(time_terms['E_ST'], shape),
+        'E_DN_sun': E_DN_sun,
+        'E_DV_sun': E_DV_sun,
+        'cos_theta_s_sun': cos_theta_s_sun,
+        'R_light_sun': R_light_sun,
+        'R_Twilight_sun': R_Twilight_sun
+    }
+
+def calculate_sun_position_array(times_utc, latitude, longitude):
+    """
+    calculate_sun_position 의 배열 버전.
+    times_utc, latitude, longitude 는 서로 브로드캐스트 가능한 배열이어야 하며,
+    calculate_sun_position 이 돌려주는 딕셔너리와 같은 키의 열 배열을 반환합니다.
+    """
+    return sun_local_terms(sun_time_terms(julian_day_array(times_utc)), latitude, longitude)
+
+# ---------------------------------------------------------------------------
+# 달 (moon.py 의 배열 버전)
+# ---------------------------------------------------------------------------
+
+def moon_mean_anomaly(T):
+    """달의 평균 근점 (도 단위)."""
+    return (134.96340251 + 477198.8675613 * T + 0.0087423 * T**2 +
+            T**3 / 69699 - T**4 / 14712000) % 360.0
+
+def moon_mean_longitude(T):
+    """달의 평균 황경 (도 단위)."""
+    return (218.3164477 + 481267.88123421 * T - 0.0015786 * T**2 +
+            T**3 / 538841 - T**4 / 65194000) % 360.0
+
+def moon_mean_elongation(T):
+    """달의 평균 편각 (도 단위)."""
+    return (297.8501921 + 445267.1114034 * T - 0.0018819 * T**2 +
+            T**3 / 545868 - T**4 / 113065000) % 360.0
+
+def moon_argument_of_latitude(T):
+    """calculate_moon_position_and_phase 에서 쓰는 달의 평균 황위 인수 F (도 단위)."""
+    return (93.272 + 483202.0175 * T) % 360.0
+
+def moon_ecliptic_latitude(T, tier=None):
+    """달의 황위(β, 도 단위)."""
+    return moon_latitude_series(T, moon_mean_elongation(T), moon_mean_anomaly(T), moon_argument_of_latitude(T), tier)
+
+def moon_equation_of_center(T, M_moon, D_moon, F_moon, tier=None):
+    """달의 중심차 (도 단위). series 모듈의 계수 표를 한 번의 행렬 곱으로 계산합니다."""
+    return moon_longitude_series(T, D_moon, M_moon, F_moon, tier)
+
+def moon_distance(T, D_moon, M_moon, F_moon, tier=None):
+    """달-지구 거리 (km). series 모듈의 계수 표를 한 번의 행렬 곱으로 계산합니다."""
+    return moon_distance_series(T, D_moon, M_moon, F_moon, tier)
+
+def nutation(T, tier=None):
+    """세차(Δψ)와 진동(Δε)을 도 단위로 반환합니다."""
+    return nutation_series(T, tier)
+
+def true_obliquity_of_ecliptic(T, delta_epsilon):
+    """moon.mean_obliquity_of_ecliptic 과 같이 진동(Δε)을 더한 황도 경사각 (도 단위)."""
+    epsilon0 = 23 + (26 + (21.448 - 46.815 * T - 0.00059 * T**2 + 0.001813 * T**3) / 60) / 60
+    return epsilon0 + delta_epsilon
+
+def calculate_phase_angle_geo(lambda_sun, lambda_moon, beta_moon, distance_moon, T, r_sun_earth_au=None):
+    """달의 위상각(도)과 밝은 면의 비율 배열을 계산합니다."""
+    psi = np.arccos(np.cos(np.radians(beta_moon)) * np.cos(np.radians(lambda_moon - lambda_sun)))
+
+    if r_sun_earth_au is None:
+        M_sun = solar_mean_anomaly(T)
+        e = eccentricity_earth_orbit(T)
+        v = (M_sun + sun_equation_of_center(T, M_sun)) % 360.0
+        r_sun_earth_au = calculate_sun_earth_distance(v, e)
+    r_sun_earth_km = r_sun_earth_au * AU_TO_KM
+
+    tan_i = (r_sun_earth_km * np.sin(psi)) / (distance_moon - r_sun_earth_km * np.cos(psi))
+    phase_angle_moon = np.degrees(np.arctan(tan_i))
+    phase_angle_moon = np.where(phase_angle_moon < 0, 180 + phase_angle_moon, phase_angle_moon)
+
+    illumination = (1 + np.cos(np.radians(phase_angle_moon))) / 2
+    return phase_angle_moon, illumination
+
+def calculate_opposition_effect(phase_angle_moon):
+    """Opposition effect (Oef) 배열."""
+    return np.where(phase_angle_moon <= 7, 1 + 1.27 * ((7 - phase_angle_moon) / 6), 1.0)
+
+def _lommel_seeliger(phi):
+    """위상 법칙 1 - sin(φ/2)·tan(φ/2)·ln(1/tan(φ/4))."""
+    return 1 - np.sin(phi / 2) * np.tan(phi / 2) * np.log(1 / np.tan(phi / 4))
+
+def calculate_moon_illuminance(phase_angle_moon, moon_distance):
+    """
+    달빛 조도(E_MT) 배열.
+    위상각이 0 또는 180도여서 계산이 정의되지 않는 경우 스칼라 버전과 같이 0 으로 둡니다.
+    """
+    phi = np.radians(phase_angle_moon)
+    Oef = calculate_opposition_effect(phase_angle_moon)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        E_em = 0.19 * 0.5 * _lommel_seeliger(np.pi - phi)
+        E_MT = 683 * (2 / 3) * Oef * C * (R_M ** 2) / (moon_distance ** 2) * (
+            E_em + E_sm * _lommel_seeliger(phi)
+        )
+    return np.where(np.isfinite(E_MT), E_MT, 0.0)
+
+def calculate_E_DN_moon(E_MT, altitude_moon_corrected):
+    """
+    대기를 통과한 달빛 조도 E_DN_moon 배열.
+    스칼라 버전과 같이 공기 질량이 음수이거나 고도가 -1 라디안 이하이면 m = 500 을 사용합니다.
+    """
+    m = _air_mass(altitude_moon_corrected)
+    m = np.where(np.isnan(m) | (m < 0), 500.0, m)
+    return E_MT * np.exp(-C_atmosphere * m)
+
+def calculate_E_DV_moon(E_DN_moon, altitude_moon, azimuth_moon):
+    """표면에서의 달빛 조도 E_DV_moon 배열 (달이 지평선 아래면 0)."""
+    return np.where(altitude_moon > 0, E_DN_moon * _cos_theta_s(altitude_moon, azimuth_moon), 0.0)
+
+def calculate_R_light_moon(E_DV_moon):
+    """반사된 달빛의 양 R_light_moon 배열."""
+    return E_DV_moon * K_norm * (1 / np.pi)
+
+def moon_time_terms(JD, sun_terms=None, fast=False, tier=None):
+    """
+    관측 위치와 무관한 달의 시각별 항(적경·적위, 거리, 위상각, 달빛 조도 E_MT, 겉보기 항성시)을 계산합니다.
+    sun_terms: 같은 JD 로 계산한 sun_time_terms 결과. 주어지면 항성시·태양 황경·거리를 재사용합니다.
+    fast: True 이면 E_MT 의 위상 법칙을 lookup 모듈의 보간 표로 계산합니다.
+    tier: series 모듈의 정확도 단계 (None 이면 현재 기본 단계)
+    """
+    JD = np.asarray(JD, dtype=float)
+    T = get_julian_centuries(JD)
+
+    M_moon = moon_mean_anomaly(T)
+    L_moon = moon_mean_longitude(T)
+    D_moon = moon_mean_elongation(T)
+    F_moon = moon_argument_of_latitude(T)
+
+    lambda_moon = L_moon + moon_equation_of_center(T, M_moon, D_moon, F_moon, tier)
+    beta_moon = moon_ecliptic_latitude(T, tier)
+
+    delta_psi, delta_epsilon = nutation(T, tier)
+    eps_rad = np.radians(true_obliquity_of_ecliptic(T, delta_epsilon))
+    lam_rad = np.radians(lambda_moon + delta_psi)
+    alpha_moon = np.degrees(np.arctan2(np.cos(eps_rad) * np.sin(lam_rad), np.cos(lam_rad))) % 360.0
+    delta_moon = np.degrees(np.arcsin(np.sin(eps_rad) * np.sin(lam_rad)))
+
+    if sun_terms is None:
+        GAST = apparent_sidereal_time(greenwich_mean_sidereal_time(JD, T), T)
+        lambda_sun = calculate_lambda_sun(T)
+        r_sun_earth = None
+    else:
+        GAST = sun_terms['GAST']
+        lambda_sun, r_sun_earth = sun_terms['lambda_sun'], sun_terms['r_sun_earth']
+
+    distance_moon = moon_distance(T, D_moon, M_moon, F_moon, tier)
+    phase_angle_moon, illumination = calculate_phase_angle_geo(lambda_sun, lambda_moon, beta_moon, distance_moon, T,
+                                                               r_sun_earth)
+    moon_illuminance = lookup.calculate_moon_illuminance if fast else calculate_moon_illuminance
+
+    return {
+        'JD': JD,
+        'T': T,
+        'lambda_moon': lambda_moon,
+        'beta_moon': beta_moon,
+        'alpha_moon': alpha_moon,
+        'delta_moon': delta_moon,
+        'distance_moon': distance_moon,
+        'phase_angle_moon': phase_angle_moon,
+        'illumination': illumination,
+        'E_MT': moon_illuminance(phase_angle_moon, distance_moon),
+        'GAST': GAST
+    }
+
+def moon_local_terms(time_terms, latitude, longitude, fast=False):
+    """
+    moon_time_terms 의 결과를 관측 위치에 적용해 calculate_moon_position_and_phase 와 같은 키의 열 배열을 만듭니다.
+    fast=True 이면 대기 굴절과 공기 질량을 lookup 모듈의 보간 표로 계산합니다.
+    """
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float)
+
+    LST = (time_terms['GAST'] + longitude) % 360.0
+    HA_moon = (LST - time_terms['alpha_moon'] + 180) % 360 - 180
+
+    altitude_moon, azimuth_moon = equatorial_to_horizontal(time_terms['delta_moon'], HA_moon, latitude)
+    if fast:
+        altitude_moon_corrected = altitude_moon + lookup.atmospheric_refraction_correction(altitude_moon)
+        E_DN_moon = lookup.calculate_E_DN_moon(time_terms['E_MT'], altitude_moon_corrected)
+    else:
+        altitude_moon_corrected = altitude_moon + atmospheric_refraction_correction(altitude_moon)
+        E_DN_moon = calculate_E_DN_moon(time_terms['E_MT'], altitude_moon_corrected)
+    cos_theta_s_moon = _cos_theta_s(altitude_moon_corrected, azimuth_moon)
+    E_DV_moon = calculate_E_DV_moon(E_DN_moon, altitude_moon_corrected, azimuth_moon)
+    R_light_moon = calculate_R_light_moon(E_DV_moon)
+
+    shape = altitude_moon.shape
+    return {
+        'altitude': altitude_moon_corrected,
+        'azimuth': azimuth_moon,
+        'lambda_moon': np.broadcast_to(time_terms['lambda_moon'], shape),
+        'beta_moon': np.broadcast_to(time_terms['beta_moon'], shape),
+        'distance_moon': np.broadcast_to(time_terms['distance_moon'], shape),
+        'phase_angle_moon': np.broadcast_to(time_terms['phase_angle_moon'], shape),
+        'illumination': np.broadcast_to(time_terms['illumination'], shape),
+        'E_MT': np.broadcast_to(time_terms['E_MT'], shape),
+        'E_DN_moon': E_DN_moon,
+        'E_DV_moon': E_DV_moon,
+        'cos_theta_s_moon': cos_theta_s_moon,
+        'R_light_moon': R_light_moon
+    }
+
+def calculate_moon_position_and_phase_array(times_utc, latitude, longitude):
+    """
+    calculate_moon_position_and_phase 의 배열 버전.
+    times_utc, latitude, longitude 는 서로 브로드캐스트 가능한 배열이어야 하며,
+    calculate_moon_position_and_phase 가 돌려주는 딕셔너리와 같은 키의 열 배열을 반환합니다.
+    """
+    return moon_local_terms(moon_time_terms(julian_day_array(times_utc)), latitude, longitude)
+
+# ---------------------------------------------------------------------------
+# 태양 + 달
+# ---------------------------------------------------------------------------
+
+def calculate_sun_and_moon_terms(JD, latitude, longitude, ephemeris=None, fast=False, tier=None):
+    """
+    JD 와 위치(서로 브로드캐스트 가능)에 대해 태양·달 열 배열을 함께 계산합니다.
+    시각별 항은 한 번만 계산해 두 천체가 공유하며, ephemeris (예: chebyshev.ChebyshevEphemeris)를
+    넘기면 그 객체의 sun_time_terms / moon_time_terms 를 사용합니다.
+    fast=True 이면 굴절·공기 질량·위상 법칙을 lookup 모듈의 보간 표로 계산합니다.
+    tier: series 모듈의 정확도 단계 (None 이면 현재 기본 단계). ephemeris 를 넘기면 그 파일을 만든 단계를 쓰며,
+        tier 를 함께 주었는데 다르면 ValueError 를 냅니다.
+
+    Returns:
+        (sun_data, moon_data): calculate_sun_position / calculate_moon_position_and_phase 와 같은 키의 딕셔너리
+    """
+    if ephemeris is None:
+        sun_terms = sun_time_terms(JD)
+        moon_terms = moon_time_terms(JD, sun_terms, fast, tier)
+    else:
+        ephemeris_tier = getattr(ephemeris, 'tier', None)
+        if tier is not None and ephemeris_tier is not None and tier != ephemeris_tier:
+            raise ValueError(f"ephemeris 는 '{ephemeris_tier}' 단계로 만든 것입니다 (요청: '{tier}').")
+        sun_terms = ephemeris.sun_time_terms(JD)
+        moon_terms = ephemeris.moon_time_terms(JD, sun_terms, fast)
+    return (sun_local_terms(sun_terms, latitude, longitude, fast),
+            moon_local_terms(moon_terms, latitude, longitude, fast))
@@ -0,0 +1,172 @@
+# cloud_frames.py
+
+import os
+import re
+import threading
+import time
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# cloud_<번호>.png 또는 CLOUDS.py 가 저장하는 cloud_image_<tmef>.png
+FRAME_PATTERN = re.compile(r'^cloud_(?:image_)?(\d+)\.png$')
+MANIFEST_NAME = 'tmef_list.txt'
+
+# 축소본 너비 (px). 축소본은 이미지 디렉터리 아래 w<너비>/<원본 이름>.webp / .png 로 저장
+FRAME_WIDTHS = (400, 800, 1200)
+VARIANT_FORMATS = ('webp', 'png')
+VARIANT_DIR_PATTERN = re.compile(r'^w(\d+)$')
+# srcSet 을 쓰지 않는 브라우저에 줄 PNG 축소본의 기준 너비 (px)
+FALLBACK_WIDTH = 800
+
+
+def variant_path(width, filename, fmt):
+    """이미지 디렉터리 기준 축소본 상대 경로."""
+    return f"w{width}/{os.path.splitext(filename)[0]}.{fmt}"
+
+
+def encode_frame_variants(image_path, widths=FRAME_WIDTHS, formats=VARIANT_FORMATS, webp_quality=80):
+    """
+    원본 PNG 한 장을 widths 너비의 WebP(손실)·PNG(팔레트 256색) 축소본으로 저장합니다.
+    원본보다 넓은 너비는 건너뜁니다. 저장한 파일 경로 목록을 돌려줍니다.
+    """
+    if Image is None:
+        raise RuntimeError("축소본을 만들려면 Pillow 가 필요합니다.")
+    image_dir, filename = os.path.split(image_path)
+    saved = []
+    with Image.open(image_path) as original:
+        original = original.convert('RGBA')
+        for width in widths:
+            if width > original.width:
+                continue
+            height = round(original.height * width / original.width)
+            resized = original.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                path = os.path.join(image_dir, variant_path(width, filename, fmt))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if fmt == 'webp':
+                    resized.save(path, 'WEBP', quality=webp_quality, method=6)
+                else:
+                    resized.quantize(256, method=Image.FASTOCTREE).save(path, 'PNG', optimize=True)
+                saved.append(path)
+    return saved
+
+
+class CloudFrames:
+    """한 번 읽은 구름 이미지 목록과 tmef_list, 축소본 목록 (슬라이더 값 -> 파일 이름, 캡션)."""
+
+    def __init__(self, files, tmef_list, variants=None, fallbacks=None):
+        self.files = files
+        self.tmef_list = tmef_list
+        self.variants = variants or {}  # 파일 이름 -> [(너비, WebP 상대 경로), ...] (너비 순)
+        self.fallbacks = fallbacks or {}  # 파일 이름 -> FALLBACK_WIDTH 에 가장 가까운 PNG 축소본 상대 경로
+
+    def src(self, filename):
+        """img src 로 쓸 상대 경로: PNG 축소본이 있으면 그것, 없으면 원본."""
+        return self.fallbacks.get(filename, filename)
+
+    def srcset(self, filename, url_for):
+        """filename 의 WebP 축소본으로 만든 srcSet 문자열 (축소본이 없으면 빈 문자열). url_for: 상대 경로 -> URL."""
+        return ', '.join(f"{url_for(path)} {width}w" for width, path in self.variants.get(filename, []))
+
+    def lookup(self, index):
+        """
+        슬라이더 값 index 의 (파일 이름, 캡션). 이미지가 없거나 index 가 범위 밖이면 파일 이름은 None.
+        """
+        if not self.files:
+            return None, '이미지를 찾을 수 없습니다.'
+        if index is None or index < 0 or index >= len(self.files):
+            return None, '잘못된 이미지 인덱스입니다.'
+        filename = self.files[index]
+        if self.tmef_list is None:
+            return filename, 'tmef_list 파일이 존재하지 않습니다.'
+        # tmef_list와 image_files의 길이가 일치하는지 확인
+        if len(self.tmef_list) != len(self.files):
+            return filename, 'tmef_list와 이미지 파일 수가 일치하지 않습니다.'
+        return filename, f"Time: {self.tmef_list[index]}"
+
+
+class CloudFrameIndex:
+    """
+    구름 이미지 디렉터리의 목록을 캐시합니다.
+    디렉터리, tmef_list.txt, 축소본 디렉터리의 수정 시각이 바뀌면 (CLOUDS.py 가 새로 저장하면) 다시 읽으며,
+    수정 시각 확인은 check_interval 초에 한 번만 합니다.
+    """
+
+    def __init__(self, image_dir, check_interval=2.0):
+        self.image_dir = image_dir
+        self.check_interval = check_interval
+        self._frames = None
+        self._version = None
+        self._checked = 0.0
+        self._variant_dirs = []
+        self._lock = threading.Lock()
+
+    def _current_version(self):
+        """디렉터리, tmef_list.txt, 축소본 디렉터리(w<너비>)의 수정 시각. 없으면 None."""
+        version = []
+        paths = [self.image_dir, os.path.join(self.image_dir, MANIFEST_NAME)]
+        paths += [os.path.join(self.image_dir, name) for name in self._variant_dirs]
+        for path in paths:
+            try:
+                version.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    def _build(self):
+        """디렉터리를 읽어 번호 순으로 정렬한 이미지 목록과 tmef_list 를 만듭니다."""
+        try:
+            names = os.listdir(self.image_dir)
+        except OSError:
+            names = []
+        # 파일 이름에서 숫자 부분을 추출하여 정렬
+        numbered = [(int(match.group(1)), name) for name in names for match in [FRAME_PATTERN.match(name)] if match]
+        files = [name for _, name in sorted(numbered)]
+
+        # 축소본: w<너비> 디렉터리마다 WebP 가 있는 프레임만
+        widths = sorted(int(match.group(1)) for name in names for match in [VARIANT_DIR_PATTERN.match(name)]
+                        if match and os.path.isdir(os.path.join(self.image_dir, name)))
+        self._variant_dirs = [f"w{width}" for width in widths]
+        variants, fallbacks = {}, {}
+        for width in sorted(widths, key=lambda width: abs(width - FALLBACK_WIDTH), reverse=True):
+            available = set(os.listdir(os.path.join(self.image_dir, f"w{width}")))
+            for name in files:
+                path = variant_path(width, name, 'webp')
+                if os.path.basename(path) in available:
+                    variants.setdefault(name, []).append((width, path))
+                path = variant_path(width, name, 'png')
+                if os.path.basename(path) in available:
+                    fallbacks[name] = path  # 기준 너비에 가까운 너비가 나중에 덮어씀
+        for name in variants:
+            variants[name].sort()
+
+        tmef_list = None
+        manifest = os.path.join(self.image_dir, MANIFEST_NAME)
+        if os.path.exists(manifest):
+            with open(manifest, 'r') as f:
+                tmef_list = [line.strip() for line in f]
+        return CloudFrames(files, tmef_list, variants, fallbacks)
+
+    def get(self):
+        """현재 CloudFrames. 마지막 확인 후 check_interval 초가 지났고 디렉터리가 바뀌었으면 다시 만듭니다."""
+        now = time.monotonic()
+        frames = self._frames
+        if frames is not None and now - self._checked < self.check_interval:
+            return frames
+        with self._lock:
+            if self._frames is not None and now - self._checked < self.check_interval:
+                return self._frames
+            version = self._current_version()
+            if self._frames is None or version != self._version:
+                self._frames = self._build()
+                self._version = self._current_version()
+            self._checked = now
+            return self._frames
+
+    def invalidate(self):
+        """다음 get() 에서 목록을 다시 읽도록 합니다."""
+        with self._lock:
+            self._frames = None